@@ -2,22 +2,54 @@
 from .async_client import AsyncOrthanc
 from .client import Orthanc
 
-from . import errors, util
-from ._filtering import find, trim_patients
-from ._find import find_instances, find_patients, find_series, find_studies, query_orthanc
+from . import errors, filters, util
+from .capabilities import async_get_capabilities, get_capabilities
+from .changes import AsyncChangesFeed, ChangesFeed
+from ._cursor import FindCursor
+from ._filtering import async_iter_find, find, iter_find, trim_patients
+from ._find import count_instances, count_patients, count_resources, count_series, count_studies, find_instances, \
+    find_patients, find_series, find_studies, query_orthanc
 from ._internal_client import get_internal_client
+from ._listing import async_iter_listing, iter_listing
+from ._iter_find import async_iter_instances, async_iter_patients, async_iter_query_orthanc, async_iter_series, \
+    async_iter_studies, iter_instances, iter_patients, iter_query_orthanc, iter_series, iter_studies
 from ._modality import Modality, RemoteModality
-from ._resources import Instance, Patient, Series, Study
+from ._paging import AdaptivePager
+from ._resources import AsyncInstance, AsyncPatient, AsyncSeries, AsyncStudy, Instance, Patient, Series, Study
 from ._upload import async_upload, upload
 from .util import async_delete_queries, delete_queries
-from .jobs import Job
+from .jobs import AsyncJob, Job
+from .local_index import LocalIndex
+from .metrics import MetricsAggregator, RequestRecord
+from .profiling import Profile, profile
+from .transport import AsyncCachingTransport, AsyncCoalescingTransport, AsyncHTTP2Transport, \
+    AsyncInstrumentedTransport, CachingTransport, CoalescingTransport, HTTP2Transport, InstrumentedTransport
 from .retrieve import retrieve_and_write_instance, retrieve_and_write_patient, retrieve_and_write_patients, \
     retrieve_and_write_series, retrieve_and_write_study
 
 __all__ = [
+    'AdaptivePager',
     'AsyncOrthanc',
+    'AsyncPatient',
+    'AsyncStudy',
+    'AsyncSeries',
+    'AsyncInstance',
+    'AsyncJob',
+    'AsyncHTTP2Transport',
+    'AsyncCachingTransport',
+    'AsyncCoalescingTransport',
+    'AsyncInstrumentedTransport',
+    'AsyncChangesFeed',
     'async_upload',
     'async_delete_queries',
+    'async_get_capabilities',
+    'async_iter_find',
+    'async_iter_patients',
+    'async_iter_studies',
+    'async_iter_series',
+    'async_iter_instances',
+    'async_iter_query_orthanc',
+    'async_iter_listing',
     'Orthanc',
     'Modality',
     'RemoteModality',
@@ -26,15 +58,39 @@ __all__ = [
     'Series',
     'Instance',
     'trim_patients',
+    'CachingTransport',
+    'ChangesFeed',
+    'CoalescingTransport',
+    'count_patients',
+    'count_studies',
+    'count_series',
+    'count_instances',
+    'count_resources',
     'delete_queries',
     'find',
+    'FindCursor',
     'find_patients',
     'find_studies',
     'find_series',
     'find_instances',
+    'get_capabilities',
     'get_internal_client',
+    'HTTP2Transport',
+    'InstrumentedTransport',
+    'iter_find',
+    'iter_patients',
+    'iter_studies',
+    'iter_series',
+    'iter_instances',
+    'iter_query_orthanc',
+    'iter_listing',
     'query_orthanc',
     'Job',
+    'Profile',
+    'profile',
+    'LocalIndex',
+    'MetricsAggregator',
+    'RequestRecord',
     'retrieve_and_write_patients',
     'retrieve_and_write_patient',
     'retrieve_and_write_study',
@@ -43,4 +99,5 @@ __all__ = [
     'upload',
     'util',
     'errors',
+    'filters',
 ]
@@ -0,0 +1,118 @@
+import asyncio
+import random
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+
+from .metrics import current_attempt
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF = 0.5  # In seconds
+DEFAULT_MAX_BACKOFF = 30  # In seconds
+
+# Status codes meaning that the server is overloaded and that the request can be retried later.
+OVERLOAD_STATUS_CODES = [429, 503]
+
+
+class AdaptiveLimiter:
+    """Limit the number of concurrent requests sent by coroutines
+
+    The number of allowed concurrent requests adapts to the server load
+    (additive increase, multiplicative decrease): it is halved each time the
+    server is overloaded (503/429 responses or timeouts) and slowly raised back
+    to `max_concurrency` as requests succeed. Requests that failed because of an
+    overload are retried with an exponential backoff.
+    """
+
+    def __init__(self,
+                 max_concurrency: int,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF,
+                 max_backoff: float = DEFAULT_MAX_BACKOFF) -> None:
+        """Constructor
+
+        Parameters
+        ----------
+        max_concurrency
+            Maximum number of concurrent requests.
+        max_retries
+            Maximum number of retries of a request that failed because the server is overloaded.
+        backoff
+            Base delay (in seconds) before retrying. The delay doubles at each retry.
+        max_backoff
+            Maximum delay (in seconds) before retrying.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f'max_concurrency must be at least 1, got {max_concurrency}.')
+
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.limit = float(max_concurrency)
+        self.nbr_of_retries = 0
+        self._in_flight = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    async def call(self, func: Callable[..., Awaitable], *args, **kwargs) -> Any:
+        """Await `func(*args, **kwargs)` once a slot is available, retrying when the server is overloaded"""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+
+        attempt = 0
+        while True:
+            await self._acquire()
+            token = current_attempt.set(attempt)  # Reported by the instrumented transports
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as error:
+                if not is_overload_error(error) or attempt >= self.max_retries:
+                    raise
+
+                self.limit = max(1.0, self.limit / 2)
+            else:
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+                return result
+            finally:
+                current_attempt.reset(token)
+                await self._release()
+
+            self.nbr_of_retries += 1
+            await asyncio.sleep(self._compute_delay(attempt))
+            attempt += 1
+
+    async def _acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+
+    async def _release(self) -> None:
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def _compute_delay(self, attempt: int) -> float:
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+
+        return delay * random.uniform(0.5, 1)  # Jitter, to avoid retrying all at once
+
+
+async def limited_call(limiter: Optional[AdaptiveLimiter], func: Callable[..., Awaitable], *args, **kwargs) -> Any:
+    """Await `func(*args, **kwargs)` through the limiter, if any"""
+    if limiter is None:
+        return await func(*args, **kwargs)
+
+    return await limiter.call(func, *args, **kwargs)
+
+
+def is_overload_error(error: Exception) -> bool:
+    """Check if an error means that the server is overloaded"""
+    if isinstance(error, httpx.TimeoutException):
+        return True
+
+    if isinstance(error, httpx.HTTPError):
+        # Errors raised by the Orthanc clients are formatted like "HTTP code: 503, with content: ..."
+        return any(str(error).startswith(f'HTTP code: {code},') for code in OVERLOAD_STATUS_CODES)
+
+    return False
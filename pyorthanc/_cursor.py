@@ -0,0 +1,216 @@
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from . import errors, util
+from ._find import DEFAULT_RESOURCES_LIMIT, _make_find_data, _make_resource, _validate_labels_constraint, \
+    _validate_level
+from ._resources.resource import Resource
+from .capabilities import get_capabilities
+from .client import Orthanc
+
+# Tags used to order the resources when the server supports the extended /tools/find
+DEFAULT_ORDER_BY_TAGS = {
+    'Patient': 'PatientID',
+    'Study': 'StudyInstanceUID',
+    'Series': 'SeriesInstanceUID',
+    'Instance': 'SOPInstanceUID',
+}
+MAX_REALIGNMENT_PAGES = 10
+
+
+class FindCursor:
+    """Cursor over the resources that fit a query, fetched page by page
+
+    Unlike `query_orthanc`, the cursor remembers the last returned resource (the anchor).
+    Each page is fetched along with the anchor, which detects when resources were inserted
+    or deleted before the cursor position since the previous page. The position is then
+    realigned on the anchor, so that resources are neither skipped nor returned twice.
+    If every resource of the previous page has been deleted, or if more than `MAX_REALIGNMENT_PAGES`
+    pages of resources were inserted or deleted before it, the cursor cannot be realigned
+    and the scan continues from its current position.
+
+    When the server supports the extended /tools/find, the resources are ordered
+    (by default on the UID of their level), so the scan order does not depend on the
+    database internal order.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    client = pyorthanc.Orthanc('http://localhost:8042', 'orthanc', 'orthanc')
+    cursor = pyorthanc.FindCursor(client, 'Instance', query={'Modality': 'CT'}, page_size=500)
+
+    for instance in cursor:
+        ...
+
+    # A scan can also be resumed later
+    cursor = pyorthanc.FindCursor(client, 'Instance', position=cursor.position, anchor=cursor.anchor)
+    ```
+    """
+
+    def __init__(self,
+                 client: Orthanc,
+                 level: str,
+                 query: Dict[str, str] = None,
+                 labels: Union[List[str], str] = None,
+                 labels_constraint: str = 'All',
+                 order_by: List[Dict[str, str]] = None,
+                 page_size: int = DEFAULT_RESOURCES_LIMIT,
+                 lock_children: bool = False,
+                 position: int = 0,
+                 anchor: Optional[str] = None,
+                 requested_tags: List[str] = None) -> None:
+        """Constructor
+
+        Parameters
+        ----------
+        client
+            Orthanc client.
+        level
+            Level of the query ['Patient', 'Study', 'Series', 'Instance'].
+        query
+            Dictionary that specifies the filters on the level related DICOM tags.
+        labels
+            List of strings specifying which labels to look for in the resources.
+        labels_constraint
+            Constraint on the labels, can be 'All', 'Any', or 'None'.
+        order_by
+            Order of the resources, as a list of Orthanc "OrderBy" criteria. Defaults to the UID
+            of the level if the server supports the extended /tools/find.
+        page_size
+            Number of resources per page.
+        lock_children
+            If `lock_children` is True, the resource children will be cached at the first query
+            rather than queried every time.
+        position
+            Index of the next resource, to resume a scan.
+        anchor
+            Identifier of the last returned resource, to resume a scan.
+        requested_tags
+            DICOM tags to retrieve along with the resources, available through `resource.requested_tags`.
+        """
+        _validate_level(level)
+        _validate_labels_constraint(labels_constraint)
+
+        # In this class, client that return raw responses are not supported.
+        self.client = util.ensure_non_raw_response(client)
+        self.level = level
+        self.page_size = page_size
+        self.lock_children = lock_children
+
+        self.position = position
+        self.anchor = anchor
+        self.exhausted = False
+
+        has_extended_find = get_capabilities(self.client).has_extended_find
+
+        if order_by is None and has_extended_find:
+            order_by = [{'Type': 'DicomTag', 'Key': DEFAULT_ORDER_BY_TAGS[level], 'Direction': 'ASC'}]
+        elif order_by is not None and not has_extended_find:
+            raise errors.NotSupportedError(
+                'The "order_by" parameter requires a server that supports the extended /tools/find '
+                '(Orthanc >= 1.12.5 with a compatible database backend).'
+            )
+
+        self._data = _make_find_data(
+            level, query, labels, labels_constraint, page_size, position, order_by, requested_tags=requested_tags
+        )
+        self._previous_ids: List[str] = [] if anchor is None else [anchor]
+
+    def __iter__(self) -> Iterator[Resource]:
+        while True:
+            page = self.fetch_page()
+            if len(page) == 0:
+                return
+
+            yield from page
+
+    def fetch_page(self) -> List[Resource]:
+        """Fetch the next page of resources
+
+        Returns
+        -------
+        List[Resource]
+            Resources of the next page, an empty list when all resources have been returned.
+        """
+        if self.exhausted:
+            return []
+
+        results, self.position = self._fetch_next_results()
+        if len(results) == 0:
+            self.exhausted = True
+            return []
+
+        self.anchor = results[-1]['ID']
+        self._previous_ids = [i['ID'] for i in results]
+
+        return [_make_resource(self.level, i, self.client, self.lock_children) for i in results]
+
+    def _fetch_next_results(self) -> Tuple[List[Dict], int]:
+        """Return the next results and the position following them"""
+        if self.anchor is None or self.position == 0:
+            results = self._find(self.position, self.page_size)
+
+            return results, self.position + len(results)
+
+        # The window starts on the anchor, which must be its first element if
+        # no resource has been inserted or deleted before it since the last page.
+        window = self._find(self.position - 1, self.page_size + 1)
+        ids = [i['ID'] for i in window]
+
+        if self.anchor in ids:
+            index = ids.index(self.anchor)  # Number of resources inserted before the anchor
+            results = window[index + 1:]
+
+            if len(results) == 0 and len(window) == self.page_size + 1:
+                # The anchor ends a full window (at least `page_size` insertions), the scan is not over
+                position = self.position + index
+                results = self._find(position, self.page_size)
+
+                return results, position + len(results)
+
+            return results, self.position + index + len(results)
+
+        return self._realign()
+
+    def _realign(self) -> Tuple[List[Dict], int]:
+        """Look for the last returned resources around the cursor position, after insertions or deletions
+
+        The windows before the position are searched first (deletions), then the windows after it (insertions).
+        """
+        backward_starts = []
+        since = self.position - 1
+        for _ in range(MAX_REALIGNMENT_PAGES):
+            if since == 0:
+                break
+            since = max(0, since - self.page_size)
+            backward_starts.append(since)
+
+        forward_starts = [self.position - 1 + i * self.page_size for i in range(1, MAX_REALIGNMENT_PAGES + 1)]
+
+        for since in backward_starts + forward_starts:
+            ids = [i['ID'] for i in self._find(since, self.page_size + 1)]
+
+            # The anchor may have been deleted too, the last returned resource that still exists is used instead
+            for previous_id in reversed(self._previous_ids):
+                if previous_id in ids:
+                    return self._find_after(since + ids.index(previous_id) + 1)
+
+            if since in forward_starts and len(ids) <= self.page_size:
+                break  # The end of the resources is reached
+
+        # All resources of the previous page were deleted, they are filtered out to avoid duplicates.
+        return self._find_after(self.position)
+
+    def _find_after(self, position: int) -> Tuple[List[Dict], int]:
+        """Next results from the position, without the resources of the previous page (e.g. shifted by insertions)"""
+        while True:
+            window = self._find(position, self.page_size)
+            position += len(window)
+            results = [i for i in window if i['ID'] not in self._previous_ids]
+
+            if len(results) > 0 or len(window) == 0:
+                return results, position
+
+    def _find(self, since: int, limit: int) -> List[Dict]:
+        return self.client.post_tools_find({**self._data, 'Since': since, 'Limit': limit})
@@ -1,22 +1,37 @@
 import asyncio
 import warnings
-from typing import Callable, Dict, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Set, Type, Union
 
-from . import util
+from . import filters, util
+from ._concurrency import AdaptiveLimiter, limited_call
+from ._find import DEFAULT_RESOURCES_LIMIT, query_orthanc
 from ._resources.instance import Instance
 from ._resources.patient import Patient
+from ._resources.resource import Resource
 from ._resources.series import Series
 from ._resources.study import Study
 from .async_client import AsyncOrthanc
 from .client import Orthanc
 from .util import async_to_sync
 
+LEVELS = ['Patient', 'Study', 'Series', 'Instance']
+RESOURCE_CLASSES = {'Patient': Patient, 'Study': Study, 'Series': Series, 'Instance': Instance}
+PARENT_KEYS = {'Study': 'ParentPatient', 'Series': 'ParentStudy', 'Instance': 'ParentSeries'}
+
+# Number of patients built concurrently by `async_iter_find()` and by `find()` with an `AsyncOrthanc` client
+DEFAULT_PENDING_PATIENTS = 10
+
 
 def find(orthanc: Union[Orthanc, AsyncOrthanc],
          patient_filter: Optional[Callable] = None,
          study_filter: Optional[Callable] = None,
          series_filter: Optional[Callable] = None,
-         instance_filter: Optional[Callable] = None) -> List[Patient]:
+         instance_filter: Optional[Callable] = None,
+         max_concurrency: Optional[int] = None,
+         snapshot: bool = False,
+         max_workers: Optional[int] = None) -> List[Patient]:
     """Find desired patients/Study/Series/Instance in an Orthanc server
 
     This function builds a series of tree structure.
@@ -37,6 +52,28 @@ def find(orthanc: Union[Orthanc, AsyncOrthanc],
         Series filter (e.g. lambda series: series.modality == 'SR')
     instance_filter
         Instance filter (e.g. lambda instance: instance.SOPInstance == '...')
+        The filters can also be declarative filters from `pyorthanc.filters` (e.g. `filters.Equals('Modality', 'SR')`).
+        These are translated into /tools/find queries, so only the matching resources (and their parents)
+        are retrieved from Orthanc. The parts that Orthanc cannot evaluate are evaluated on the client.
+    max_concurrency
+        Only used with an `AsyncOrthanc` client. Maximum number of concurrent requests sent to Orthanc.
+        The effective concurrency is lowered when Orthanc is overloaded (503 responses or timeouts),
+        and the failing requests are retried with an exponential backoff.
+        If None (default), the number of concurrent requests is not limited.
+        With declarative filters, the filters left to the client are evaluated on a pool of
+        `max_concurrency` threads (see `max_workers`).
+    snapshot
+        If True, each level (patients, studies, series, instances) is retrieved with a few paged
+        expanded listings (e.g. `/series?expand&since=...&limit=...`) and the tree is linked in memory,
+        rather than querying the children of every resource. This takes a few dozen requests for
+        large servers, but retrieves the information of every resource of the server, even those
+        excluded by the filters. Resources created while the levels are listed may be missing.
+        The information of the returned resources is the one of the snapshot, until `.refresh()`.
+    max_workers
+        Only used with an `Orthanc` client. If set, the filters and the retrieval of the children
+        of each level (which often query Orthanc, e.g. `series.modality`) are evaluated on a pool of
+        `max_workers` threads, which share the connection pool of the client.
+        The resources are returned in the same order as without `max_workers`.
 
     Returns
     -------
@@ -46,82 +83,473 @@ def find(orthanc: Union[Orthanc, AsyncOrthanc],
     # In this function, client that return raw responses are not supported.
     orthanc = util.ensure_non_raw_response(orthanc)
 
+    level_filters = {
+        'Patient': patient_filter, 'Study': study_filter, 'Series': series_filter, 'Instance': instance_filter
+    }
+    if not snapshot and any(isinstance(f, filters.Filter) for f in level_filters.values()):
+        if isinstance(orthanc, AsyncOrthanc):
+            patients = _find_with_pushdown(async_to_sync(orthanc), level_filters, max_concurrency)
+        else:
+            patients = _find_with_pushdown(orthanc, level_filters, max_workers)
+
+        if patients is not None:
+            return patients
+
+    if snapshot:
+        if isinstance(orthanc, AsyncOrthanc):
+            resources_information = asyncio.run(_async_take_snapshot(orthanc))
+            orthanc = async_to_sync(orthanc)
+        else:
+            resources_information = _take_snapshot(orthanc)
+
+        return _build_patients_from_snapshot(
+            orthanc, resources_information, patient_filter, study_filter, series_filter, instance_filter
+        )
+
     if isinstance(orthanc, AsyncOrthanc):
         return asyncio.run(_async_find(
             async_orthanc=orthanc,
             patient_filter=patient_filter,
             study_filter=study_filter,
             series_filter=series_filter,
-            instance_filter=instance_filter
+            instance_filter=instance_filter,
+            max_concurrency=max_concurrency
         ))
 
     patients = [Patient(i, orthanc, _lock_children=True) for i in orthanc.get_patients()]
-    if patient_filter is not None:
-        patients = [i for i in patients if patient_filter(i)]
 
-    for patient in patients:
-        if study_filter is not None:
-            patient._child_resources = [i for i in patient.studies if study_filter(i)]
+    return _filter_patients(patients, patient_filter, study_filter, series_filter, instance_filter, max_workers)
 
-        for study in patient.studies:
-            if series_filter is not None:
-                study._child_resources = [i for i in study.series if series_filter(i)]
 
-            for series in study.series:
-                if instance_filter is not None:
-                    series._child_resources = [i for i in series.instances if instance_filter(i)]
+def _filter_patients(
+        patients: List[Patient],
+        patient_filter: Optional[Callable],
+        study_filter: Optional[Callable],
+        series_filter: Optional[Callable],
+        instance_filter: Optional[Callable],
+        max_workers: Optional[int] = None) -> List[Patient]:
+    """Filter the patient trees level by level
+
+    With `max_workers`, the filters and the children retrieval of all resources of a level
+    are evaluated on a thread pool. The results are kept in the original order.
+    """
+    if max_workers is None:
+        return _filter_patients_with_map(
+            map, patients, patient_filter, study_filter, series_filter, instance_filter
+        )
+
+    if max_workers < 1:
+        raise ValueError(f'max_workers must be at least 1, got {max_workers}.')
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return _filter_patients_with_map(
+            executor.map, patients, patient_filter, study_filter, series_filter, instance_filter
+        )
+
+
+def _filter_patients_with_map(
+        map_function: Callable,
+        patients: List[Patient],
+        patient_filter: Optional[Callable],
+        study_filter: Optional[Callable],
+        series_filter: Optional[Callable],
+        instance_filter: Optional[Callable]) -> List[Patient]:
+    if patient_filter is not None:
+        patients = _filter_resources(map_function, patients, patient_filter)
+
+    studies = _filter_children(map_function, patients, study_filter)
+    series = _filter_children(map_function, studies, series_filter)
+
+    if instance_filter is not None:
+        _filter_children(map_function, series, instance_filter)
 
     return trim_patients(patients)
 
 
-async def _async_find(
-        async_orthanc: AsyncOrthanc,
-        patient_filter: Optional[Callable] = None,
-        study_filter: Optional[Callable] = None,
-        series_filter: Optional[Callable] = None,
-        instance_filter: Optional[Callable] = None) -> List[Patient]:
-    patient_identifiers = await async_orthanc.get_patients()
-    tasks = []
+def _filter_resources(map_function: Callable, resources: List[Resource], resource_filter: Callable) -> List[Resource]:
+    results = list(map_function(resource_filter, resources))
 
-    for patient_id in patient_identifiers:  # This ID is the Orthanc's ID, and not the PatientID
-        task = asyncio.create_task(
-            _async_build_patient(
-                patient_id,
-                async_orthanc,
+    return [resource for resource, result in zip(resources, results) if result]
+
+
+def _filter_children(
+        map_function: Callable,
+        parents: List[Resource],
+        resource_filter: Optional[Callable]) -> List[Resource]:
+    """Filter the children of the parents, and return the kept children of all the parents"""
+    children_by_parent = list(map_function(_get_children, parents))
+
+    if resource_filter is not None:
+        kept_children = _filter_resources(
+            map_function, [child for children in children_by_parent for child in children], resource_filter
+        )
+        kept_identifiers = {child.id_ for child in kept_children}
+
+        for parent, children in zip(parents, children_by_parent):
+            parent._child_resources = [child for child in children if child.id_ in kept_identifiers]
+
+    return [child for parent in parents for child in parent._child_resources]
+
+
+def _get_children(resource: Resource) -> List[Resource]:
+    if isinstance(resource, Patient):
+        return resource.studies
+    if isinstance(resource, Study):
+        return resource.series
+
+    return resource.instances
+
+
+def _find_with_pushdown(
+        orthanc: Orthanc,
+        level_filters: Dict[str, Optional[Callable]],
+        max_workers: Optional[int] = None) -> Optional[List[Patient]]:
+    """Find with the declarative filters evaluated by Orthanc, None if Orthanc cannot evaluate any of them
+
+    The resources of the deepest filtered level are found with a single query (which includes the
+    tag constraints of the upper levels), then linked to their parents. Label constraints
+    of the upper levels are checked against separate queries, and the remaining filters on the client.
+    """
+    queries, labels_filters, leftover_filters = {}, {}, {}
+    for level in LEVELS:
+        queries[level], labels_filters[level], leftover_filters[level] = filters.split_filter(
+            level_filters[level], level
+        )
+
+    filtered_levels = [i for i in LEVELS if queries[i] or labels_filters[i] is not None]
+    if len(filtered_levels) == 0:
+        return None
+
+    deepest_level = filtered_levels[-1]
+    resources = _query_level(orthanc, deepest_level, queries, labels_filters[deepest_level])
+
+    for level in filtered_levels[:-1]:
+        if labels_filters[level] is not None:
+            identifiers = {i.id_ for i in _query_level(orthanc, level, queries, labels_filters[level])}
+            leftover_filters[level] = _add_identifiers_filter(leftover_filters[level], identifiers)
+
+    patients = _link_to_patients(orthanc, deepest_level, resources)
+
+    return _filter_patients(
+        patients,
+        leftover_filters['Patient'],
+        leftover_filters['Study'],
+        leftover_filters['Series'],
+        leftover_filters['Instance'],
+        max_workers
+    )
+
+
+def _query_level(
+        orthanc: Orthanc,
+        level: str,
+        queries: Dict[str, Dict[str, str]],
+        labels_filter: Optional[filters.HasLabels]) -> List[Resource]:
+    query = {}
+    for query_level in LEVELS[:LEVELS.index(level) + 1]:
+        query.update(queries[query_level])  # Orthanc also filters on the tags of the parent levels
+
+    return query_orthanc(
+        orthanc,
+        level,
+        query=query,
+        labels=None if labels_filter is None else labels_filter.labels,
+        labels_constraint='All' if labels_filter is None else labels_filter.constraint,
+        lock_children=True
+    )
+
+
+def _add_identifiers_filter(resource_filter: Optional[Callable], identifiers: Set[str]) -> Callable:
+    def identifiers_filter(resource: Resource) -> bool:
+        return resource.id_ in identifiers
+
+    return identifiers_filter if resource_filter is None else filters.And(identifiers_filter, resource_filter)
+
+
+def _link_to_patients(orthanc: Orthanc, level: str, resources: List[Resource]) -> List[Patient]:
+    """Build the patient trees that contain the resources (the parents only have the provided resources as children)"""
+    for child_level in reversed(LEVELS[1:LEVELS.index(level) + 1]):
+        parent_class = RESOURCE_CLASSES[LEVELS[LEVELS.index(child_level) - 1]]
+        parents: Dict[str, Resource] = {}  # Dict keeps the order of the first child of each parent
+
+        for resource in resources:
+            parent_id = resource.information[PARENT_KEYS[child_level]]
+
+            if parent_id not in parents:
+                parents[parent_id] = parent_class(parent_id, orthanc, _lock_children=True)
+                parents[parent_id]._child_resources = []
+
+            parents[parent_id]._child_resources.append(resource)
+
+        resources = list(parents.values())
+
+    return resources
+
+
+def iter_find(orthanc: Orthanc,
+              patient_filter: Optional[Callable] = None,
+              study_filter: Optional[Callable] = None,
+              series_filter: Optional[Callable] = None,
+              instance_filter: Optional[Callable] = None,
+              max_workers: Optional[int] = None) -> Iterator[Patient]:
+    """Find desired patients/Study/Series/Instance in an Orthanc server, one patient at a time
+
+    Like `find()`, but the patients are yielded (trimmed) as soon as their tree is built,
+    rather than after the whole server has been scanned. Only one patient tree is built at a time,
+    so the processing of the first patients can start right away and the memory usage stays bounded.
+
+    Parameters
+    ----------
+    orthanc
+        Orthanc object.
+    patient_filter
+        Patient filter (e.g. lambda patient: patient.id_ == '03HDQ99*')
+    study_filter
+        Study filter (e.g. lambda study: study.study_id == '*pros*')
+    series_filter
+        Series filter (e.g. lambda series: series.modality == 'SR')
+    instance_filter
+        Instance filter (e.g. lambda instance: instance.SOPInstance == '...')
+    max_workers
+        If set, the filters and the children retrieval of each patient tree are evaluated
+        on a pool of `max_workers` threads (see `find()`).
+
+    Yields
+    ------
+    Patient
+        Patients that have resources that respect the filters, in the order of Orthanc.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    client = pyorthanc.Orthanc('http://localhost:8042', 'orthanc', 'orthanc')
+    for patient in pyorthanc.iter_find(client, series_filter=lambda s: s.modality == 'CT'):
+        ...
+    ```
+    """
+    # In this function, client that return raw responses are not supported.
+    orthanc = util.ensure_non_raw_response(orthanc)
+
+    level_filters = {
+        'Patient': patient_filter, 'Study': study_filter, 'Series': series_filter, 'Instance': instance_filter
+    }
+    if any(isinstance(f, filters.Filter) for f in level_filters.values()):
+        # Orthanc only returns the matching resources, the trees are already small.
+        patients = _find_with_pushdown(orthanc, level_filters, max_workers)
+        if patients is not None:
+            yield from patients
+            return
+
+    if max_workers is not None and max_workers < 1:
+        raise ValueError(f'max_workers must be at least 1, got {max_workers}.')
+
+    executor = None if max_workers is None else ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for patient_id in orthanc.get_patients():
+            patients = _filter_patients_with_map(
+                map if executor is None else executor.map,
+                [Patient(patient_id, orthanc, _lock_children=True)],
                 patient_filter,
                 study_filter,
                 series_filter,
                 instance_filter
             )
+            yield from patients
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+async def async_iter_find(async_orthanc: AsyncOrthanc,
+                          patient_filter: Optional[Callable] = None,
+                          study_filter: Optional[Callable] = None,
+                          series_filter: Optional[Callable] = None,
+                          instance_filter: Optional[Callable] = None,
+                          max_concurrency: Optional[int] = None,
+                          max_pending_patients: int = DEFAULT_PENDING_PATIENTS) -> AsyncIterator[Patient]:
+    """Find desired patients/Study/Series/Instance in an Orthanc server, with an asynchronous client
+
+    Like `find()`, but the patients are yielded (trimmed) as soon as their tree is built.
+    At most `max_pending_patients` patient trees are built concurrently, so the memory usage stays bounded.
+
+    Parameters
+    ----------
+    async_orthanc
+        AsyncOrthanc object.
+    patient_filter
+        Patient filter (e.g. lambda patient: patient.id_ == '03HDQ99*')
+    study_filter
+        Study filter (e.g. lambda study: study.study_id == '*pros*')
+    series_filter
+        Series filter (e.g. lambda series: series.modality == 'SR')
+    instance_filter
+        Instance filter (e.g. lambda instance: instance.SOPInstance == '...')
+    max_concurrency
+        Maximum number of concurrent requests sent to Orthanc (see `find()`). With declarative filters,
+        the filters left to the client are evaluated on a pool of `max_concurrency` threads.
+    max_pending_patients
+        Maximum number of patient trees built concurrently.
+
+    Yields
+    ------
+    Patient
+        Patients that have resources that respect the filters, in the order their tree is completed.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    async_client = pyorthanc.AsyncOrthanc('http://localhost:8042', 'orthanc', 'orthanc')
+    async for patient in pyorthanc.async_iter_find(async_client, series_filter=lambda s: s.modality == 'CT'):
+        ...
+    ```
+    """
+    if max_pending_patients < 1:
+        raise ValueError(f'max_pending_patients must be at least 1, got {max_pending_patients}.')
+
+    # In this function, client that return raw responses are not supported.
+    async_orthanc = util.ensure_non_raw_response(async_orthanc)
+
+    # A single synchronous client (and connection pool) is shared by all the built resources
+    orthanc = async_to_sync(async_orthanc)
+
+    level_filters = {
+        'Patient': patient_filter, 'Study': study_filter, 'Series': series_filter, 'Instance': instance_filter
+    }
+    if any(isinstance(f, filters.Filter) for f in level_filters.values()):
+        patients = await asyncio.get_running_loop().run_in_executor(
+            None, _find_with_pushdown, orthanc, level_filters, max_concurrency
         )
-        tasks.append(task)
+        if patients is not None:
+            for patient in patients:
+                yield patient
+            return
+
+    limiter = None if max_concurrency is None else AdaptiveLimiter(max_concurrency)
+    patient_identifiers = await limited_call(limiter, async_orthanc.get_patients)
+
+    patients = _async_build_patients(
+        patient_identifiers,
+        async_orthanc,
+        orthanc,
+        limiter,
+        max_pending_patients,
+        patient_filter,
+        study_filter,
+        series_filter,
+        instance_filter
+    )
+    async with aclosing(patients):  # The pending tasks are cancelled when the caller stops early
+        async for patient in patients:
+            patient.remove_empty_studies()
+
+            if patient.studies != []:
+                yield patient
 
-    patients = await asyncio.gather(*tasks)
-    patients = list(patients)
+
+async def _async_find(
+        async_orthanc: AsyncOrthanc,
+        patient_filter: Optional[Callable] = None,
+        study_filter: Optional[Callable] = None,
+        series_filter: Optional[Callable] = None,
+        instance_filter: Optional[Callable] = None,
+        max_concurrency: Optional[int] = None) -> List[Patient]:
+    limiter = None if max_concurrency is None else AdaptiveLimiter(max_concurrency)
+
+    # A single synchronous client (and connection pool) is shared by all the built resources
+    orthanc = async_to_sync(async_orthanc)
+
+    patient_identifiers = await limited_call(limiter, async_orthanc.get_patients)
+    positions = {patient_id: index for index, patient_id in enumerate(patient_identifiers)}
+
+    patients = [
+        patient async for patient in _async_build_patients(
+            patient_identifiers,
+            async_orthanc,
+            orthanc,
+            limiter,
+            DEFAULT_PENDING_PATIENTS,
+            patient_filter,
+            study_filter,
+            series_filter,
+            instance_filter
+        )
+    ]
+    patients.sort(key=lambda patient: positions[patient.id_])  # In the order of the patients of Orthanc
 
     return trim_patients(patients)
 
 
+async def _async_build_patients(
+        patient_identifiers: List[str],
+        async_orthanc: AsyncOrthanc,
+        orthanc: Orthanc,
+        limiter: Optional[AdaptiveLimiter],
+        max_pending_patients: int,
+        patient_filter: Optional[Callable],
+        study_filter: Optional[Callable],
+        series_filter: Optional[Callable],
+        instance_filter: Optional[Callable]) -> AsyncIterator[Patient]:
+    """Build the patient trees, with at most `max_pending_patients` trees built concurrently
+
+    The patients are yielded in the order their tree is completed. The tasks of the patients
+    are only created when a slot is available, so they are not all created up front.
+    """
+    patient_identifiers = iter(patient_identifiers)  # These IDs are the Orthanc's IDs, and not the PatientIDs
+    pending = set()
+
+    try:
+        while True:
+            for patient_id in patient_identifiers:
+                pending.add(asyncio.create_task(_async_build_patient(
+                    patient_id,
+                    async_orthanc,
+                    orthanc,
+                    limiter,
+                    patient_filter,
+                    study_filter,
+                    series_filter,
+                    instance_filter
+                )))
+                if len(pending) >= max_pending_patients:
+                    break
+
+            if len(pending) == 0:
+                return
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
 async def _async_build_patient(
         patient_id_: str,
         async_orthanc: AsyncOrthanc,
+        orthanc: Orthanc,
+        limiter: Optional[AdaptiveLimiter],
         patient_filter: Optional[Callable],
         study_filter: Optional[Callable],
         series_filter: Optional[Callable],
         instance_filter: Optional[Callable]) -> Patient:
-    patient = Patient(patient_id_, async_to_sync(async_orthanc), _lock_children=True)
+    patient = Patient(patient_id_, orthanc, _lock_children=True)
 
     if patient_filter is not None:
         if not patient_filter(patient):
             patient._child_resources = []
             return patient
 
-    study_information = await async_orthanc.get_patients_id_studies(patient_id_)
+    study_information = await limited_call(limiter, async_orthanc.get_patients_id_studies, patient_id_)
 
     tasks = []
     for info in study_information:
         task = asyncio.create_task(
-            _async_build_study(info, async_orthanc, study_filter, series_filter, instance_filter)
+            _async_build_study(info, async_orthanc, orthanc, limiter, study_filter, series_filter, instance_filter)
         )
         tasks.append(task)
 
@@ -133,22 +561,28 @@ async def _async_build_patient(
 async def _async_build_study(
         study_information: Dict,
         async_orthanc: AsyncOrthanc,
+        orthanc: Orthanc,
+        limiter: Optional[AdaptiveLimiter],
         study_filter: Optional[Callable],
         series_filter: Optional[Callable],
         instance_filter: Optional[Callable]) -> Study:
-    study = Study(study_information['ID'], async_to_sync(async_orthanc), _lock_children=True)
-    study._information = study_information
+    study = Study(study_information['ID'], orthanc, _lock_children=True)
+    study._set_information(study_information)
 
     if study_filter is not None:
         if not study_filter(study):
             study._child_resources = []
             return study
 
-    series_information = await async_orthanc.get_studies_id_series(study_information['ID'])
+    series_information = await limited_call(
+        limiter, async_orthanc.get_studies_id_series, study_information['ID']
+    )
 
     tasks = []
     for info in series_information:
-        task = asyncio.create_task(_async_build_series(info, async_orthanc, series_filter, instance_filter))
+        task = asyncio.create_task(
+            _async_build_series(info, async_orthanc, orthanc, limiter, series_filter, instance_filter)
+        )
         tasks.append(task)
 
     study._child_resources = await asyncio.gather(*tasks)
@@ -159,19 +593,23 @@ async def _async_build_study(
 async def _async_build_series(
         series_information: Dict,
         async_orthanc: AsyncOrthanc,
+        orthanc: Orthanc,
+        limiter: Optional[AdaptiveLimiter],
         series_filter: Optional[Callable],
         instance_filter: Optional[Callable]) -> Series:
-    series = Series(series_information['ID'], async_to_sync(async_orthanc), _lock_children=True)
-    series._information = series_information
+    series = Series(series_information['ID'], orthanc, _lock_children=True)
+    series._set_information(series_information)
 
     if series_filter is not None:
         if not series_filter(series):
             series._child_resources = []
             return series
 
-    instance_information = await async_orthanc.get_series_id_instances(series_information['ID'])
+    instance_information = await limited_call(
+        limiter, async_orthanc.get_series_id_instances, series_information['ID']
+    )
     series._child_resources = [
-        _build_instance(i, async_to_sync(async_orthanc), instance_filter) for i in instance_information
+        _build_instance(i, orthanc, instance_filter) for i in instance_information
     ]
 
     return series
@@ -182,7 +620,7 @@ def _build_instance(
         orthanc: Orthanc,
         instance_filter: Optional[Callable]) -> Optional[Instance]:
     instance = Instance(instance_information['ID'], orthanc, _lock_children=True)
-    instance._information = instance_information
+    instance._set_information(instance_information)
 
     if instance_filter is not None:
         if not instance_filter(instance):
@@ -191,6 +629,116 @@ def _build_instance(
     return instance
 
 
+def _take_snapshot(orthanc: Orthanc) -> Dict[str, Dict[str, Dict]]:
+    """Get the information of all resources, by level and by identifier"""
+    return {
+        'Patient': _list_level(orthanc.get_patients),
+        'Study': _list_level(orthanc.get_studies),
+        'Series': _list_level(orthanc.get_series),
+        'Instance': _list_level(orthanc.get_instances),
+    }
+
+
+async def _async_take_snapshot(async_orthanc: AsyncOrthanc) -> Dict[str, Dict[str, Dict]]:
+    """Get the information of all resources, by level and by identifier (levels are listed concurrently)"""
+    patients, studies, series, instances = await asyncio.gather(
+        _async_list_level(async_orthanc.get_patients),
+        _async_list_level(async_orthanc.get_studies),
+        _async_list_level(async_orthanc.get_series),
+        _async_list_level(async_orthanc.get_instances),
+    )
+
+    return {'Patient': patients, 'Study': studies, 'Series': series, 'Instance': instances}
+
+
+def _list_level(get_resources: Callable) -> Dict[str, Dict]:
+    resources_information = {}
+    since = 0
+
+    while True:
+        page = get_resources(params={'expand': True, 'since': since, 'limit': DEFAULT_RESOURCES_LIMIT})
+        if len(page) == 0:
+            return resources_information
+
+        resources_information.update({i['ID']: i for i in page})
+        since += DEFAULT_RESOURCES_LIMIT
+
+
+async def _async_list_level(get_resources: Callable) -> Dict[str, Dict]:
+    resources_information = {}
+    since = 0
+
+    while True:
+        page = await get_resources(params={'expand': True, 'since': since, 'limit': DEFAULT_RESOURCES_LIMIT})
+        if len(page) == 0:
+            return resources_information
+
+        resources_information.update({i['ID']: i for i in page})
+        since += DEFAULT_RESOURCES_LIMIT
+
+
+def _build_patients_from_snapshot(
+        orthanc: Orthanc,
+        resources_information: Dict[str, Dict[str, Dict]],
+        patient_filter: Optional[Callable],
+        study_filter: Optional[Callable],
+        series_filter: Optional[Callable],
+        instance_filter: Optional[Callable]) -> List[Patient]:
+    # The children are read from the snapshot rather than from `.information`,
+    # which would be queried again once older than the information TTL
+    patients_information = resources_information['Patient']
+    studies_information = resources_information['Study']
+    series_information = resources_information['Series']
+
+    patients = _make_snapshot_resources(
+        orthanc, Patient, list(patients_information), patients_information, patient_filter
+    )
+
+    for patient in patients:
+        patient._child_resources = _make_snapshot_resources(
+            orthanc, Study, patients_information[patient.id_]['Studies'], studies_information, study_filter
+        )
+
+        for study in patient._child_resources:
+            study._child_resources = _make_snapshot_resources(
+                orthanc, Series, studies_information[study.id_]['Series'], series_information, series_filter
+            )
+
+            for series in study._child_resources:
+                series._child_resources = _make_snapshot_resources(
+                    orthanc,
+                    Instance,
+                    series_information[series.id_]['Instances'],
+                    resources_information['Instance'],
+                    instance_filter
+                )
+
+    return trim_patients(patients)
+
+
+def _make_snapshot_resources(
+        orthanc: Orthanc,
+        resource_class: Type[Resource],
+        identifiers: List[str],
+        information_by_identifier: Dict[str, Dict],
+        resource_filter: Optional[Callable]) -> List[Resource]:
+    resources = []
+
+    for identifier in identifiers:
+        information = information_by_identifier.get(identifier)
+        if information is None:
+            continue  # The resource was created after its level was listed
+
+        # The information is the one of the snapshot until `.refresh()`, like the linked children
+        resource = resource_class(identifier, orthanc, _lock_children=True, information_ttl=None)
+        resource._set_information(information)
+
+        if resource_filter is None or resource_filter(resource):
+            resources.append(resource)
+
+    return resources
+
+
 def trim_patients(patients: List[Patient]) -> List[Patient]:
     """Trim Patient forest (list of patients)
 
@@ -1,15 +1,32 @@
-from typing import Dict, List, Union
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
 
-from . import util
+from . import errors, util
+from ._paging import AdaptivePager
+from ._resources import AsyncInstance, AsyncPatient, AsyncResource, AsyncSeries, AsyncStudy
 from ._resources.instance import Instance
 from ._resources.patient import Patient
 from ._resources.resource import Resource
 from ._resources.series import Series
 from ._resources.study import Study
+from .async_client import AsyncOrthanc
+from .capabilities import _is_version_at_least, get_capabilities
 from .client import Orthanc
+from .filters import MAIN_DICOM_TAGS
 
 DEFAULT_RESOURCES_LIMIT = 1_000
 
+# Queries with multiple values for a tag (e.g. {'PatientID': [...]}) are split into sub-queries
+MULTIPLE_VALUES_CHUNK_SIZE = 100
+MULTIPLE_VALUES_MAX_WORKERS = 8
+# With prefix compression, values that only differ by their last characters are queried with '?' wildcards
+PREFIX_COMPRESSION_WILDCARDS = 2
+PREFIX_COMPRESSION_MIN_VALUES = 10
+
+# First Orthanc version with the /tools/count-resources route
+COUNT_RESOURCES_VERSION = '1.12.5'
+
 
 def find_patients(client: Orthanc,
                   query: Dict[str, str] = None,
@@ -212,7 +229,13 @@ def query_orthanc(client: Orthanc,
                   limit: int = DEFAULT_RESOURCES_LIMIT,
                   since: int = 0,
                   retrieve_all_resources: bool = True,
-                  lock_children: bool = False) -> List[Resource]:
+                  lock_children: bool = False,
+                  max_workers: Optional[int] = None,
+                  order_by: List[Dict[str, str]] = None,
+                  response_content: List[str] = None,
+                  requested_tags: List[str] = None,
+                  prefix_compression: bool = False,
+                  pager: Optional[AdaptivePager] = None) -> List[Resource]:
     """Query data in the Orthanc server
 
     Parameters
@@ -223,6 +246,11 @@ def query_orthanc(client: Orthanc,
         Level of the query ['Patient', 'Study', 'Series', 'Instance'].
     query
         Dictionary that specifies the filters on the level related DICOM tags.
+        One of the tags can have a list of values (e.g. `{'PatientID': ['ID1', 'ID2', ...]}`) to find
+        the resources that match any of the values. The values are then split into sub-queries
+        (exact values are grouped with the DICOM list matching, e.g. 'ID1\\ID2') that are sent concurrently
+        (with `max_workers` threads), and the results are merged without duplicates. The order of the
+        resources is then not kept, and `since`, `order_by` and `retrieve_all_resources=False` are not supported.
     labels
         List of strings specifying which labels to look for in the resources.
     labels_constraint
@@ -237,6 +265,34 @@ def query_orthanc(client: Orthanc,
         If `lock_children` is True, the resource children (ex. instances of a series via `Series.instances`)
         will be cached at the first query rather than queried every time. This is useful when you want
         to filter the children of a resource and want to maintain the filter result.
+    max_workers
+        If set (with `retrieve_all_resources=True`), the pages of `limit` resources are fetched
+        with `max_workers` concurrent requests instead of one after another. The number of pages
+        is computed with the /tools/count-resources route (Orthanc >= 1.12.5). The resources
+        are returned in the same order as with the sequential paging.
+    order_by
+        Order of the resources, as a list of Orthanc "OrderBy" criteria,
+        e.g. `[{'Type': 'DicomTag', 'Key': 'StudyDate', 'Direction': 'DESC'}]`.
+        Requires a server with the extended /tools/find (Orthanc >= 1.12.5 with a compatible DB backend).
+    response_content
+        Content of the resources to retrieve (e.g. `['MainDicomTags', 'Labels']`) rather than
+        their full main information. This reduces the response size of large queries. Ignored if the
+        server does not support the extended /tools/find.
+    requested_tags
+        DICOM tags (names like 'SliceThickness' or hexadecimal like '0018,0050') to retrieve along with
+        the resources, even if they are not main DICOM tags (Orthanc >= 1.11.0). They are then available
+        through `resource.requested_tags` without sending one /tags request per resource.
+    prefix_compression
+        Only used when a tag has a list of values. If True, exact values that only differ by their last
+        characters (e.g. consecutive identifiers 'MRN1000' to 'MRN1099') are queried with a single
+        wildcard query ('MRN10??'), and the results are then filtered on the exact values. This is only
+        applied to main DICOM tags of the level, and reduces the number of queries when the values are dense.
+    pager
+        If set (with `retrieve_all_resources=True`), the number of resources per page is adapted after each page
+        by the `AdaptivePager`, towards its target response time and page size, rather than fixed to `limit`.
+        The chosen limits are recorded in `pager.history`. Cannot be used along with `max_workers`,
+        or with multiple values for a tag (the sub-queries run concurrently).
+
     Returns
     -------
     List[Resource]
@@ -264,6 +320,287 @@ def query_orthanc(client: Orthanc,
     # In this function, client that return raw responses are not supported.
     client = util.ensure_non_raw_response(client)
 
+    if pager is not None and max_workers is not None:
+        raise ValueError('The "pager" and "max_workers" parameters cannot be used together.')
+
+    multiple_values_tags = [tag for tag, value in (query or {}).items() if isinstance(value, (list, tuple, set))]
+    if len(multiple_values_tags) > 0:
+        return _query_multiple_values(
+            client,
+            level,
+            query,
+            multiple_values_tags,
+            prefix_compression,
+            max_workers,
+            labels=labels,
+            labels_constraint=labels_constraint,
+            limit=limit,
+            since=since,
+            retrieve_all_resources=retrieve_all_resources,
+            lock_children=lock_children,
+            order_by=order_by,
+            response_content=response_content,
+            requested_tags=requested_tags,
+            pager=pager
+        )
+
+    if (order_by is not None or response_content is not None) and not get_capabilities(client).has_extended_find:
+        if order_by is not None:
+            raise errors.NotSupportedError(
+                'The "order_by" parameter requires a server that supports the extended /tools/find '
+                '(Orthanc >= 1.12.5 with a compatible database backend).'
+            )
+        response_content = None  # Falling back on the expanded resources
+
+    data = _make_find_data(
+        level, query, labels, labels_constraint, limit, since, order_by, response_content, requested_tags
+    )
+
+    if retrieve_all_resources and pager is not None:
+        results = pager.find_all(client, data)
+    elif retrieve_all_resources and max_workers is not None:
+        results = _find_all_in_parallel(client, data, max_workers)
+    elif retrieve_all_resources:
+        results = _find_all(client, data)
+    else:
+        results = client.post_tools_find(data)
+
+    expanded = response_content is None
+    resources = [_make_resource(level, i, client, lock_children, expanded) for i in results]
+
+    return resources
+
+
+def count_patients(client: Orthanc,
+                   query: Dict[str, str] = None,
+                   labels: Union[List[str], str] = None,
+                   labels_constraint: str = 'All') -> int:
+    """Count the patients in Orthanc that fit queries and labels (see `count_resources`)"""
+    return count_resources(client, 'Patient', query, labels, labels_constraint)
+
+
+def count_studies(client: Orthanc,
+                  query: Dict[str, str] = None,
+                  labels: Union[List[str], str] = None,
+                  labels_constraint: str = 'All') -> int:
+    """Count the studies in Orthanc that fit queries and labels (see `count_resources`)"""
+    return count_resources(client, 'Study', query, labels, labels_constraint)
+
+
+def count_series(client: Orthanc,
+                 query: Dict[str, str] = None,
+                 labels: Union[List[str], str] = None,
+                 labels_constraint: str = 'All') -> int:
+    """Count the series in Orthanc that fit queries and labels (see `count_resources`)"""
+    return count_resources(client, 'Series', query, labels, labels_constraint)
+
+
+def count_instances(client: Orthanc,
+                    query: Dict[str, str] = None,
+                    labels: Union[List[str], str] = None,
+                    labels_constraint: str = 'All') -> int:
+    """Count the instances in Orthanc that fit queries and labels (see `count_resources`)"""
+    return count_resources(client, 'Instance', query, labels, labels_constraint)
+
+
+def count_resources(client: Orthanc,
+                    level: str,
+                    query: Dict[str, str] = None,
+                    labels: Union[List[str], str] = None,
+                    labels_constraint: str = 'All') -> int:
+    """Count the resources in Orthanc that fit queries and labels, without retrieving them
+
+    With Orthanc >= 1.12.5, the resources are counted by the server with a single request
+    to /tools/count-resources. With older servers (or when the version cannot be queried),
+    the identifiers of the resources are paged with /tools/find (without expanding the resources)
+    and counted.
+
+    Parameters
+    ----------
+    client
+        Orthanc client.
+    level
+        Level of the query ['Patient', 'Study', 'Series', 'Instance'].
+    query
+        Dictionary that specifies the filters on the level related DICOM tags.
+    labels
+        List of strings specifying which labels to look for in the resources.
+    labels_constraint
+        Constraint on the labels, can be 'All', 'Any', or 'None'.
+
+    Returns
+    -------
+    int
+        Number of resources that fit the provided criteria.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    client = pyorthanc.Orthanc('http://localhost:8042', 'orthanc', 'orthanc')
+    nbr_of_ct_instances = pyorthanc.count_instances(client, query={'Modality': 'CT'})
+    ```
+    """
+    _validate_level(level)
+    _validate_labels_constraint(labels_constraint)
+
+    # In this function, client that return raw responses are not supported.
+    client = util.ensure_non_raw_response(client)
+
+    data = _make_find_data(level, query, labels, labels_constraint, DEFAULT_RESOURCES_LIMIT, 0)
+
+    # Paging the identifiers also works when the version cannot be queried (e.g. no access to /system)
+    if _is_version_at_least(client, COUNT_RESOURCES_VERSION):
+        return client.post_tools_count_resources(_make_count_data(data))['Count']
+
+    data['Expand'] = False  # Only the identifiers are returned
+    count = 0
+
+    while True:
+        identifiers = client.post_tools_find(data)
+        if len(identifiers) == 0:
+            return count
+
+        count += len(identifiers)
+        data['Since'] += data['Limit']
+
+
+def _query_multiple_values(client: Orthanc,
+                           level: str,
+                           query: Dict,
+                           tags: List[str],
+                           prefix_compression: bool,
+                           max_workers: Optional[int],
+                           **kwargs) -> List[Resource]:
+    """Split a query with multiple values for a tag into sub-queries, and merge their results"""
+    if len(tags) > 1:
+        raise ValueError(f'Only one tag of the query can have multiple values, got {tags}.')
+
+    # Each sub-query is paged on its own, a window of the merged results cannot be queried
+    if kwargs['since'] != 0 or kwargs['order_by'] is not None or not kwargs['retrieve_all_resources']:
+        raise ValueError(
+            'The "since", "order_by" and "retrieve_all_resources=False" parameters cannot be used '
+            'along with multiple values for a tag.'
+        )
+
+    if kwargs['pager'] is not None:
+        raise ValueError('The "pager" parameter cannot be used along with multiple values for a tag.')
+
+    tag = tags[0]
+    values = list(dict.fromkeys(query[tag]))  # Without duplicates, in the provided order
+
+    # Case-folded, like Orthanc compares the values of the exact sub-queries (e.g. 'ct' matches 'CT')
+    folded_values = {v.casefold() for v in values}
+
+    # The results can be filtered on the exact values only if the tag is returned with the resources
+    prefix_compression = prefix_compression and tag in MAIN_DICOM_TAGS[level] and kwargs['response_content'] is None
+    sub_queries = [
+        ({**query, tag: value}, is_compressed)
+        for value, is_compressed in _split_multiple_values(values, prefix_compression)
+    ]
+
+    def run_sub_query(sub_query: Tuple[Dict, bool]) -> List[Resource]:
+        resources = query_orthanc(client, level, sub_query[0], **kwargs)
+        if sub_query[1]:
+            resources = [r for r in resources if r.main_dicom_tags.get(tag, '').casefold() in folded_values]
+
+        return resources
+
+    max_workers = MULTIPLE_VALUES_MAX_WORKERS if max_workers is None else max_workers
+    if max_workers < 1:
+        raise ValueError(f'max_workers must be at least 1, got {max_workers}.')
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        resources = {}
+        for sub_query_resources in executor.map(run_sub_query, sub_queries):
+            for resource in sub_query_resources:
+                resources.setdefault(resource.id_, resource)  # Deduplicated on the Orthanc identifier
+
+    return list(resources.values())
+
+
+def _split_multiple_values(values: List[str], prefix_compression: bool) -> List[Tuple[str, bool]]:
+    """Make the values of the sub-queries, with whether they are compressed (i.e. match more than the values)"""
+    def has_wildcard(value: str) -> bool:
+        return any(character in value for character in '*?\\')
+
+    wildcard_values = [v for v in values if has_wildcard(v)]  # Queried one by one
+    exact_values = [v for v in values if not has_wildcard(v)]
+    compressed_values = []
+
+    if prefix_compression:
+        values_by_prefix = defaultdict(list)
+        for value in exact_values:
+            if len(value) > PREFIX_COMPRESSION_WILDCARDS:
+                values_by_prefix[value[:-PREFIX_COMPRESSION_WILDCARDS]].append(value)
+
+        for prefix, prefix_values in values_by_prefix.items():
+            if len(prefix_values) >= PREFIX_COMPRESSION_MIN_VALUES:
+                compressed_values.append(prefix + '?' * PREFIX_COMPRESSION_WILDCARDS)
+
+        compressed_prefixes = {v[:-PREFIX_COMPRESSION_WILDCARDS] for v in compressed_values}
+        exact_values = [v for v in exact_values if v[:-PREFIX_COMPRESSION_WILDCARDS] not in compressed_prefixes]
+
+    chunks = [
+        '\\'.join(exact_values[i:i + MULTIPLE_VALUES_CHUNK_SIZE])
+        for i in range(0, len(exact_values), MULTIPLE_VALUES_CHUNK_SIZE)
+    ]
+
+    return [(v, False) for v in chunks + wildcard_values] + [(v, True) for v in compressed_values]
+
+
+def _find_all(client: Orthanc, data: Dict) -> List[Dict]:
+    """Fetch the pages of a /tools/find query one after another, until an empty page"""
+    results = []
+    while True:
+        result_for_interval = client.post_tools_find(data)
+        if len(result_for_interval) == 0:
+            break
+
+        results += result_for_interval
+        data['Since'] += data['Limit']  # Updating the lookup window
+
+    return results
+
+
+def _find_all_in_parallel(client: Orthanc, data: Dict, max_workers: int) -> List[Dict]:
+    """Fetch the pages of a /tools/find query with concurrent requests
+
+    The scan is sized with /tools/count-resources, then the pages are fetched concurrently
+    and reassembled in order. The remaining pages (e.g. resources added after the count,
+    or servers without /tools/count-resources) are then fetched sequentially.
+    """
+    if max_workers < 1:
+        raise ValueError(f'max_workers must be at least 1, got {max_workers}.')
+
+    # Paging the identifiers also works when the version cannot be queried (e.g. no access to /system)
+    if _is_version_at_least(client, COUNT_RESOURCES_VERSION):
+        count = client.post_tools_count_resources(_make_count_data(data))['Count']
+    else:
+        count = 0  # All pages are fetched sequentially
+
+    sinces = list(range(data['Since'], count, data['Limit']))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pages = executor.map(lambda since: client.post_tools_find({**data, 'Since': since}), sinces)
+        results = [information for page in pages for information in page]
+
+    data['Since'] += len(sinces) * data['Limit']
+
+    return results + _find_all(client, data)
+
+
+def _make_find_data(level: str,
+                    query: Optional[Dict[str, str]],
+                    labels: Union[List[str], str, None],
+                    labels_constraint: str,
+                    limit: int,
+                    since: int,
+                    order_by: Optional[List[Dict[str, str]]] = None,
+                    response_content: Optional[List[str]] = None,
+                    requested_tags: Optional[List[str]] = None) -> Dict:
+    """Make the body of a /tools/find request"""
     data = {
         'Expand': True,
         'Level': level,
@@ -275,34 +612,79 @@ def query_orthanc(client: Orthanc,
     if query is not None:
         data['Query'] = query
 
+    if order_by is not None:
+        data['OrderBy'] = order_by
+
+    if response_content is not None:
+        del data['Expand']
+        data['ResponseContent'] = response_content
+
+    if requested_tags is not None:
+        data['RequestedTags'] = requested_tags
+
     if labels is not None:
         data['Labels'] = [labels] if isinstance(labels, str) else labels
         data['LabelsConstraint'] = labels_constraint
 
-    if retrieve_all_resources:
-        results = []
-        while True:
-            result_for_interval = client.post_tools_find(data)
-            if len(result_for_interval) == 0:
-                break
+    return data
+
+
+def _make_count_data(find_data: Dict) -> Dict:
+    """Make the body of a /tools/count-resources request from the body of a /tools/find request"""
+    return {key: find_data[key] for key in ['Level', 'Query', 'Labels', 'LabelsConstraint'] if key in find_data}
 
-            results += result_for_interval
-            data['Since'] += limit  # Updating the lookup window
+
+def _make_resource(level: str,
+                   information: Dict,
+                   client: Orthanc,
+                   lock_children: bool = False,
+                   expanded: bool = True) -> Resource:
+    """Make a resource from a /tools/find result
+
+    The resource main information is seeded with the expanded result, so reading
+    a main DICOM tag (e.g. `series.modality`) does not need another request.
+    When the result is not expanded (i.e. "ResponseContent" was requested), only
+    the main DICOM tags are seeded.
+    """
+    if level == 'Patient':
+        resource = Patient(information['ID'], client, _lock_children=lock_children)
+    elif level == 'Study':
+        resource = Study(information['ID'], client, _lock_children=lock_children)
+    elif level == 'Series':
+        resource = Series(information['ID'], client, _lock_children=lock_children)
+    elif level == 'Instance':
+        resource = Instance(information['ID'], client, _lock_children=lock_children)
     else:
-        results = client.post_tools_find(data)
+        raise ValueError(f"Unknown level ['Patient', 'Study', 'Series', 'Instance'], got {level}")
+
+    if expanded:
+        resource._set_information(information)
+    else:
+        resource._main_dicom_tags = information.get('MainDicomTags')
+        resource._requested_tags = information.get('RequestedTags')
+
+    return resource
 
+
+def _make_async_resource(level: str,
+                         information: Dict,
+                         async_client: AsyncOrthanc,
+                         lock_children: bool = False) -> AsyncResource:
+    """Make an asynchronous resource from an expanded /tools/find result"""
     if level == 'Patient':
-        resources = [Patient(i['ID'], client, _lock_children=lock_children) for i in results]
+        resource = AsyncPatient(information['ID'], async_client, _lock_children=lock_children)
     elif level == 'Study':
-        resources = [Study(i['ID'], client, _lock_children=lock_children) for i in results]
+        resource = AsyncStudy(information['ID'], async_client, _lock_children=lock_children)
     elif level == 'Series':
-        resources = [Series(i['ID'], client, _lock_children=lock_children) for i in results]
+        resource = AsyncSeries(information['ID'], async_client, _lock_children=lock_children)
     elif level == 'Instance':
-        resources = [Instance(i['ID'], client, _lock_children=lock_children) for i in results]
+        resource = AsyncInstance(information['ID'], async_client, _lock_children=lock_children)
     else:
         raise ValueError(f"Unknown level ['Patient', 'Study', 'Series', 'Instance'], got {level}")
 
-    return resources
+    resource._set_information(information)
+
+    return resource
 
 
 def _validate_labels_constraint(labels_constraint: str) -> None:
@@ -0,0 +1,411 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Union
+
+from . import util
+from ._find import DEFAULT_RESOURCES_LIMIT, _make_async_resource, _make_find_data, _make_resource, \
+    _split_multiple_values, _validate_labels_constraint, _validate_level
+from ._resources import AsyncInstance, AsyncPatient, AsyncResource, AsyncSeries, AsyncStudy
+from ._resources.instance import Instance
+from ._resources.patient import Patient
+from ._resources.resource import Resource
+from ._resources.series import Series
+from ._resources.study import Study
+from .async_client import AsyncOrthanc
+from .client import Orthanc
+
+
+def iter_patients(client: Orthanc,
+                  query: Dict[str, str] = None,
+                  labels: Union[List[str], str] = None,
+                  labels_constraint: str = 'All',
+                  **kwargs) -> Iterator[Patient]:
+    """Iterate over the patients in Orthanc that fit the queries and labels
+
+    Same as `find_patients`, but the patients are yielded page by page.
+    See `iter_query_orthanc` for the details.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    client = pyorthanc.Orthanc('http://localhost:8042', 'orthanc', 'orthanc')
+    for patient in pyorthanc.iter_patients(client, query={'PatientID': 'Something*'}):
+        print(patient.name)
+    ```
+    """
+    return iter_query_orthanc(
+        client=client,
+        level='Patient',
+        query=query,
+        labels=labels,
+        labels_constraint=labels_constraint,
+        **kwargs
+    )
+
+
+def iter_studies(client: Orthanc,
+                 query: Dict[str, str] = None,
+                 labels: Union[List[str], str] = None,
+                 labels_constraint: str = 'All',
+                 **kwargs) -> Iterator[Study]:
+    """Iterate over the studies in Orthanc that fit the queries and labels
+
+    Same as `find_studies`, but the studies are yielded page by page.
+    See `iter_query_orthanc` for the details.
+    """
+    return iter_query_orthanc(
+        client=client,
+        level='Study',
+        query=query,
+        labels=labels,
+        labels_constraint=labels_constraint,
+        **kwargs
+    )
+
+
+def iter_series(client: Orthanc,
+                query: Dict[str, str] = None,
+                labels: Union[List[str], str] = None,
+                labels_constraint: str = 'All',
+                **kwargs) -> Iterator[Series]:
+    """Iterate over the series in Orthanc that fit the queries and labels
+
+    Same as `find_series`, but the series are yielded page by page.
+    See `iter_query_orthanc` for the details.
+    """
+    return iter_query_orthanc(
+        client=client,
+        level='Series',
+        query=query,
+        labels=labels,
+        labels_constraint=labels_constraint,
+        **kwargs
+    )
+
+
+def iter_instances(client: Orthanc,
+                   query: Dict[str, str] = None,
+                   labels: Union[List[str], str] = None,
+                   labels_constraint: str = 'All',
+                   **kwargs) -> Iterator[Instance]:
+    """Iterate over the instances in Orthanc that fit the queries and labels
+
+    Same as `find_instances`, but the instances are yielded page by page.
+    See `iter_query_orthanc` for the details.
+    """
+    return iter_query_orthanc(
+        client=client,
+        level='Instance',
+        query=query,
+        labels=labels,
+        labels_constraint=labels_constraint,
+        **kwargs
+    )
+
+
+def iter_query_orthanc(client: Orthanc,
+                       level: str,
+                       query: Dict[str, str] = None,
+                       labels: Union[List[str], str] = None,
+                       labels_constraint: str = 'All',
+                       limit: int = DEFAULT_RESOURCES_LIMIT,
+                       since: int = 0,
+                       lock_children: bool = False,
+                       requested_tags: List[str] = None) -> Iterator[Resource]:
+    """Iterate over the resources of the Orthanc server that fit the query
+
+    Unlike `query_orthanc`, the results are not accumulated in memory: resources are
+    yielded page by page (of `limit` resources). The next page is fetched in a background
+    thread while the current one is processed, so only two pages are held in memory at once.
+
+    Parameters
+    ----------
+    client
+        Orthanc client.
+    level
+        Level of the query ['Patient', 'Study', 'Series', 'Instance'].
+    query
+        Dictionary that specifies the filters on the level related DICOM tags.
+        One of the tags can have a list of values (e.g. `{'PatientID': ['ID1', 'ID2', ...]}`), as with
+        `query_orthanc` (without the prefix compression). The sub-queries are then iterated one after
+        another, and the resources are yielded without duplicates. `since` is not supported in this case.
+    labels
+        List of strings specifying which labels to look for in the resources.
+    labels_constraint
+        Constraint on the labels, can be 'All', 'Any', or 'None'.
+    limit
+        Number of resources per page.
+    since
+        Index of the first resource.
+    lock_children
+        If `lock_children` is True, the resource children (ex. instances of a series via `Series.instances`)
+        will be cached at the first query rather than queried every time.
+    requested_tags
+        DICOM tags to retrieve along with the resources, available through `resource.requested_tags`.
+
+    Returns
+    -------
+    Iterator[Resource]
+        Iterator over the resources that fit the provided criteria.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    client = pyorthanc.Orthanc('http://localhost:8042', 'orthanc', 'orthanc')
+    for instance in pyorthanc.iter_query_orthanc(client, level='Instance', limit=500):
+        ...
+    ```
+    """
+    _validate_level(level)
+    _validate_labels_constraint(labels_constraint)
+
+    # In this function, client that return raw responses are not supported.
+    client = util.ensure_non_raw_response(client)
+
+    sub_queries = [
+        _make_find_data(level, q, labels, labels_constraint, limit, since, requested_tags=requested_tags)
+        for q in _make_sub_queries(query, since)
+    ]
+    if len(sub_queries) == 1:
+        return _iter_pages(client, level, sub_queries[0], lock_children)
+
+    return _iter_sub_queries(client, level, sub_queries, lock_children)
+
+
+def _make_sub_queries(query: Optional[Dict], since: int) -> List[Optional[Dict]]:
+    """Split a query with multiple values for a tag into sub-queries (see `query_orthanc`)"""
+    tags = [tag for tag, value in (query or {}).items() if isinstance(value, (list, tuple, set))]
+    if len(tags) == 0:
+        return [query]
+
+    if len(tags) > 1:
+        raise ValueError(f'Only one tag of the query can have multiple values, got {tags}.')
+
+    # Each sub-query is paged on its own, a window of the merged results cannot be queried
+    if since != 0:
+        raise ValueError('The "since" parameter cannot be used along with multiple values for a tag.')
+
+    tag = tags[0]
+    values = list(dict.fromkeys(query[tag]))  # Without duplicates, in the provided order
+
+    return [{**query, tag: value} for value, _ in _split_multiple_values(values, prefix_compression=False)]
+
+
+def _iter_sub_queries(client: Orthanc, level: str, sub_queries: List[Dict], lock_children: bool) -> Iterator[Resource]:
+    identifiers = set()  # A resource can match several sub-queries (e.g. 'CT' and 'C*')
+
+    for data in sub_queries:
+        for resource in _iter_pages(client, level, data, lock_children):
+            if resource.id_ not in identifiers:
+                identifiers.add(resource.id_)
+                yield resource
+
+
+def _iter_pages(client: Orthanc, level: str, data: Dict, lock_children: bool) -> Iterator[Resource]:
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    try:
+        next_page = executor.submit(client.post_tools_find, dict(data))
+        while True:
+            page = next_page.result()
+            if len(page) == 0:
+                return
+
+            # Prefetching the next page while the caller processes this one
+            data['Since'] += data['Limit']
+            next_page = executor.submit(client.post_tools_find, dict(data))
+
+            for information in page:
+                yield _make_resource(level, information, client, lock_children)
+    finally:
+        # Do not wait for a prefetched page that will not be used (e.g. when the caller breaks)
+        executor.shutdown(wait=False)
+
+
+def async_iter_patients(async_client: AsyncOrthanc,
+                        query: Dict[str, str] = None,
+                        labels: Union[List[str], str] = None,
+                        labels_constraint: str = 'All',
+                        **kwargs) -> AsyncIterator[AsyncPatient]:
+    """Asynchronously iterate over the patients in Orthanc that fit the queries and labels
+
+    See `async_iter_query_orthanc` for the details.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    async_client = pyorthanc.AsyncOrthanc('http://localhost:8042', 'orthanc', 'orthanc')
+    async for patient in pyorthanc.async_iter_patients(async_client, query={'PatientID': 'Something*'}):
+        print(await patient.name)
+    ```
+    """
+    return async_iter_query_orthanc(
+        async_client=async_client,
+        level='Patient',
+        query=query,
+        labels=labels,
+        labels_constraint=labels_constraint,
+        **kwargs
+    )
+
+
+def async_iter_studies(async_client: AsyncOrthanc,
+                       query: Dict[str, str] = None,
+                       labels: Union[List[str], str] = None,
+                       labels_constraint: str = 'All',
+                       **kwargs) -> AsyncIterator[AsyncStudy]:
+    """Asynchronously iterate over the studies in Orthanc that fit the queries and labels
+
+    See `async_iter_query_orthanc` for the details.
+    """
+    return async_iter_query_orthanc(
+        async_client=async_client,
+        level='Study',
+        query=query,
+        labels=labels,
+        labels_constraint=labels_constraint,
+        **kwargs
+    )
+
+
+def async_iter_series(async_client: AsyncOrthanc,
+                      query: Dict[str, str] = None,
+                      labels: Union[List[str], str] = None,
+                      labels_constraint: str = 'All',
+                      **kwargs) -> AsyncIterator[AsyncSeries]:
+    """Asynchronously iterate over the series in Orthanc that fit the queries and labels
+
+    See `async_iter_query_orthanc` for the details.
+    """
+    return async_iter_query_orthanc(
+        async_client=async_client,
+        level='Series',
+        query=query,
+        labels=labels,
+        labels_constraint=labels_constraint,
+        **kwargs
+    )
+
+
+def async_iter_instances(async_client: AsyncOrthanc,
+                         query: Dict[str, str] = None,
+                         labels: Union[List[str], str] = None,
+                         labels_constraint: str = 'All',
+                         **kwargs) -> AsyncIterator[AsyncInstance]:
+    """Asynchronously iterate over the instances in Orthanc that fit the queries and labels
+
+    See `async_iter_query_orthanc` for the details.
+    """
+    return async_iter_query_orthanc(
+        async_client=async_client,
+        level='Instance',
+        query=query,
+        labels=labels,
+        labels_constraint=labels_constraint,
+        **kwargs
+    )
+
+
+def async_iter_query_orthanc(async_client: AsyncOrthanc,
+                             level: str,
+                             query: Dict[str, str] = None,
+                             labels: Union[List[str], str] = None,
+                             labels_constraint: str = 'All',
+                             limit: int = DEFAULT_RESOURCES_LIMIT,
+                             since: int = 0,
+                             lock_children: bool = False,
+                             requested_tags: List[str] = None) -> AsyncIterator[AsyncResource]:
+    """Asynchronously iterate over the resources of the Orthanc server that fit the query
+
+    Same as `iter_query_orthanc`, but with an `AsyncOrthanc` client. The next page
+    is fetched in a task while the current one is processed.
+
+    Parameters
+    ----------
+    async_client
+        Asynchronous Orthanc client.
+    level
+        Level of the query ['Patient', 'Study', 'Series', 'Instance'].
+    query
+        Dictionary that specifies the filters on the level related DICOM tags.
+        One of the tags can have a list of values (see `iter_query_orthanc`).
+    labels
+        List of strings specifying which labels to look for in the resources.
+    labels_constraint
+        Constraint on the labels, can be 'All', 'Any', or 'None'.
+    limit
+        Number of resources per page.
+    since
+        Index of the first resource.
+    lock_children
+        If `lock_children` is True, the resource children will be cached at the first query
+        rather than queried every time.
+    requested_tags
+        DICOM tags to retrieve along with the resources, available through `resource.requested_tags`.
+
+    Returns
+    -------
+    AsyncIterator[AsyncResource]
+        Asynchronous iterator over the resources that fit the provided criteria.
+    """
+    _validate_level(level)
+    _validate_labels_constraint(labels_constraint)
+
+    # In this function, client that return raw responses are not supported.
+    async_client = util.ensure_non_raw_response(async_client)
+
+    sub_queries = [
+        _make_find_data(level, q, labels, labels_constraint, limit, since, requested_tags=requested_tags)
+        for q in _make_sub_queries(query, since)
+    ]
+    if len(sub_queries) == 1:
+        return _async_iter_pages(async_client, level, sub_queries[0], lock_children)
+
+    return _async_iter_sub_queries(async_client, level, sub_queries, lock_children)
+
+
+async def _async_iter_sub_queries(async_client: AsyncOrthanc,
+                                  level: str,
+                                  sub_queries: List[Dict],
+                                  lock_children: bool) -> AsyncIterator[AsyncResource]:
+    identifiers = set()  # A resource can match several sub-queries (e.g. 'CT' and 'C*')
+
+    for data in sub_queries:
+        pages = _async_iter_pages(async_client, level, data, lock_children)
+
+        async with aclosing(pages):  # The prefetched page is cancelled when the caller stops early
+            async for resource in pages:
+                if resource.id_ not in identifiers:
+                    identifiers.add(resource.id_)
+                    yield resource
+
+
+async def _async_iter_pages(async_client: AsyncOrthanc,
+                            level: str,
+                            data: Dict,
+                            lock_children: bool) -> AsyncIterator[AsyncResource]:
+    next_page = asyncio.ensure_future(async_client.post_tools_find(dict(data)))
+
+    try:
+        while True:
+            page = await next_page
+            if len(page) == 0:
+                return
+
+            # Prefetching the next page while the caller processes this one
+            data['Since'] += data['Limit']
+            next_page = asyncio.ensure_future(async_client.post_tools_find(dict(data)))
+
+            for information in page:
+                yield _make_async_resource(level, information, async_client, lock_children)
+    finally:
+        # Do not leave the prefetched page pending (e.g. when the caller breaks and closes the iterator)
+        next_page.cancel()
+        await asyncio.gather(next_page, return_exceptions=True)
@@ -0,0 +1,205 @@
+import json
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Union
+
+from . import util
+from ._find import DEFAULT_RESOURCES_LIMIT, _validate_level
+from .async_client import AsyncOrthanc
+from .capabilities import _check_response
+from .client import Orthanc
+
+ROUTES = {'Patient': 'patients', 'Study': 'studies', 'Series': 'series', 'Instance': 'instances'}
+
+
+def iter_listing(client: Orthanc,
+                 level: str,
+                 expand: bool = False,
+                 page_size: Optional[int] = DEFAULT_RESOURCES_LIMIT) -> Iterator[Union[str, Dict]]:
+    """Iterate over all the resources of a level (e.g. `/instances`), page by page
+
+    Unlike `client.get_instances()` (and the other listings), which return the whole
+    list in a single response body, the listing is fetched in pages of `page_size` resources
+    (with the `since` and `limit` parameters). The response bodies are also decoded
+    incrementally, so the memory usage does not depend on the number of resources.
+
+    Parameters
+    ----------
+    client
+        Orthanc client.
+    level
+        Level of the listing ['Patient', 'Study', 'Series', 'Instance'].
+    expand
+        If True, the main information of the resources is yielded rather than their identifiers.
+    page_size
+        Number of resources per request. If None, the whole listing is fetched with a single request
+        (still decoded incrementally).
+
+    Yields
+    ------
+    Union[str, Dict]
+        Identifier (or main information if `expand=True`) of each resource.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    client = pyorthanc.Orthanc('http://localhost:8042', 'orthanc', 'orthanc')
+    for instance_id in pyorthanc.iter_listing(client, 'Instance'):
+        ...
+    ```
+    """
+    _validate_level(level)
+    _validate_page_size(page_size)
+
+    # In this function, client that return raw responses are not supported.
+    client = util.ensure_non_raw_response(client)
+    since = 0
+
+    while True:
+        params = _make_params(expand, since, page_size)
+        nbr_of_resources = 0
+
+        with client.stream('GET', f'{client.url}/{ROUTES[level]}', params=params) as response:
+            if not 200 <= response.status_code < 300:
+                response.read()
+                _check_response(response)
+
+            parser = _JsonArrayParser()
+            for text in response.iter_text():
+                for item in parser.feed(text):
+                    nbr_of_resources += 1
+                    yield item
+            parser.close()
+
+        if page_size is None or nbr_of_resources < page_size:
+            return
+
+        since += page_size
+
+
+async def async_iter_listing(async_client: AsyncOrthanc,
+                             level: str,
+                             expand: bool = False,
+                             page_size: Optional[int] = DEFAULT_RESOURCES_LIMIT) -> AsyncIterator[Union[str, Dict]]:
+    """Iterate over all the resources of a level (e.g. `/instances`), page by page, with an asynchronous client
+
+    See `iter_listing()`.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    async_client = pyorthanc.AsyncOrthanc('http://localhost:8042', 'orthanc', 'orthanc')
+    async for instance_id in pyorthanc.async_iter_listing(async_client, 'Instance'):
+        ...
+    ```
+    """
+    _validate_level(level)
+    _validate_page_size(page_size)
+
+    # In this function, client that return raw responses are not supported.
+    async_client = util.ensure_non_raw_response(async_client)
+    since = 0
+
+    while True:
+        params = _make_params(expand, since, page_size)
+        nbr_of_resources = 0
+
+        async with async_client.stream('GET', f'{async_client.url}/{ROUTES[level]}', params=params) as response:
+            if not 200 <= response.status_code < 300:
+                await response.aread()
+                _check_response(response)
+
+            parser = _JsonArrayParser()
+            async for text in response.aiter_text():
+                for item in parser.feed(text):
+                    nbr_of_resources += 1
+                    yield item
+            parser.close()
+
+        if page_size is None or nbr_of_resources < page_size:
+            return
+
+        since += page_size
+
+
+def _validate_page_size(page_size: Optional[int]) -> None:
+    if page_size is not None and page_size < 1:
+        raise ValueError(f'page_size must be at least 1 or None, got {page_size}.')
+
+
+def _make_params(expand: bool, since: int, page_size: Optional[int]) -> Dict:
+    params = {}
+
+    if expand:
+        params['expand'] = True
+
+    if page_size is not None:
+        params['since'] = since
+        params['limit'] = page_size
+
+    return params
+
+
+class _JsonArrayParser:
+    """Decode the items of a JSON array as its text comes, chunk by chunk"""
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._is_started = False
+        self._is_ended = False
+
+    def feed(self, text: str) -> List[Any]:
+        """Add text to the buffer, and return the items that are now complete"""
+        self._buffer += text
+        items = []
+        position = 0
+
+        while True:
+            position = self._skip_separators(position)
+            if position >= len(self._buffer):
+                break
+
+            if self._buffer[position] == ']':
+                self._is_ended = True
+                break
+
+            try:
+                item, end = self._decoder.raw_decode(self._buffer, position)
+            except json.JSONDecodeError:
+                break  # The item is not complete yet
+
+            # An item that ends the buffer (e.g. a number) may continue in the next chunk
+            if end == len(self._buffer):
+                break
+
+            items.append(item)
+            position = end
+
+        self._buffer = self._buffer[position:]
+
+        return items
+
+    def close(self) -> None:
+        """Check that the whole array has been fed (e.g. the body has not been truncated)"""
+        if not self._is_ended:
+            raise ValueError(f'The listing is not a complete JSON array, it ends with {self._buffer[-20:]!r}.')
+
+    def _skip_separators(self, position: int) -> int:
+        while position < len(self._buffer):
+            character = self._buffer[position]
+
+            if not self._is_started and not character.isspace():
+                if character != '[':
+                    raise ValueError(
+                        f'The listing is not a JSON array, it starts with {self._buffer[position:position + 20]!r}.'
+                    )
+                self._is_started = True
+            elif self._is_started and not (character.isspace() or character == ','):
+                break
+
+            position += 1
+
+        return position
@@ -0,0 +1,118 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List
+
+from .capabilities import _check_response
+from .client import Orthanc
+
+DEFAULT_TARGET_DURATION = 1.  # Seconds
+DEFAULT_MAX_PAGE_BYTES = 8 * 1024 * 1024
+MIN_LIMIT = 50
+MAX_LIMIT = 50_000
+MAX_GROWTH_FACTOR = 2.
+
+
+@dataclass
+class PageRecord:
+    """Page fetched by an `AdaptivePager`"""
+    limit: int
+    nbr_of_resources: int
+    duration: float  # Seconds
+    nbr_of_bytes: int
+
+
+class AdaptivePager:
+    """Page size (the "Limit" of /tools/find) that adapts to the observed response time and size
+
+    After each page, the limit is scaled towards the target duration and the maximum page size:
+    it grows (at most doubled) when the pages are fast and small, and shrinks when
+    they are slow or large (e.g. expanded instances). A pager can be reused for several scans,
+    so that the following scans start with the settled limit. The records are thread-safe.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    client = pyorthanc.Orthanc('http://localhost:8042', 'orthanc', 'orthanc')
+    pager = pyorthanc.AdaptivePager(target_duration=0.5)
+
+    instances = pyorthanc.find_instances(client, query={'Modality': 'CT'}, pager=pager)
+    print([page.limit for page in pager.history])
+    ```
+    """
+
+    def __init__(self,
+                 initial_limit: int = 1_000,
+                 min_limit: int = MIN_LIMIT,
+                 max_limit: int = MAX_LIMIT,
+                 target_duration: float = DEFAULT_TARGET_DURATION,
+                 max_page_bytes: int = DEFAULT_MAX_PAGE_BYTES) -> None:
+        """Constructor
+
+        Parameters
+        ----------
+        initial_limit
+            Limit of the first page.
+        min_limit
+            Minimum limit.
+        max_limit
+            Maximum limit.
+        target_duration
+            Target response time of a page (in seconds).
+        max_page_bytes
+            Maximum size of the response body of a page (in bytes).
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                f'The limits must satisfy 1 <= min_limit <= initial_limit <= max_limit, '
+                f'got {min_limit}, {initial_limit} and {max_limit}.'
+            )
+
+        self.limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_duration = target_duration
+        self.max_page_bytes = max_page_bytes
+
+        self.history: List[PageRecord] = []
+
+        self._lock = threading.Lock()
+
+    def record(self, limit: int, nbr_of_resources: int, duration: float, nbr_of_bytes: int) -> None:
+        """Record a fetched page and adapt the limit of the next one"""
+        with self._lock:
+            self.history.append(PageRecord(limit, nbr_of_resources, duration, nbr_of_bytes))
+
+            if nbr_of_resources == 0:
+                return  # Nothing was measured
+
+            factor = min(
+                self.target_duration / max(duration, 1e-3),
+                self.max_page_bytes / max(nbr_of_bytes, 1),
+                MAX_GROWTH_FACTOR
+            )
+            if factor > 1 and nbr_of_resources < limit:
+                return  # A partial page (e.g. the last one) says nothing about larger pages
+
+            # The factor is applied to the number of returned resources, which may be lower than the limit
+            self.limit = max(self.min_limit, min(self.max_limit, int(nbr_of_resources * factor)))
+
+    def find_all(self, client: Orthanc, data: Dict) -> List[Dict]:
+        """Fetch all the pages of a /tools/find query, adapting the limit after each page"""
+        results = []
+
+        while True:
+            data['Limit'] = self.limit
+
+            start = time.perf_counter()
+            response = _check_response(client.post(f'{client.url}/tools/find', json=data))
+            page = response.json()
+            self.record(data['Limit'], len(page), time.perf_counter() - start, len(response.content))
+
+            if len(page) == 0:
+                return results
+
+            results += page
+            data['Since'] += len(page)
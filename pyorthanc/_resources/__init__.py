@@ -1,3 +1,8 @@
+from .async_instance import AsyncInstance
+from .async_patient import AsyncPatient
+from .async_resource import AsyncResource
+from .async_series import AsyncSeries
+from .async_study import AsyncStudy
 from .instance import Instance
 from .patient import Patient
 from .resource import Resource
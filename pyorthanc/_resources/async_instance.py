@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+from io import BytesIO
+from typing import Any, BinaryIO, Dict, List, TYPE_CHECKING, Union
+
+import pydicom
+
+from .async_resource import AsyncResource
+from .. import errors
+
+if TYPE_CHECKING:
+    from . import AsyncPatient, AsyncSeries, AsyncStudy
+
+
+class AsyncInstance(AsyncResource):
+    """Represent an instance that is in an Orthanc server, with an asynchronous client
+
+    This object mirrors `Instance`, but getters that need to query
+    Orthanc are awaitable (e.g. `await instance.uid`).
+    """
+
+    async def get_dicom_file_content(self) -> bytes:
+        """Retrieves DICOM file
+
+        Returns
+        -------
+        bytes
+            Bytes corresponding to DICOM file
+
+        Examples
+        --------
+        ```python
+        from pyorthanc import AsyncOrthanc, AsyncInstance
+        instance = AsyncInstance('instance_identifier', AsyncOrthanc('http://localhost:8042'))
+
+        dicom_file_bytes = await instance.get_dicom_file_content()
+        ```
+        """
+        return await self.client.get_instances_id_file(self.id_)
+
+    async def download(self, filepath: Union[str, BinaryIO], with_progres: bool = False) -> None:
+        """Download the DICOM file to a target path or buffer
+
+        Examples
+        --------
+        ```python
+        from pyorthanc import AsyncOrthanc, AsyncInstance
+        instance = AsyncInstance('instance_identifier', AsyncOrthanc('http://localhost:8042'))
+
+        await instance.download('instance.dcm')
+        ```
+        """
+        await self._download_file(f'{self.client.url}/instances/{self.id_}/file', filepath, with_progres)
+
+    @property
+    def uid(self):
+        """Get SOPInstanceUID (awaitable)"""
+        return self._get_main_dicom_tag_value('SOPInstanceUID')
+
+    async def get_main_information(self) -> Dict:
+        """Get instance information
+
+        Returns
+        -------
+        Dict
+            Dictionary with tags as key and information as value
+        """
+        return await self.client.get_instances_id(self.id_)
+
+    @property
+    def legacy_viewer_url(self) -> str:
+        """Get Instance (legacy viewer) URL
+
+        Returns
+        -------
+        str
+            URL of instance (legacy viewer)
+        """
+        return f'{self.client.url}/app/explorer.html#instance?uuid={self.id_}'
+
+    @property
+    def file_size(self):
+        """Get the file size in bytes (awaitable)"""
+        return self._get_information_field('FileSize')
+
+    @property
+    def creation_date(self):
+        """Get creation date (awaitable)"""
+        return self._get_date('InstanceCreationDate', 'InstanceCreationTime')
+
+    @property
+    def series_identifier(self):
+        """Get the parent series identifier (awaitable)"""
+        return self._get_information_field('ParentSeries')
+
+    @property
+    def parent_series(self):
+        return self._get_parent_series()
+
+    async def _get_parent_series(self) -> AsyncSeries:
+        from . import AsyncSeries
+        return AsyncSeries(await self.series_identifier, self.client, information_ttl=self.information_ttl)
+
+    @property
+    def parent_study(self):
+        return self._get_parent_study()
+
+    async def _get_parent_study(self) -> AsyncStudy:
+        return await (await self.parent_series).parent_study
+
+    @property
+    def parent_patient(self):
+        return self._get_parent_patient()
+
+    async def _get_parent_patient(self) -> AsyncPatient:
+        return await (await self.parent_study).parent_patient
+
+    @property
+    def acquisition_number(self):
+        return self._get_main_dicom_tag_value('AcquisitionNumber', int)
+
+    @property
+    def image_index(self):
+        return self._get_main_dicom_tag_value('ImageIndex', int)
+
+    @property
+    def image_orientation_patient(self):
+        return self._get_main_dicom_tag_value('ImageOrientationPatient', _to_float_list)
+
+    @property
+    def image_position_patient(self):
+        return self._get_main_dicom_tag_value('ImagePositionPatient', _to_float_list)
+
+    @property
+    def image_comments(self):
+        return self._get_main_dicom_tag_value('ImageComments')
+
+    @property
+    def instance_number(self):
+        return self._get_main_dicom_tag_value('InstanceNumber', int)
+
+    @property
+    def number_of_frames(self):
+        return self._get_main_dicom_tag_value('NumberOfFrames', int)
+
+    @property
+    def temporal_position_identifier(self):
+        return self._get_main_dicom_tag_value('TemporalPositionIdentifier')
+
+    @property
+    def tags(self):
+        """Get tags (awaitable)"""
+        return self._get_tags()
+
+    @property
+    def simplified_tags(self):
+        """Get simplified tags (awaitable)"""
+        return self._get_tags(params={'simplify': True})
+
+    async def _get_tags(self, params: Dict = None) -> Dict:
+        return dict(await self.client.get_instances_id_tags(self.id_, params=params))
+
+    @property
+    def labels(self):
+        """Get instance labels (awaitable)"""
+        return self._get_information_field('Labels')
+
+    async def add_label(self, label: str) -> None:
+        """Add label to resource"""
+        await self.client.put_instances_id_labels_label(self.id_, label)
+        self._after_label_change()
+
+    async def remove_label(self, label):
+        """Remove label from resource"""
+        await self.client.delete_instances_id_labels_label(self.id_, label)
+        self._after_label_change()
+
+    async def get_content_by_tag(self, tag: str) -> Any:
+        """Get content by tag
+
+        Parameters
+        ----------
+        tag
+            Tag like 'ManufacturerModelName' or '0008-1090' or a group element like '' or '0008-1110/0/0008-1150'.
+
+        Returns
+        -------
+        Any
+            Content corresponding to specified tag.
+        """
+        result = await self.client.get_instances_id_content_path(id_=self.id_, path=tag)
+
+        try:
+            return result.decode('utf-8').strip().replace('\x00', '')
+        except AttributeError:
+            return result
+
+    async def anonymize(self, remove: List = None, replace: Dict = None, keep: List = None,
+                        keep_private_tags: bool = False, keep_source: bool = True,
+                        private_creator: str = None, force: bool = False, dicom_version: str = None) -> bytes:
+        """Anonymize Instance
+
+        See `Instance.anonymize()` for the description of the parameters.
+
+        Returns
+        -------
+        bytes
+            Raw bytes of the anonymized instance.
+        """
+        remove = [] if remove is None else remove
+        replace = {} if replace is None else replace
+        keep = [] if keep is None else keep
+
+        data = {
+            'Remove': remove,
+            'Replace': replace,
+            'Keep': keep,
+            'Force': force,
+            'KeepPrivateTags': keep_private_tags,
+            'KeepSource': keep_source,
+        }
+        if private_creator is not None:
+            data['PrivateCreator'] = private_creator
+        if dicom_version is not None:
+            data['DicomVersion'] = dicom_version
+
+        return await self.client.post_instances_id_anonymize(self.id_, data)
+
+    async def modify(self, remove: List = None, replace: Dict = None, keep: List = None,
+                     remove_private_tags: bool = False, keep_source: bool = True,
+                     private_creator: str = None, force: bool = False) -> bytes:
+        """Modify Instance
+
+        See `Instance.modify()` for the description of the parameters.
+
+        Returns
+        -------
+        bytes
+            Raw bytes of the modified instance.
+        """
+        remove = [] if remove is None else remove
+        replace = {} if replace is None else replace
+        keep = [] if keep is None else keep
+
+        if 'SOPInstanceUID' in replace and not force:
+            raise errors.ModificationError('If SOPInstanceUID is replaced, `force` must be `True`')
+
+        data = {
+            'Remove': remove,
+            'Replace': replace,
+            'Keep': keep,
+            'Force': force,
+            'RemovePrivateTags': remove_private_tags,
+            'KeepSource': keep_source,
+        }
+        if private_creator is not None:
+            data['PrivateCreator'] = private_creator
+
+        return await self.client.post_instances_id_modify(self.id_, data)
+
+    async def get_pydicom(self) -> pydicom.FileDataset:
+        """Retrieve a pydicom.FileDataset object corresponding to the instance."""
+        dicom_bytes = await self.get_dicom_file_content()
+
+        return pydicom.dcmread(BytesIO(dicom_bytes))
+
+
+def _to_float_list(value: str) -> List[float]:
+    return [float(i) for i in value.split('\\')]
@@ -0,0 +1,313 @@
+from typing import BinaryIO, Dict, List, Union
+
+from httpx import ReadTimeout
+
+from .async_resource import AsyncResource
+from .async_study import AsyncStudy
+from .. import errors, util
+from ..jobs import AsyncJob
+
+
+class AsyncPatient(AsyncResource):
+    """Represent a Patient that is in an Orthanc server, with an asynchronous client
+
+    This object mirrors `Patient`, but getters that need to query
+    Orthanc are awaitable (e.g. `await patient.name`).
+    """
+
+    async def get_main_information(self) -> Dict:
+        """Get Patient information
+
+        Returns
+        -------
+        Dict
+            Dictionary of patient main information.
+        """
+        return await self.client.get_patients_id(self.id_)
+
+    @property
+    def legacy_viewer_url(self) -> str:
+        """Get Patient (legacy viewer) URL
+
+        Returns
+        -------
+        str
+            URL of patient (legacy viewer)
+        """
+        return f'{self.client.url}/app/explorer.html#patient?uuid={self.id_}'
+
+    @property
+    def patient_id(self):
+        """Get patient ID (awaitable)"""
+        return self._get_main_dicom_tag_value('PatientID')
+
+    @property
+    def name(self):
+        """Get patient name (awaitable)"""
+        return self._get_main_dicom_tag_value('PatientName')
+
+    @property
+    def birth_date(self):
+        """Get patient birthdate (awaitable)"""
+        return self._get_main_dicom_tag_value('PatientBirthDate', util.make_datetime_from_dicom_date)
+
+    @property
+    def sex(self):
+        """Get patient sex (awaitable)"""
+        return self._get_main_dicom_tag_value('PatientSex')
+
+    @property
+    def other_patient_ids(self):
+        return self._get_main_dicom_tag_value('OtherPatientIDs', lambda ids: ids.split('\\'))
+
+    @property
+    def is_stable(self):
+        return self._get_information_field('IsStable')
+
+    @property
+    def last_update(self):
+        return self._get_last_update()
+
+    @property
+    def labels(self):
+        return self._get_information_field('Labels')
+
+    async def add_label(self, label: str) -> None:
+        await self.client.put_patients_id_labels_label(self.id_, label)
+        self._after_label_change()
+
+    async def remove_label(self, label):
+        await self.client.delete_patients_id_labels_label(self.id_, label)
+        self._after_label_change()
+
+    async def get_zip(self) -> bytes:
+        """Get the bytes of the zip file
+
+        Returns
+        -------
+        bytes
+            Bytes of Zip file of the patient.
+        """
+        return await self.client.get_patients_id_archive(self.id_)
+
+    async def download(self, filepath: Union[str, BinaryIO], with_progres: bool = False) -> None:
+        """Download the zip file to a target path or buffer
+
+        Examples
+        --------
+        ```python
+        from pyorthanc import AsyncOrthanc, AsyncPatient
+        a_patient = AsyncPatient('A_PATIENT_IDENTIFIER', AsyncOrthanc('http://localhost:8042'))
+
+        await a_patient.download('patient.zip')
+        ```
+        """
+        await self._download_file(f'{self.client.url}/patients/{self.id_}/archive', filepath, with_progres)
+
+    async def get_patient_module(self, simplify: bool = False, short: bool = False) -> Dict:
+        """Get patient module in a simplified version
+
+        Parameters
+        ----------
+        simplify
+            Get the simplified version of the tags
+        short
+            Get the short version of the tags
+
+        Returns
+        -------
+        Dict
+            DICOM Patient module.
+        """
+        params = self._make_response_format_params(simplify, short)
+
+        return dict(await self.client.get_patients_id_module(
+            self.id_,
+            params=params
+        ))
+
+    @property
+    def protected(self):
+        """Get if patient is protected against recycling (awaitable)"""
+        return self._get_protected()
+
+    async def _get_protected(self) -> bool:
+        return '1' == await self.client.get_patients_id_protected(self.id_)
+
+    async def set_protected(self, value: bool) -> None:
+        """Set patient protection against recycling
+
+        Parameters
+        ----------
+        value
+            True to protect the patient, False to unprotect it.
+        """
+        # As of version 1.11.1, the Orthanc OPEN API file has missing information
+        await self.client._put(
+            f'{self.client.url}/patients/{self.id_}/protected',
+            json=1 if value else 0  # 1 means it will be protected, 0 means unprotected
+        )
+
+    @property
+    def studies(self):
+        """Get patient's studies (awaitable)"""
+        return self._get_studies()
+
+    async def _get_studies(self) -> List[AsyncStudy]:
+        if self._lock_children:
+            if self._child_resources is None:
+                studies_ids = (await self._get_information())['Studies']
+                self._child_resources = [
+                    AsyncStudy(i, self.client, self._lock_children, self.information_ttl) for i in studies_ids
+                ]
+
+            return self._child_resources
+
+        studies_ids = (await self._get_information())['Studies']
+
+        return [AsyncStudy(i, self.client, information_ttl=self.information_ttl) for i in studies_ids]
+
+    async def anonymize(self, remove: List = None, replace: Dict = None, keep: List = None,
+                        force: bool = False, keep_private_tags: bool = False,
+                        keep_source: bool = True, priority: int = 0, permissive: bool = False,
+                        private_creator: str = None, dicom_version: str = None) -> 'AsyncPatient':
+        """Anonymize patient
+
+        See `Patient.anonymize()` for the description of the parameters.
+
+        Returns
+        -------
+        AsyncPatient
+            A New anonymous patient.
+        """
+        data = self._make_anonymization_data(
+            remove, replace, keep, force, keep_private_tags, keep_source,
+            priority, permissive, private_creator, dicom_version
+        )
+
+        try:
+            anonymous_patient = await self.client.post_patients_id_anonymize(self.id_, data)
+        except ReadTimeout:
+            raise ReadTimeout(
+                'Patient anonymization is too long to process. '
+                'Use `.anonymize_as_job` or increase client.timeout.'
+            )
+
+        self._after_anonymization(keep_source)
+
+        return AsyncPatient(anonymous_patient['ID'], self.client)
+
+    async def anonymize_as_job(self, remove: List = None, replace: Dict = None, keep: List = None,
+                               force: bool = False, keep_private_tags: bool = False,
+                               keep_source: bool = True, priority: int = 0, permissive: bool = False,
+                               private_creator: str = None, dicom_version: str = None) -> AsyncJob:
+        """Anonymize patient and return a job
+
+        See `Patient.anonymize_as_job()` for the description of the parameters.
+
+        Returns
+        -------
+        AsyncJob
+            Return an AsyncJob object of the anonymization job.
+
+        Examples
+        --------
+        ```python
+        job = await patient.anonymize_as_job()
+        await job.wait_until_completion()
+        new_patient = AsyncPatient((await job.content)['ID'], client)
+        ```
+        """
+        data = self._make_anonymization_data(
+            remove, replace, keep, force, keep_private_tags, keep_source,
+            priority, permissive, private_creator, dicom_version, asynchronous=True
+        )
+        job_info = await self.client.post_patients_id_anonymize(self.id_, data)
+
+        self._after_anonymization(keep_source)
+
+        return AsyncJob(job_info['ID'], self.client)
+
+    async def modify(self, remove: List = None, replace: Dict = None, keep: List = None,
+                     force: bool = False, remove_private_tags: bool = False,
+                     keep_source: bool = True, priority: int = 0, permissive: bool = False,
+                     private_creator: str = None) -> 'AsyncPatient':
+        """Modify patient
+
+        See `Patient.modify()` for the description of the parameters.
+
+        Returns
+        -------
+        AsyncPatient
+            Returns a new patient if the "PatientID" tag has been replaced,
+            returns itself if not (in this case, the patient itself is modified).
+        """
+        if replace is not None and 'PatientID' in replace and not force:
+            raise errors.ModificationError('If PatientID is replaced, `force` must be `True`')
+
+        data = self._make_modification_data(
+            remove, replace, keep, force, remove_private_tags, keep_source,
+            priority, permissive, private_creator
+        )
+
+        try:
+            modified_patient = await self.client.post_patients_id_modify(self.id_, data)
+        except ReadTimeout:
+            raise ReadTimeout(
+                'Patient modification is too long to process. '
+                'Use `.modify_as_job` or increase client.timeout.'
+            )
+
+        self._after_modification()
+
+        # if 'PatientID' is not affected, the modified_patient['ID'] is the same as self.id_
+        return AsyncPatient(modified_patient['ID'], self.client)
+
+    async def modify_as_job(self, remove: List = None, replace: Dict = None, keep: List = None,
+                            force: bool = False, remove_private_tags: bool = False,
+                            keep_source: bool = True, priority: int = 0, permissive: bool = False,
+                            private_creator: str = None) -> AsyncJob:
+        """Modify patient and return a job
+
+        See `Patient.modify_as_job()` for the description of the parameters.
+
+        Returns
+        -------
+        AsyncJob
+            Return an AsyncJob object of the modification job.
+        """
+        if replace is not None and 'PatientID' in replace and not force:
+            raise errors.ModificationError('If PatientID is affected, `force` must be `True`')
+
+        data = self._make_modification_data(
+            remove, replace, keep, force, remove_private_tags, keep_source,
+            priority, permissive, private_creator, asynchronous=True
+        )
+        job_info = await self.client.post_patients_id_modify(self.id_, data)
+
+        self._after_modification()
+
+        return AsyncJob(job_info['ID'], self.client)
+
+    async def get_shared_tags(self, simplify: bool = False, short: bool = False) -> Dict:
+        """Retrieve the shared tags of the patient"""
+        params = self._make_response_format_params(simplify, short)
+
+        return dict(await self.client.get_patients_id_shared_tags(
+            self.id_,
+            params=params
+        ))
+
+    @property
+    def shared_tags(self):
+        return self.get_shared_tags(simplify=True)
+
+    def remove_empty_studies(self) -> None:
+        """Delete empty studies."""
+        if self._child_resources is None:
+            return
+
+        for study in self._child_resources:
+            study.remove_empty_series()
+
+        self._child_resources = [study for study in self._child_resources if study._child_resources != []]
@@ -0,0 +1,155 @@
+import abc
+from typing import Any, BinaryIO, Callable, Dict, Optional, Union
+
+from httpx._types import QueryParamTypes
+
+from .. import errors, util
+from .resource import DEFAULT_INFORMATION_TTL, _CachedResource
+from ..async_client import AsyncOrthanc
+
+
+class AsyncResource(_CachedResource):
+
+    def __init__(self,
+                 id_: str,
+                 client: AsyncOrthanc,
+                 _lock_children: bool = False,
+                 information_ttl: Optional[float] = DEFAULT_INFORMATION_TTL) -> None:
+        """Constructor
+
+        Parameters
+        ----------
+        id_
+            Orthanc identifier of the resource
+        client
+            Asynchronous Orthanc client
+        _lock_children
+            If `_lock_children` is True, the resource children (ex. instances of a series via `AsyncSeries.instances`)
+            will be cached at the first query rather than queried every time. This is useful when you want
+            to filter the children of a resource and want to maintain the filter result.
+        information_ttl
+            Time (in seconds) during which the resource information (labels, children, stability, ...)
+            is cached before being queried again. If None, the information is cached until `.refresh()`
+            is called. With 0, the information is queried at every access.
+        """
+        super().__init__(id_, client, _lock_children, information_ttl)
+
+    @property
+    def main_dicom_tags(self):
+        """Get the main DICOM tags (awaitable)
+
+        Examples
+        --------
+        ```python
+        main_dicom_tags = await resource.main_dicom_tags
+        ```
+        """
+        return self._get_main_dicom_tags()
+
+    async def _get_main_dicom_tags(self) -> Dict[str, str]:
+        if self._main_dicom_tags is None:
+            self._main_dicom_tags = (await self._get_information())['MainDicomTags']
+
+        return self._main_dicom_tags
+
+    @property
+    def information(self):
+        """Get the cached main information of the resource (awaitable)
+
+        The information is queried again when it is older than `information_ttl`.
+        Use `await .get_main_information()` to always query Orthanc.
+        """
+        return self._get_information()
+
+    async def refresh(self) -> None:
+        """Query again the resource information and drop the cached values"""
+        self._main_dicom_tags = None
+        self._set_information(await self.get_main_information())
+
+    async def _get_information(self) -> Dict:
+        if self._information is None or self._is_information_expired():
+            self._set_information(await self.get_main_information())
+
+        return self._information
+
+    @abc.abstractmethod
+    def legacy_viewer_url(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_main_information(self):
+        raise NotImplementedError
+
+    async def _get_main_dicom_tag_value(self, tag: str, converter: Optional[Callable] = None) -> Any:
+        main_dicom_tags = await self._get_main_dicom_tags()
+
+        try:
+            value = main_dicom_tags[tag]
+        except KeyError:
+            # The tag may have been requested along with the resource (see `requested_tags`)
+            if tag not in self.requested_tags:
+                raise errors.TagDoesNotExistError(f'{self} has no {tag} tag.')
+
+            value = self.requested_tags[tag]
+
+        return value if converter is None else converter(value)
+
+    async def _get_information_field(self, field: str) -> Any:
+        return (await self._get_information())[field]
+
+    async def _get_last_update(self):
+        last_updated_date_and_time = (await self._get_information())['LastUpdate'].split('T')
+        date = last_updated_date_and_time[0]
+        time = last_updated_date_and_time[1]
+
+        return util.make_datetime_from_dicom_date(date, time)
+
+    async def _get_date(self, date_tag: str, time_tag: str):
+        date_string = await self._get_main_dicom_tag_value(date_tag)
+        try:
+            time_string = await self._get_main_dicom_tag_value(time_tag)
+        except errors.TagDoesNotExistError:
+            time_string = None
+
+        return util.make_datetime_from_dicom_date(date_string, time_string)
+
+    async def _download_file(
+            self, url: str,
+            filepath: Union[str, BinaryIO],
+            with_progress: bool = False,
+            params: Optional[QueryParamTypes] = None):
+        # Check if filepath is a path or a file object.
+        if isinstance(filepath, str):
+            is_file_object = False
+            filepath = open(filepath, 'wb')
+        elif hasattr(filepath, 'write') and hasattr(filepath, 'seek'):
+            is_file_object = True
+        else:
+            raise TypeError(f'"path" must be a file-like object or a file path, got "{type(filepath).__name__}".')
+
+        try:
+            async with self.client.stream('GET', url, params=params) as response:
+                if with_progress:
+                    try:
+                        from tqdm import tqdm
+                    except ModuleNotFoundError:
+                        raise ModuleNotFoundError(
+                            'Optional dependency tqdm have to be installed for the progress indicator. '
+                            'Install with `pip install pyorthanc[progress]` or `pip install pyorthanc[all]'
+                        )
+
+                    last_num_bytes_downloaded = response.num_bytes_downloaded
+
+                    with tqdm(unit='B', unit_scale=True, desc=self.__repr__()) as progress:
+                        async for chunk in response.aiter_bytes():
+                            filepath.write(chunk)
+                            progress.update(response.num_bytes_downloaded - last_num_bytes_downloaded)
+                            last_num_bytes_downloaded = response.num_bytes_downloaded
+
+                else:
+                    async for chunk in response.aiter_bytes():
+                        filepath.write(chunk)
+
+        finally:
+            if not is_file_object:
+                filepath.close()
@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+from typing import BinaryIO, Dict, List, TYPE_CHECKING, Union
+
+from httpx import ReadTimeout
+
+from .async_instance import AsyncInstance, _to_float_list
+from .async_resource import AsyncResource
+from .. import errors
+from ..jobs import AsyncJob
+
+if TYPE_CHECKING:
+    from . import AsyncPatient, AsyncStudy
+
+
+class AsyncSeries(AsyncResource):
+    """Represent a series that is in an Orthanc server, with an asynchronous client
+
+    This object mirrors `Series`, but getters that need to query
+    Orthanc are awaitable (e.g. `await series.modality`).
+    """
+
+    @property
+    def instances(self):
+        """Get series instances (awaitable)"""
+        return self._get_instances()
+
+    async def _get_instances(self) -> List[AsyncInstance]:
+        if self._lock_children:
+            if self._child_resources is None:
+                instances_ids = (await self._get_information())['Instances']
+                self._child_resources = [
+                    AsyncInstance(i, self.client, self._lock_children, self.information_ttl) for i in instances_ids
+                ]
+
+            return self._child_resources
+
+        instances_ids = (await self._get_information())['Instances']
+
+        return [AsyncInstance(i, self.client, information_ttl=self.information_ttl) for i in instances_ids]
+
+    @property
+    def uid(self):
+        """Get SeriesInstanceUID (awaitable)"""
+        return self._get_main_dicom_tag_value('SeriesInstanceUID')
+
+    async def get_main_information(self) -> Dict:
+        """Get series main information
+
+        Returns
+        -------
+        Dict
+            Dictionary of series information
+        """
+        return await self.client.get_series_id(self.id_)
+
+    @property
+    def legacy_viewer_url(self) -> str:
+        """Get Series (legacy viewer) URL
+
+        Returns
+        -------
+        str
+            URL of series (legacy viewer)
+        """
+        return f'{self.client.url}/app/explorer.html#series?uuid={self.id_}'
+
+    @property
+    def manufacturer(self):
+        """Get the manufacturer (awaitable)"""
+        return self._get_main_dicom_tag_value('Manufacturer')
+
+    @property
+    def study_identifier(self):
+        """Get the parent study identifier (awaitable)"""
+        return self._get_information_field('ParentStudy')
+
+    @property
+    def parent_study(self):
+        return self._get_parent_study()
+
+    async def _get_parent_study(self) -> AsyncStudy:
+        from . import AsyncStudy
+        return AsyncStudy(await self.study_identifier, self.client, information_ttl=self.information_ttl)
+
+    @property
+    def parent_patient(self):
+        return self._get_parent_patient()
+
+    async def _get_parent_patient(self) -> AsyncPatient:
+        return await (await self.parent_study).parent_patient
+
+    @property
+    def date(self):
+        """Get series datetime (awaitable)"""
+        return self._get_date('SeriesDate', 'SeriesTime')
+
+    @property
+    def modality(self):
+        """Get series modality (awaitable)"""
+        return self._get_main_dicom_tag_value('Modality')
+
+    @property
+    def series_number(self):
+        return self._get_main_dicom_tag_value('SeriesNumber', int)
+
+    @property
+    def performed_procedure_step_description(self):
+        return self._get_main_dicom_tag_value('PerformedProcedureStepDescription')
+
+    @property
+    def protocol_name(self):
+        return self._get_main_dicom_tag_value('ProtocolName')
+
+    @property
+    def station_name(self):
+        return self._get_main_dicom_tag_value('StationName')
+
+    @property
+    def description(self):
+        return self._get_main_dicom_tag_value('SeriesDescription')
+
+    @property
+    def body_part_examined(self):
+        return self._get_main_dicom_tag_value('BodyPartExamined')
+
+    @property
+    def sequence_name(self):
+        return self._get_main_dicom_tag_value('SequenceName')
+
+    @property
+    def cardiac_number_of_images(self):
+        return self._get_main_dicom_tag_value('CardiacNumberOfImages', int)
+
+    @property
+    def images_in_acquisition(self):
+        return self._get_main_dicom_tag_value('ImagesInAcquisition', int)
+
+    @property
+    def number_of_temporal_positions(self):
+        return self._get_main_dicom_tag_value('NumberOfTemporalPositions', int)
+
+    @property
+    def number_of_slices(self):
+        return self._get_main_dicom_tag_value('NumberOfSlices', int)
+
+    @property
+    def number_of_time_slices(self):
+        return self._get_main_dicom_tag_value('NumberOfTimeSlices', int)
+
+    @property
+    def image_orientation_patient(self):
+        return self._get_main_dicom_tag_value('ImageOrientationPatient', _to_float_list)
+
+    @property
+    def series_type(self):
+        return self._get_main_dicom_tag_value('SeriesType')
+
+    @property
+    def operators_name(self):
+        return self._get_main_dicom_tag_value('OperatorsName')
+
+    @property
+    def acquisition_device_processing_description(self):
+        return self._get_main_dicom_tag_value('AcquisitionDeviceProcessingDescription')
+
+    @property
+    def contrast_bolus_agent(self):
+        return self._get_main_dicom_tag_value('ContrastBolusAgent')
+
+    @property
+    def is_stable(self):
+        return self._get_information_field('IsStable')
+
+    @property
+    def last_update(self):
+        return self._get_last_update()
+
+    @property
+    def labels(self):
+        return self._get_information_field('Labels')
+
+    async def add_label(self, label: str) -> None:
+        await self.client.put_series_id_labels_label(self.id_, label)
+        self._after_label_change()
+
+    async def remove_label(self, label):
+        await self.client.delete_series_id_labels_label(self.id_, label)
+        self._after_label_change()
+
+    async def anonymize(self, remove: List = None, replace: Dict = None, keep: List = None,
+                        force: bool = False, keep_private_tags: bool = False,
+                        keep_source: bool = True, priority: int = 0, permissive: bool = False,
+                        private_creator: str = None, dicom_version: str = None) -> 'AsyncSeries':
+        """Anonymize series
+
+        See `Series.anonymize()` for the description of the parameters.
+
+        Returns
+        -------
+        AsyncSeries
+            A New anonymous series.
+        """
+        data = self._make_anonymization_data(
+            remove, replace, keep, force, keep_private_tags, keep_source,
+            priority, permissive, private_creator, dicom_version
+        )
+
+        try:
+            anonymous_series = await self.client.post_series_id_anonymize(self.id_, data)
+        except ReadTimeout:
+            raise ReadTimeout(
+                'Series anonymization is too long to process. '
+                'Use `.anonymize_as_job` or increase client.timeout.'
+            )
+
+        self._after_anonymization(keep_source)
+
+        return AsyncSeries(anonymous_series['ID'], self.client)
+
+    async def anonymize_as_job(self, remove: List = None, replace: Dict = None, keep: List = None,
+                               force: bool = False, keep_private_tags: bool = False,
+                               keep_source: bool = True, priority: int = 0, permissive: bool = False,
+                               private_creator: str = None, dicom_version: str = None) -> AsyncJob:
+        """Anonymize series and return a job
+
+        See `Series.anonymize_as_job()` for the description of the parameters.
+
+        Returns
+        -------
+        AsyncJob
+            Return an AsyncJob object of the anonymization job.
+
+        Examples
+        --------
+        ```python
+        job = await series.anonymize_as_job()
+        await job.wait_until_completion()
+        new_series = AsyncSeries((await job.content)['ID'], client)
+        ```
+        """
+        data = self._make_anonymization_data(
+            remove, replace, keep, force, keep_private_tags, keep_source,
+            priority, permissive, private_creator, dicom_version, asynchronous=True
+        )
+        job_info = await self.client.post_series_id_anonymize(self.id_, data)
+
+        self._after_anonymization(keep_source)
+
+        return AsyncJob(job_info['ID'], self.client)
+
+    async def modify(self, remove: List = None, replace: Dict = None, keep: List = None,
+                     force: bool = False, remove_private_tags: bool = False,
+                     keep_source: bool = True, priority: int = 0, permissive: bool = False,
+                     private_creator: str = None) -> 'AsyncSeries':
+        """Modify series
+
+        See `Series.modify()` for the description of the parameters.
+
+        Returns
+        -------
+        AsyncSeries
+            Returns a new modified series or returns itself if keep=['SeriesInstanceUID']
+            (in this case, the series itself is modified).
+        """
+        if replace is not None and 'SeriesInstanceUID' in replace and not force:
+            raise errors.ModificationError('If SeriesInstanceUID is replaced, `force` must be `True`')
+
+        data = self._make_modification_data(
+            remove, replace, keep, force, remove_private_tags, keep_source,
+            priority, permissive, private_creator
+        )
+
+        try:
+            modified_series = await self.client.post_series_id_modify(self.id_, data)
+        except ReadTimeout:
+            raise ReadTimeout(
+                'Series modification is too long to process. '
+                'Use `.modify_as_job` or increase client.timeout.'
+            )
+
+        self._after_modification()
+
+        # if 'SeriesInstanceUID' is not affected, the modified_series['ID'] is the same as self.id_
+        return AsyncSeries(modified_series['ID'], self.client)
+
+    async def modify_as_job(self, remove: List = None, replace: Dict = None, keep: List = None,
+                            force: bool = False, remove_private_tags: bool = False,
+                            keep_source: bool = True, priority: int = 0, permissive: bool = False,
+                            private_creator: str = None) -> AsyncJob:
+        """Modify series and return a job
+
+        See `Series.modify_as_job()` for the description of the parameters.
+
+        Returns
+        -------
+        AsyncJob
+            Return an AsyncJob object of the modification job.
+        """
+        if replace is not None and 'SeriesInstanceUID' in replace and not force:
+            raise errors.ModificationError('If SeriesInstanceUID is affected, `force` must be `True`')
+
+        data = self._make_modification_data(
+            remove, replace, keep, force, remove_private_tags, keep_source,
+            priority, permissive, private_creator, asynchronous=True
+        )
+        job_info = await self.client.post_series_id_modify(self.id_, data)
+
+        self._after_modification()
+
+        return AsyncJob(job_info['ID'], self.client)
+
+    async def get_zip(self) -> bytes:
+        """Get the bytes of the zip file
+
+        Returns
+        -------
+        bytes
+            Bytes of Zip file of the series.
+        """
+        return await self.client.get_series_id_archive(self.id_)
+
+    async def download(self, filepath: Union[str, BinaryIO], with_progres: bool = False) -> None:
+        """Download the zip file to a target path or buffer
+
+        Examples
+        --------
+        ```python
+        from pyorthanc import AsyncOrthanc, AsyncSeries
+        a_series = AsyncSeries('SERIES_IDENTIFIER', AsyncOrthanc('http://localhost:8042'))
+
+        await a_series.download('series.zip')
+        ```
+        """
+        await self._download_file(f'{self.client.url}/series/{self.id_}/archive', filepath, with_progres)
+
+    async def get_shared_tags(self, simplify: bool = False, short: bool = False) -> Dict:
+        """Retrieve the shared tags of the series"""
+        params = self._make_response_format_params(simplify, short)
+
+        return dict(await self.client.get_series_id_shared_tags(
+            self.id_,
+            params=params
+        ))
+
+    @property
+    def shared_tags(self):
+        return self.get_shared_tags(simplify=True)
+
+    def remove_empty_instances(self) -> None:
+        if self._child_resources is not None:
+            self._child_resources = [i for i in self._child_resources if i is not None]
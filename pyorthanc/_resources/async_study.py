@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+from typing import BinaryIO, Dict, List, TYPE_CHECKING, Union
+
+from httpx import ReadTimeout
+
+from .async_resource import AsyncResource
+from .async_series import AsyncSeries
+from .. import errors
+from ..jobs import AsyncJob
+
+if TYPE_CHECKING:
+    from . import AsyncPatient
+
+
+class AsyncStudy(AsyncResource):
+    """Represent a study that is in an Orthanc server, with an asynchronous client
+
+    This object mirrors `Study`, but getters that need to query
+    Orthanc are awaitable (e.g. `await study.date`).
+    """
+
+    async def get_main_information(self) -> Dict:
+        """Get Study information
+
+        Returns
+        -------
+        Dict
+            Dictionary of study information
+        """
+        return await self.client.get_studies_id(self.id_)
+
+    @property
+    def legacy_viewer_url(self) -> str:
+        """Get Study (legacy viewer) URL
+
+        Returns
+        -------
+        str
+            URL of study (legacy viewer)
+        """
+        return f'{self.client.url}/app/explorer.html#study?uuid={self.id_}'
+
+    @property
+    def referring_physician_name(self):
+        """Get referring physician name (awaitable)"""
+        return self._get_main_dicom_tag_value('ReferringPhysicianName')
+
+    @property
+    def requesting_physician(self):
+        """Get requesting physician (awaitable)"""
+        return self._get_main_dicom_tag_value('RequestingPhysician')
+
+    @property
+    def date(self):
+        """Get study date (awaitable)"""
+        return self._get_date('StudyDate', 'StudyTime')
+
+    @property
+    def study_id(self):
+        """Get Study ID (awaitable)"""
+        return self._get_main_dicom_tag_value('StudyID')
+
+    @property
+    def uid(self):
+        """Get StudyInstanceUID (awaitable)"""
+        return self._get_main_dicom_tag_value('StudyInstanceUID')
+
+    @property
+    def patient_identifier(self):
+        """Get the Orthanc identifier of the parent patient (awaitable)"""
+        return self._get_information_field('ParentPatient')
+
+    @property
+    def parent_patient(self):
+        return self._get_parent_patient()
+
+    async def _get_parent_patient(self) -> AsyncPatient:
+        from . import AsyncPatient
+        return AsyncPatient(await self.patient_identifier, self.client, information_ttl=self.information_ttl)
+
+    @property
+    def patient_information(self):
+        """Get patient information (awaitable)"""
+        return self._get_information_field('PatientMainDicomTags')
+
+    @property
+    def series(self):
+        """Get Study series (awaitable)"""
+        return self._get_series()
+
+    async def _get_series(self) -> List[AsyncSeries]:
+        if self._lock_children:
+            if self._child_resources is None:
+                series_ids = (await self._get_information())['Series']
+                self._child_resources = [
+                    AsyncSeries(i, self.client, self._lock_children, self.information_ttl) for i in series_ids
+                ]
+
+            return self._child_resources
+
+        series_ids = (await self._get_information())['Series']
+
+        return [AsyncSeries(i, self.client, information_ttl=self.information_ttl) for i in series_ids]
+
+    @property
+    def accession_number(self):
+        return self._get_main_dicom_tag_value('AccessionNumber')
+
+    @property
+    def description(self):
+        return self._get_main_dicom_tag_value('StudyDescription')
+
+    @property
+    def institution_name(self):
+        return self._get_main_dicom_tag_value('InstitutionName')
+
+    @property
+    def requested_procedure_description(self):
+        return self._get_main_dicom_tag_value('RequestedProcedureDescription')
+
+    @property
+    def is_stable(self):
+        return self._get_information_field('IsStable')
+
+    @property
+    def last_update(self):
+        return self._get_last_update()
+
+    @property
+    def labels(self):
+        return self._get_information_field('Labels')
+
+    async def add_label(self, label: str) -> None:
+        await self.client.put_studies_id_labels_label(self.id_, label)
+        self._after_label_change()
+
+    async def remove_label(self, label):
+        await self.client.delete_studies_id_labels_label(self.id_, label)
+        self._after_label_change()
+
+    async def anonymize(self, remove: List = None, replace: Dict = None, keep: List = None,
+                        force: bool = False, keep_private_tags: bool = False,
+                        keep_source: bool = True, priority: int = 0, permissive: bool = False,
+                        private_creator: str = None, dicom_version: str = None) -> 'AsyncStudy':
+        """Anonymize study
+
+        See `Study.anonymize()` for the description of the parameters.
+
+        Returns
+        -------
+        AsyncStudy
+            A New anonymous study.
+        """
+        data = self._make_anonymization_data(
+            remove, replace, keep, force, keep_private_tags, keep_source,
+            priority, permissive, private_creator, dicom_version
+        )
+
+        try:
+            anonymous_study = await self.client.post_studies_id_anonymize(self.id_, data)
+        except ReadTimeout:
+            raise ReadTimeout(
+                'Study anonymization is too long to process. '
+                'Use `.anonymize_as_job` or increase client.timeout.'
+            )
+
+        self._after_anonymization(keep_source)
+
+        return AsyncStudy(anonymous_study['ID'], self.client)
+
+    async def anonymize_as_job(self, remove: List = None, replace: Dict = None, keep: List = None,
+                               force: bool = False, keep_private_tags: bool = False,
+                               keep_source: bool = True, priority: int = 0, permissive: bool = False,
+                               private_creator: str = None, dicom_version: str = None) -> AsyncJob:
+        """Anonymize study and return a job
+
+        See `Study.anonymize_as_job()` for the description of the parameters.
+
+        Returns
+        -------
+        AsyncJob
+            Return an AsyncJob object of the anonymization job.
+
+        Examples
+        --------
+        ```python
+        job = await study.anonymize_as_job()
+        await job.wait_until_completion()
+        new_study = AsyncStudy((await job.content)['ID'], client)
+        ```
+        """
+        data = self._make_anonymization_data(
+            remove, replace, keep, force, keep_private_tags, keep_source,
+            priority, permissive, private_creator, dicom_version, asynchronous=True
+        )
+        job_info = await self.client.post_studies_id_anonymize(self.id_, data)
+
+        self._after_anonymization(keep_source)
+
+        return AsyncJob(job_info['ID'], self.client)
+
+    async def modify(self, remove: List = None, replace: Dict = None, keep: List = None,
+                     force: bool = False, remove_private_tags: bool = False,
+                     keep_source: bool = True, priority: int = 0, permissive: bool = False,
+                     private_creator: str = None) -> 'AsyncStudy':
+        """Modify study
+
+        See `Study.modify()` for the description of the parameters.
+
+        Returns
+        -------
+        AsyncStudy
+            Returns a new modified study or returns itself if keep=['StudyInstanceUID']
+            (in this case, the study itself is modified).
+        """
+        if replace is not None and 'StudyInstanceUID' in replace and not force:
+            raise errors.ModificationError('If StudyInstanceUID is replaced, `force` must be `True`')
+
+        data = self._make_modification_data(
+            remove, replace, keep, force, remove_private_tags, keep_source,
+            priority, permissive, private_creator
+        )
+
+        try:
+            modified_study = await self.client.post_studies_id_modify(self.id_, data)
+        except ReadTimeout:
+            raise ReadTimeout(
+                'Study modification is too long to process. '
+                'Use `.modify_as_job` or increase client.timeout.'
+            )
+
+        self._after_modification()
+
+        # if 'StudyInstanceUID' is not affected, the modified_study['ID'] is the same as self.id_
+        return AsyncStudy(modified_study['ID'], self.client)
+
+    async def modify_as_job(self, remove: List = None, replace: Dict = None, keep: List = None,
+                            force: bool = False, remove_private_tags: bool = False,
+                            keep_source: bool = True, priority: int = 0, permissive: bool = False,
+                            private_creator: str = None) -> AsyncJob:
+        """Modify study and return a job
+
+        See `Study.modify_as_job()` for the description of the parameters.
+
+        Returns
+        -------
+        AsyncJob
+            Return an AsyncJob object of the modification job.
+        """
+        if replace is not None and 'StudyInstanceUID' in replace and not force:
+            raise errors.ModificationError('If StudyInstanceUID is affected, `force` must be `True`')
+
+        data = self._make_modification_data(
+            remove, replace, keep, force, remove_private_tags, keep_source,
+            priority, permissive, private_creator, asynchronous=True
+        )
+        job_info = await self.client.post_studies_id_modify(self.id_, data)
+
+        self._after_modification()
+
+        return AsyncJob(job_info['ID'], self.client)
+
+    async def get_zip(self) -> bytes:
+        """Get the bytes of the zip file
+
+        Returns
+        -------
+        bytes
+            Bytes of Zip file of the study.
+        """
+        return await self.client.get_studies_id_archive(self.id_)
+
+    async def download(self, filepath: Union[str, BinaryIO], with_progres: bool = False) -> None:
+        """Download the zip file to a target path or buffer
+
+        Examples
+        --------
+        ```python
+        from pyorthanc import AsyncOrthanc, AsyncStudy
+        a_study = AsyncStudy('STUDY_IDENTIFIER', AsyncOrthanc('http://localhost:8042'))
+
+        await a_study.download('study.zip')
+        ```
+        """
+        await self._download_file(f'{self.client.url}/studies/{self.id_}/archive', filepath, with_progres)
+
+    async def get_shared_tags(self, simplify: bool = False, short: bool = False) -> Dict:
+        """Retrieve the shared tags of the study"""
+        params = self._make_response_format_params(simplify, short)
+
+        return dict(await self.client.get_studies_id_shared_tags(
+            self.id_,
+            params=params
+        ))
+
+    @property
+    def shared_tags(self):
+        return self.get_shared_tags(simplify=True)
+
+    def remove_empty_series(self) -> None:
+        """Delete empty series."""
+        if self._child_resources is None:
+            return
+
+        for series in self._child_resources:
+            series.remove_empty_instances()
+
+        self._child_resources = [series for series in self._child_resources if series._child_resources != []]
@@ -110,7 +110,7 @@ class Instance(Resource):
         int
             The file size in bytes.
         """
-        return self.get_main_information()['FileSize']
+        return self._get_information()['FileSize']
 
     @property
     def creation_date(self) -> datetime:
@@ -131,12 +131,12 @@ class Instance(Resource):
     @property
     def series_identifier(self) -> str:
         """Get the parent series identifier"""
-        return self.get_main_information()['ParentSeries']
+        return self._get_information()['ParentSeries']
 
     @property
     def parent_series(self) -> Series:
         from . import Series
-        return Series(self.series_identifier, self.client)
+        return Series(self.series_identifier, self.client, information_ttl=self.information_ttl)
 
     @property
     def parent_study(self) -> Study:
@@ -202,15 +202,17 @@ class Instance(Resource):
     @property
     def labels(self) -> List[str]:
         """Get instance labels"""
-        return self.get_main_information()['Labels']
+        return self._get_information()['Labels']
 
     def add_label(self, label: str) -> None:
         """Add label to resource"""
         self.client.put_instances_id_labels_label(self.id_, label)
+        self._after_label_change()
 
     def remove_label(self, label):
         """Remove label from resource"""
         self.client.delete_instances_id_labels_label(self.id_, label)
+        self._after_label_change()
 
     def get_content_by_tag(self, tag: str) -> Any:
         """Get content by tag
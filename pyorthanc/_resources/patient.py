@@ -66,11 +66,11 @@ class Patient(Resource):
 
     @property
     def is_stable(self):
-        return self.get_main_information()['IsStable']
+        return self._get_information()['IsStable']
 
     @property
     def last_update(self) -> datetime:
-        last_updated_date_and_time = self.get_main_information()['LastUpdate'].split('T')
+        last_updated_date_and_time = self._get_information()['LastUpdate'].split('T')
         date = last_updated_date_and_time[0]
         time = last_updated_date_and_time[1]
 
@@ -78,13 +78,15 @@ class Patient(Resource):
 
     @property
     def labels(self) -> List[str]:
-        return self.get_main_information()['Labels']
+        return self._get_information()['Labels']
 
     def add_label(self, label: str) -> None:
         self.client.put_patients_id_labels_label(self.id_, label)
+        self._after_label_change()
 
     def remove_label(self, label):
         self.client.delete_patients_id_labels_label(self.id_, label)
+        self._after_label_change()
 
     def get_zip(self) -> bytes:
         """Get the bytes of the zip file
@@ -246,14 +248,16 @@ class Patient(Resource):
         """
         if self._lock_children:
             if self._child_resources is None:
-                studies_ids = self.get_main_information()['Studies']
-                self._child_resources = [Study(i, self.client, self._lock_children) for i in studies_ids]
+                studies_ids = self._get_information()['Studies']
+                self._child_resources = [
+                    Study(i, self.client, self._lock_children, self.information_ttl) for i in studies_ids
+                ]
 
             return self._child_resources
 
-        studies_ids = self.get_main_information()['Studies']
+        studies_ids = self._get_information()['Studies']
 
-        return [Study(i, self.client) for i in studies_ids]
+        return [Study(i, self.client, information_ttl=self.information_ttl) for i in studies_ids]
 
     def anonymize(self, remove: List = None, replace: Dict = None, keep: List = None,
                   force: bool = False, keep_private_tags: bool = False,
@@ -339,6 +343,8 @@ class Patient(Resource):
                 'Use `.anonymize_as_job` or increase client.timeout.'
             )
 
+        self._after_anonymization(keep_source)
+
         return Patient(anonymous_patient['ID'], self.client)
 
     def anonymize_as_job(self, remove: List = None, replace: Dict = None, keep: List = None,
@@ -419,6 +425,8 @@ class Patient(Resource):
 
         job_info = self.client.post_patients_id_anonymize(self.id_, data)
 
+        self._after_anonymization(keep_source)
+
         return Job(job_info['ID'], self.client)
 
     def modify(self, remove: List = None, replace: Dict = None, keep: List = None,
@@ -505,8 +513,7 @@ class Patient(Resource):
                 'Use `.modify_as_job` or increase client.timeout.'
             )
 
-        # Reset cache since a main DICOM tag may have be changed
-        self._main_dicom_tags = None
+        self._after_modification()
 
         # if 'PatientID' is not affected, the modified_patient['ID'] is the same as self.id_
         return Patient(modified_patient['ID'], self.client)
@@ -600,8 +607,7 @@ class Patient(Resource):
 
         job_info = self.client.post_patients_id_modify(self.id_, data)
 
-        # Reset cache since a main DICOM tag may have be changed
-        self._main_dicom_tags = None
+        self._after_modification()
 
         return Job(job_info['ID'], self.client)
 
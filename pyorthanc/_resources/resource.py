@@ -1,4 +1,5 @@
 import abc
+import time
 from typing import Any, BinaryIO, Dict, List, Optional, Union
 
 from httpx._types import QueryParamTypes
@@ -6,31 +7,29 @@ from httpx._types import QueryParamTypes
 from .. import errors, util
 from ..client import Orthanc
 
+DEFAULT_INFORMATION_TTL = 5  # In seconds
 
-class Resource:
 
-    def __init__(self, id_: str, client: Orthanc, _lock_children: bool = False) -> None:
-        """Constructor
+class _CachedResource:
+    """State shared by the resources and the asynchronous resources
 
-        Parameters
-        ----------
-        id_
-            Orthanc identifier of the resource
-        client
-            Orthanc client
-        _lock_children
-            If `_lock_children` is True, the resource children (ex. instances of a series via `Series.instances`)
-            will be cached at the first query rather than queried every time. This is useful when you want
-            to filter the children of a resource and want to maintain the filter result.
-        """
+    Holds the TTL-cached information of the resource and the rules that invalidate it
+    after an operation on the resource (label change, modification, anonymization).
+    """
+
+    def __init__(self, id_: str, client, _lock_children: bool, information_ttl: Optional[float]) -> None:
         client = util.ensure_non_raw_response(client)
 
         self.id_ = id_
         self.client = client
+        self.information_ttl = information_ttl
 
         self._lock_children = _lock_children
+        self._information: Optional[Dict] = None
+        self._information_timestamp: Optional[float] = None
         self._main_dicom_tags: Optional[Dict] = None
-        self._child_resources: Optional[List['Resource']] = None
+        self._requested_tags: Optional[Dict] = None
+        self._child_resources: Optional[List] = None
 
     @property
     def identifier(self) -> str:
@@ -43,13 +42,173 @@ class Resource:
         """
         return self.id_
 
+    @property
+    def requested_tags(self) -> Dict[str, Any]:
+        """Get the tags requested with `requested_tags=[...]` when finding the resource
+
+        These tags are retrieved along with the resource in the /tools/find query
+        (e.g. `find_instances(client, requested_tags=['SliceThickness'])`),
+        so reading them does not send any request. Empty if no tags were requested.
+        """
+        return {} if self._requested_tags is None else self._requested_tags
+
+    def _set_information(self, information: Dict) -> None:
+        self._information = information
+        self._information_timestamp = time.monotonic()
+
+        if 'MainDicomTags' in information:
+            self._main_dicom_tags = information['MainDicomTags']
+
+        if 'RequestedTags' in information:
+            self._requested_tags = information['RequestedTags']
+
+    def _is_information_expired(self) -> bool:
+        if self.information_ttl is None:
+            return False
+
+        return time.monotonic() - self._information_timestamp >= self.information_ttl
+
+    def _invalidate_information(self) -> None:
+        self._information = None
+        self._information_timestamp = None
+
+    def _invalidate_tags(self) -> None:
+        self._main_dicom_tags = None
+        self._requested_tags = None
+
+    def _after_label_change(self) -> None:
+        # The labels are part of the information
+        self._invalidate_information()
+
+    def _after_modification(self) -> None:
+        # A main DICOM tag may have been changed
+        self._invalidate_information()
+        self._invalidate_tags()
+
+    def _after_anonymization(self, keep_source: bool) -> None:
+        # The source is left unchanged, unless it is deleted
+        if not keep_source:
+            self._invalidate_information()
+            self._invalidate_tags()
+
+    @staticmethod
+    def _make_anonymization_data(remove: List = None, replace: Dict = None, keep: List = None,
+                                 force: bool = False, keep_private_tags: bool = False,
+                                 keep_source: bool = True, priority: int = 0, permissive: bool = False,
+                                 private_creator: str = None, dicom_version: str = None,
+                                 asynchronous: bool = False) -> Dict:
+        data = {
+            'Asynchronous': asynchronous,
+            'Remove': [] if remove is None else remove,
+            'Replace': {} if replace is None else replace,
+            'Keep': [] if keep is None else keep,
+            'Force': force,
+            'KeepPrivateTags': keep_private_tags,
+            'KeepSource': keep_source,
+            'Priority': priority,
+            'Permissive': permissive,
+        }
+        if private_creator is not None:
+            data['PrivateCreator'] = private_creator
+        if dicom_version is not None:
+            data['DicomVersion'] = dicom_version
+
+        return data
+
+    @staticmethod
+    def _make_modification_data(remove: List = None, replace: Dict = None, keep: List = None,
+                                force: bool = False, remove_private_tags: bool = False,
+                                keep_source: bool = True, priority: int = 0, permissive: bool = False,
+                                private_creator: str = None, asynchronous: bool = False) -> Dict:
+        data = {
+            'Asynchronous': asynchronous,
+            'Remove': [] if remove is None else remove,
+            'Replace': {} if replace is None else replace,
+            'Keep': [] if keep is None else keep,
+            'Force': force,
+            'RemovePrivateTags': remove_private_tags,
+            'KeepSource': keep_source,
+            'Priority': priority,
+            'Permissive': permissive,
+        }
+        if private_creator is not None:
+            data['PrivateCreator'] = private_creator
+
+        return data
+
+    def _make_response_format_params(self, simplify: bool = False, short: bool = False) -> Dict:
+        if simplify and not short:
+            params = {'simplify': True}
+        elif short and not simplify:
+            params = {'short': True}
+        elif simplify and short:
+            raise ValueError('simplify and short can\'t be both True.')
+        else:
+            params = {}
+
+        return params
+
+    def __eq__(self, other: '_CachedResource') -> bool:
+        return self.id_ == other.id_
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.id_})'
+
+
+class Resource(_CachedResource):
+
+    def __init__(self,
+                 id_: str,
+                 client: Orthanc,
+                 _lock_children: bool = False,
+                 information_ttl: Optional[float] = DEFAULT_INFORMATION_TTL) -> None:
+        """Constructor
+
+        Parameters
+        ----------
+        id_
+            Orthanc identifier of the resource
+        client
+            Orthanc client
+        _lock_children
+            If `_lock_children` is True, the resource children (ex. instances of a series via `Series.instances`)
+            will be cached at the first query rather than queried every time. This is useful when you want
+            to filter the children of a resource and want to maintain the filter result.
+        information_ttl
+            Time (in seconds) during which the resource information (labels, children, stability, ...)
+            is cached before being queried again. If None, the information is cached until `.refresh()`
+            is called. With 0, the information is queried at every access.
+            Main DICOM tags are cached until `.refresh()` or a modification of the resource.
+        """
+        super().__init__(id_, client, _lock_children, information_ttl)
+
     @property
     def main_dicom_tags(self) -> Dict[str, str]:
         if self._main_dicom_tags is None:
-            self._main_dicom_tags = self.get_main_information()['MainDicomTags']
+            self._main_dicom_tags = self._get_information()['MainDicomTags']
 
         return self._main_dicom_tags
 
+    @property
+    def information(self) -> Dict:
+        """Get the cached main information of the resource
+
+        The information is queried again when it is older than `information_ttl`.
+        Use `.get_main_information()` to always query Orthanc.
+        """
+        return self._get_information()
+
+    def refresh(self) -> None:
+        """Query again the resource information and drop the cached values"""
+        self._main_dicom_tags = None
+        self._set_information(self.get_main_information())
+
+    def _get_information(self) -> Dict:
+        if self._information is None or self._is_information_expired():
+            self._set_information(self.get_main_information())
+
+        return self._information
+
     @abc.abstractmethod
     def legacy_viewer_url(self):
         raise NotImplementedError
@@ -62,19 +221,11 @@ class Resource:
         try:
             return self.main_dicom_tags[tag]
         except KeyError:
-            raise errors.TagDoesNotExistError(f'{self} has no {tag} tag.')
-
-    def _make_response_format_params(self, simplify: bool = False, short: bool = False) -> Dict:
-        if simplify and not short:
-            params = {'simplify': True}
-        elif short and not simplify:
-            params = {'short': True}
-        elif simplify and short:
-            raise ValueError('simplify and short can\'t be both True.')
-        else:
-            params = {}
+            # The tag may have been requested along with the resource (see `requested_tags`)
+            if tag in self.requested_tags:
+                return self.requested_tags[tag]
 
-        return params
+            raise errors.TagDoesNotExistError(f'{self} has no {tag} tag.')
 
     def _download_file(
             self, url: str,
@@ -116,9 +267,3 @@ class Resource:
         finally:
             if not is_file_object:
                 filepath.close()
-
-    def __eq__(self, other: 'Resource') -> bool:
-        return self.id_ == other.id_
-
-    def __repr__(self):
-        return f'{self.__class__.__name__}({self.id_})'
@@ -26,14 +26,16 @@ class Series(Resource):
         """Get series instance"""
         if self._lock_children:
             if self._child_resources is None:
-                instances_ids = self.get_main_information()['Instances']
-                self._child_resources = [Instance(i, self.client, self._lock_children) for i in instances_ids]
+                instances_ids = self._get_information()['Instances']
+                self._child_resources = [
+                    Instance(i, self.client, self._lock_children, self.information_ttl) for i in instances_ids
+                ]
 
             return self._child_resources
 
-        instances_ids = self.get_main_information()['Instances']
+        instances_ids = self._get_information()['Instances']
 
-        return [Instance(i, self.client) for i in instances_ids]
+        return [Instance(i, self.client, information_ttl=self.information_ttl) for i in instances_ids]
 
     @property
     def uid(self) -> str:
@@ -69,12 +71,12 @@ class Series(Resource):
     @property
     def study_identifier(self) -> str:
         """Get the parent study identifier"""
-        return self.get_main_information()['ParentStudy']
+        return self._get_information()['ParentStudy']
 
     @property
     def parent_study(self) -> Study:
         from . import Study
-        return Study(self.study_identifier, self.client)
+        return Study(self.study_identifier, self.client, information_ttl=self.information_ttl)
 
     @property
     def parent_patient(self) -> Patient:
@@ -176,11 +178,11 @@ class Series(Resource):
 
     @property
     def is_stable(self) -> bool:
-        return self.get_main_information()['IsStable']
+        return self._get_information()['IsStable']
 
     @property
     def last_update(self) -> datetime:
-        last_updated_date_and_time = self.get_main_information()['LastUpdate'].split('T')
+        last_updated_date_and_time = self._get_information()['LastUpdate'].split('T')
         date = last_updated_date_and_time[0]
         time = last_updated_date_and_time[1]
 
@@ -188,13 +190,15 @@ class Series(Resource):
 
     @property
     def labels(self) -> List[str]:
-        return self.get_main_information()['Labels']
+        return self._get_information()['Labels']
 
     def add_label(self, label: str) -> None:
         self.client.put_series_id_labels_label(self.id_, label)
+        self._after_label_change()
 
     def remove_label(self, label):
         self.client.delete_series_id_labels_label(self.id_, label)
+        self._after_label_change()
 
     def anonymize(self, remove: List = None, replace: Dict = None, keep: List = None,
                   force: bool = False, keep_private_tags: bool = False,
@@ -277,6 +281,8 @@ class Series(Resource):
                 'Use `.anonymize_as_job` or increase client.timeout.'
             )
 
+        self._after_anonymization(keep_source)
+
         return Series(anonymous_series['ID'], self.client)
 
     def anonymize_as_job(self, remove: List = None, replace: Dict = None, keep: List = None,
@@ -357,6 +363,8 @@ class Series(Resource):
 
         job_info = self.client.post_series_id_anonymize(self.id_, data)
 
+        self._after_anonymization(keep_source)
+
         return Job(job_info['ID'], self.client)
 
     def modify(self, remove: List = None, replace: Dict = None, keep: List = None,
@@ -445,8 +453,7 @@ class Series(Resource):
                 'Use `.modify_as_job` or increase client.timeout.'
             )
 
-        # Reset cache since a main DICOM tag may have be changed
-        self._main_dicom_tags = None
+        self._after_modification()
 
         # if 'SeriesInstanceUID' is not affected, the modified_series['ID'] is the same as self.id_
         return Series(modified_series['ID'], self.client)
@@ -555,8 +562,7 @@ class Series(Resource):
 
         job_info = self.client.post_series_id_modify(self.id_, data)
 
-        # Reset cache since a main DICOM tag may have be changed
-        self._main_dicom_tags = None
+        self._after_modification()
 
         return Job(job_info['ID'], self.client)
 
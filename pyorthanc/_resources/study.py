@@ -84,31 +84,33 @@ class Study(Resource):
     @property
     def patient_identifier(self) -> str:
         """Get the Orthanc identifier of the parent patient"""
-        return self.get_main_information()['ParentPatient']
+        return self._get_information()['ParentPatient']
 
     @property
     def parent_patient(self) -> Patient:
         from . import Patient
-        return Patient(self.patient_identifier, self.client)
+        return Patient(self.patient_identifier, self.client, information_ttl=self.information_ttl)
 
     @property
     def patient_information(self) -> Dict:
         """Get patient information"""
-        return self.get_main_information()['PatientMainDicomTags']
+        return self._get_information()['PatientMainDicomTags']
 
     @property
     def series(self) -> List[Series]:
         """Get Study series"""
         if self._lock_children:
             if self._child_resources is None:
-                series_ids = self.get_main_information()['Series']
-                self._child_resources = [Series(i, self.client, self._lock_children) for i in series_ids]
+                series_ids = self._get_information()['Series']
+                self._child_resources = [
+                    Series(i, self.client, self._lock_children, self.information_ttl) for i in series_ids
+                ]
 
             return self._child_resources
 
-        series_ids = self.get_main_information()['Series']
+        series_ids = self._get_information()['Series']
 
-        return [Series(i, self.client) for i in series_ids]
+        return [Series(i, self.client, information_ttl=self.information_ttl) for i in series_ids]
 
     @property
     def accession_number(self) -> str:
@@ -128,11 +130,11 @@ class Study(Resource):
 
     @property
     def is_stable(self) -> bool:
-        return self.get_main_information()['IsStable']
+        return self._get_information()['IsStable']
 
     @property
     def last_update(self) -> datetime:
-        last_updated_date_and_time = self.get_main_information()['LastUpdate'].split('T')
+        last_updated_date_and_time = self._get_information()['LastUpdate'].split('T')
         date = last_updated_date_and_time[0]
         time = last_updated_date_and_time[1]
 
@@ -140,13 +142,15 @@ class Study(Resource):
 
     @property
     def labels(self) -> List[str]:
-        return self.get_main_information()['Labels']
+        return self._get_information()['Labels']
 
     def add_label(self, label: str) -> None:
         self.client.put_studies_id_labels_label(self.id_, label)
+        self._after_label_change()
 
     def remove_label(self, label):
         self.client.delete_studies_id_labels_label(self.id_, label)
+        self._after_label_change()
 
     def anonymize(self, remove: List = None, replace: Dict = None, keep: List = None,
                   force: bool = False, keep_private_tags: bool = False,
@@ -229,6 +233,8 @@ class Study(Resource):
                 'Use `.anonymize_as_job` or increase client.timeout.'
             )
 
+        self._after_anonymization(keep_source)
+
         return Study(anonymous_study['ID'], self.client)
 
     def anonymize_as_job(self, remove: List = None, replace: Dict = None, keep: List = None,
@@ -309,6 +315,8 @@ class Study(Resource):
 
         job_info = self.client.post_studies_id_anonymize(self.id_, data)
 
+        self._after_anonymization(keep_source)
+
         return Job(job_info['ID'], self.client)
 
     def modify(self, remove: List = None, replace: Dict = None, keep: List = None,
@@ -397,8 +405,7 @@ class Study(Resource):
                 'Use `.modify_as_job` or increase client.timeout.'
             )
 
-        # Reset cache since a main DICOM tag may have be changed
-        self._main_dicom_tags = None
+        self._after_modification()
 
         # if 'StudyInstanceUID' is not affected, the modified_study['ID'] is the same as self.id_
         return Study(modified_study['ID'], self.client)
@@ -507,8 +514,7 @@ class Study(Resource):
 
         job_info = self.client.post_studies_id_modify(self.id_, data)
 
-        # Reset cache since a main DICOM tag may have be changed
-        self._main_dicom_tags = None
+        self._after_modification()
 
         return Job(job_info['ID'], self.client)
 
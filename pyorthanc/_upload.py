@@ -1,22 +1,29 @@
 import glob
 import os
+import zipfile
 from io import BytesIO
 from pathlib import Path
-from typing import Dict, Generator, List, Tuple, Union
+from typing import Dict, Generator, List, Optional, Tuple, Union
 
 import httpx
 import pydicom
 from pydicom.errors import InvalidDicomError
 
 from pyorthanc import AsyncOrthanc, Instance, Orthanc
+from pyorthanc.capabilities import _is_version_at_least
 from pyorthanc.util import ensure_non_raw_response, to_orthanc_instance_id_from_ds
 
+# First Orthanc version that accepts zip archives on POST /instances
+ZIP_UPLOAD_VERSION = '1.8.2'
+UPLOAD_BATCH_MAX_BYTES = 64 * 1024 * 1024
+
 
 def upload(
         client: Orthanc,
         path_or_ds: Union[str, Path, pydicom.Dataset],
         recursive: bool = False,
-        check_before_upload: bool = False) -> List[Instance]:
+        check_before_upload: bool = False,
+        batch_size: Optional[int] = None) -> List[Instance]:
     """Upload a DICOM file or dataset to Orthanc synchronously
 
     Parameters
@@ -29,13 +36,23 @@ def upload(
         When `path_or_ds` is a directory, whether to upload recursively all the DICOM files in the directory
     check_before_upload : bool
          Verify if data is already in Orthanc before sending it. It verifies if a file is stored, there is no file comparison.
+    batch_size : Optional[int]
+        When `path_or_ds` is a directory, send the files by batches of `batch_size` files in zip archives
+        (one request per batch, e.g. 100) rather than one request per file. Only used with Orthanc >= 1.8.2.
+        If a batch is rejected (e.g. it holds an invalid file), its files are sent one by one.
     """
+    if batch_size is not None and batch_size < 1:
+        raise ValueError(f'batch_size must be at least 1, got {batch_size}.')
+
     client = ensure_non_raw_response(client)
 
     instances = []
 
     # If path_or_ds is a directory, upload all the DICOM files in the directory.
     if (isinstance(path_or_ds, str) or isinstance(path_or_ds, Path)) and os.path.isdir(path_or_ds):
+        use_zip_batches = batch_size is not None and _is_version_at_least(client, ZIP_UPLOAD_VERSION)
+        batch = []
+
         for dicom_bytes in _generate_dicom_bytes_from_directory(path_or_ds, recursive=recursive):
             if check_before_upload:
                 data_is_in_orthanc, instance = _is_data_already_in_orthanc(client, dicom_bytes)
@@ -45,10 +62,22 @@ def upload(
                     instances.append(instance)
                     continue
 
+            if use_zip_batches and not _is_gzip(dicom_bytes):
+                batch.append(dicom_bytes)
+
+                if len(batch) >= batch_size or sum(len(b) for b in batch) >= UPLOAD_BATCH_MAX_BYTES:
+                    instances += _upload_zip_batch(client, batch)
+                    batch = []
+
+                continue
+
             result = client.post_instances(dicom_bytes)
             instance = Instance(result['ID'], client)
             instances.append(instance)
 
+        if len(batch) > 0:
+            instances += _upload_zip_batch(client, batch)
+
     # If path_or_ds is a DICOM file, zip file or a pydicom Dataset, upload it.
     else:
         dicom_bytes = _prepare_data_from_ds_or_file(path_or_ds)
@@ -87,6 +116,27 @@ async def async_upload(client: AsyncOrthanc, path_or_ds: Union[str, Path, pydico
     return await client.post_instances(dicom_bytes)
 
 
+def _upload_zip_batch(client: Orthanc, batch: List[bytes]) -> List[Instance]:
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as zip_file:
+        for index, dicom_bytes in enumerate(batch):
+            zip_file.writestr(f'{index}.dcm', dicom_bytes)
+
+    try:
+        result = client.post_instances(buffer.getvalue())
+    except httpx.HTTPError:
+        # Sent one by one, so only the bad files fail (the stored ones are answered with 'AlreadyStored')
+        return [Instance(client.post_instances(dicom_bytes)['ID'], client) for dicom_bytes in batch]
+
+    results = result if isinstance(result, list) else [result]
+
+    return [Instance(r['ID'], client) for r in results if isinstance(r, dict) and 'ID' in r]
+
+
+def _is_gzip(data: bytes) -> bool:
+    return data[:2] == b'\x1f\x8b'
+
+
 def _prepare_data_from_ds_or_file(path_or_ds: Union[str, Path, pydicom.Dataset]) -> bytes:
     # Convert dataset to bytes if needed
     if isinstance(path_or_ds, str) or isinstance(path_or_ds, Path):
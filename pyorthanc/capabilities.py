@@ -0,0 +1,172 @@
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from .async_client import AsyncOrthanc
+from .client import Orthanc
+
+# Version of Orthanc reported by development builds
+MAINLINE_VERSION = 'mainline'
+
+_CAPABILITIES: Dict[str, 'Capabilities'] = {}  # Server URL -> capabilities
+
+
+class Capabilities:
+    """Features supported by an Orthanc server
+
+    Built from the /system route of the server, and the /plugins route if the plugins were requested.
+    Use `get_capabilities()` (or `async_get_capabilities()`) to get the cached capabilities of a server.
+    """
+
+    def __init__(self,
+                 system: Dict,
+                 plugins: Optional[List[str]] = None,
+                 is_http_compression_enabled: bool = False) -> None:
+        """Constructor
+
+        Parameters
+        ----------
+        system
+            Answer of the /system route.
+        plugins
+            Identifiers of the installed plugins (answer of the /plugins route), None if not queried.
+        is_http_compression_enabled
+            Whether the server compressed its answer to the /system route.
+        """
+        self.system = system
+        self.version: str = system.get('Version', '')
+        self.api_version: int = system.get('ApiVersion', 0)
+        self.database_backend_plugin = system.get('DatabaseBackendPlugin')
+
+        capabilities = system.get('Capabilities', {})
+        self.has_extended_find: bool = capabilities.get('HasExtendedFind', False)
+        self.has_extended_changes: bool = capabilities.get('HasExtendedChanges', False)
+
+        self.plugins = plugins
+        self.is_http_compression_enabled = is_http_compression_enabled
+
+    def is_version_at_least(self, version: str) -> bool:
+        """Check if the Orthanc version of the server is at least the provided version
+
+        Parameters
+        ----------
+        version
+            Version formatted like '1.12.5'.
+
+        Returns
+        -------
+        bool
+            True if the server version is equal or above the provided version (always True for mainline builds).
+        """
+        if self.version == MAINLINE_VERSION:
+            return True
+
+        return _parse_version(self.version) >= _parse_version(version)
+
+    def has_plugin(self, plugin: str) -> bool:
+        """Check if a plugin is installed (e.g. 'dicom-web', 'transfers')"""
+        if self.plugins is None:
+            raise ValueError('The plugins were not queried, use get_capabilities(client, with_plugins=True).')
+
+        return plugin in self.plugins
+
+    def __repr__(self) -> str:
+        return (
+            f'Capabilities(version={self.version}, api_version={self.api_version}, '
+            f'has_extended_find={self.has_extended_find}, has_extended_changes={self.has_extended_changes})'
+        )
+
+
+def get_capabilities(client: Orthanc, refresh: bool = False, with_plugins: bool = False) -> Capabilities:
+    """Get the capabilities of the Orthanc server
+
+    The capabilities are queried once per server URL and then cached.
+
+    Parameters
+    ----------
+    client
+        Orthanc client.
+    refresh
+        Query the capabilities again, e.g. after the server has been upgraded.
+    with_plugins
+        Also query the installed plugins (/plugins route), needed by `Capabilities.has_plugin()`.
+
+    Returns
+    -------
+    Capabilities
+        Features supported by the server.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    client = pyorthanc.Orthanc('http://localhost:8042', 'orthanc', 'orthanc')
+    capabilities = pyorthanc.get_capabilities(client)
+
+    if capabilities.has_extended_find:
+        ...
+
+    if pyorthanc.get_capabilities(client, with_plugins=True).has_plugin('dicom-web'):
+        ...
+    ```
+    """
+    # Raw requests, since the client may be configured to return raw responses.
+    if refresh or client.url not in _CAPABILITIES:
+        _CAPABILITIES[client.url] = _make_capabilities(_check_response(client.get(f'{client.url}/system')))
+
+    capabilities = _CAPABILITIES[client.url]
+    if with_plugins and capabilities.plugins is None:
+        capabilities.plugins = _check_response(client.get(f'{client.url}/plugins')).json()
+
+    return capabilities
+
+
+async def async_get_capabilities(async_client: AsyncOrthanc,
+                                 refresh: bool = False,
+                                 with_plugins: bool = False) -> Capabilities:
+    """Get the capabilities of the Orthanc server, with an asynchronous client
+
+    See `get_capabilities()`. The cache is shared with `get_capabilities()`.
+    """
+    if refresh or async_client.url not in _CAPABILITIES:
+        system_response = _check_response(await async_client.get(f'{async_client.url}/system'))
+        _CAPABILITIES[async_client.url] = _make_capabilities(system_response)
+
+    capabilities = _CAPABILITIES[async_client.url]
+    if with_plugins and capabilities.plugins is None:
+        capabilities.plugins = _check_response(await async_client.get(f'{async_client.url}/plugins')).json()
+
+    return capabilities
+
+
+def _is_version_at_least(client: Orthanc, version: str) -> bool:
+    """Check the version of the server, False if the capabilities cannot be queried
+
+    For the optimizations that have a fallback for older servers, which is then used
+    when e.g. the credentials do not allow to read the /system route.
+    """
+    try:
+        return get_capabilities(client).is_version_at_least(version)
+    except httpx.HTTPError:
+        return False
+
+
+def _make_capabilities(system_response: httpx.Response) -> Capabilities:
+    content_encoding = system_response.headers.get('content-encoding', '')
+
+    return Capabilities(
+        system=system_response.json(),
+        is_http_compression_enabled=content_encoding in ['gzip', 'deflate']
+    )
+
+
+def _check_response(response: httpx.Response) -> httpx.Response:
+    if not 200 <= response.status_code < 300:
+        raise httpx.HTTPError(f'HTTP code: {response.status_code}, with content: {response.text}')
+
+    return response
+
+
+def _parse_version(version: str) -> Tuple[int, ...]:
+    return tuple(int(number) for number in version.split('.') if number.isdigit())
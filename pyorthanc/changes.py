@@ -0,0 +1,332 @@
+"""Consumers of the Orthanc changes log (`/changes`)
+
+The feeds poll the changes log and deliver the changes in batches, e.g. to route the new
+stable studies to a modality. The position in the log can be persisted to a checkpoint file,
+so that a restarted consumer resumes where it stopped.
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from . import util
+from .async_client import AsyncOrthanc
+from .capabilities import async_get_capabilities, get_capabilities
+from .client import Orthanc
+
+DEFAULT_CHANGES_LIMIT = 100
+DEFAULT_MIN_INTERVAL = 0.5
+DEFAULT_MAX_INTERVAL = 30.
+
+
+class ChangesFeed:
+    """Iterate over the batches of changes of an Orthanc server
+
+    The log is polled as fast as new changes come. When the end of the log is reached,
+    the polling interval is doubled on each empty poll (from `min_interval` to `max_interval`),
+    and reset as soon as a change comes.
+
+    When iterating, a batch is considered processed when the next batch is requested,
+    the checkpoint is then written. `run()` delivers the batches to a pool of handlers.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    client = pyorthanc.Orthanc('http://localhost:8042', 'orthanc', 'orthanc')
+    feed = pyorthanc.ChangesFeed(client, change_types=['StableStudy'], checkpoint_path='changes.checkpoint')
+
+    for changes in feed:
+        for change in changes:
+            client.post_modalities_id_store('my_modality', json={'Resources': [change['ID']]})
+    ```
+    """
+
+    def __init__(self,
+                 client: Orthanc,
+                 change_types: Optional[List[str]] = None,
+                 since: Optional[int] = None,
+                 checkpoint_path: Optional[str] = None,
+                 limit: int = DEFAULT_CHANGES_LIMIT,
+                 min_interval: float = DEFAULT_MIN_INTERVAL,
+                 max_interval: float = DEFAULT_MAX_INTERVAL,
+                 stop_when_done: bool = False) -> None:
+        """Constructor
+
+        Parameters
+        ----------
+        client
+            Orthanc client.
+        change_types
+            Types of the changes to deliver (e.g. ['NewInstance', 'StableStudy']), all changes if None.
+            The changes are filtered by Orthanc if the database backend supports the extended changes,
+            on the client otherwise.
+        since
+            Sequence number after which the changes are delivered. If None, the feed resumes from the
+            checkpoint file, or starts from the current end of the changes log.
+        checkpoint_path
+            Path of the file where the sequence number of the last processed change is written.
+        limit
+            Maximum number of changes per request.
+        min_interval
+            Polling interval (in seconds) when the end of the log has just been reached.
+        max_interval
+            Maximum polling interval (in seconds).
+        stop_when_done
+            Stop when the end of the log is reached, rather than waiting for new changes.
+        """
+        # In this class, client that return raw responses are not supported.
+        self.client = util.ensure_non_raw_response(client)
+        self.change_types = change_types
+        self.checkpoint_path = checkpoint_path
+        self.limit = limit
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.stop_when_done = stop_when_done
+
+        self.since = since if since is not None else _read_checkpoint(checkpoint_path)
+        self._is_stopped = False
+
+    def __iter__(self) -> Iterator[List[Dict]]:
+        for changes, last in self._poll():
+            if len(changes) > 0:
+                yield changes
+
+            self._save_checkpoint(last)
+
+    def run(self, handler: Callable[[List[Dict]], None], max_workers: int = 1) -> None:
+        """Deliver the batches of changes to a handler, until `stop()` is called (or the end of the log)
+
+        Parameters
+        ----------
+        handler
+            Function called with each batch of changes.
+        max_workers
+            Number of batches handled concurrently (in a thread pool). The checkpoint only moves past
+            a batch when this batch and all the previous batches have been handled.
+        """
+        if max_workers < 1:
+            raise ValueError(f'max_workers must be at least 1, got {max_workers}.')
+
+        pending = deque()  # (Future or None, last) in the order of the log
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                for changes, last in self._poll():
+                    pending.append((executor.submit(handler, changes) if changes else None, last))
+
+                    # Bounds the number of batches in memory
+                    if sum(future is not None for future, _ in pending) >= max_workers:
+                        pending[0][0].result()
+
+                    while pending and (pending[0][0] is None or pending[0][0].done()):
+                        self._complete(*pending.popleft())
+            finally:
+                while pending:
+                    self._complete(*pending.popleft())
+
+    def stop(self) -> None:
+        """Stop the iteration (or `run()`) after the current batch"""
+        self._is_stopped = True
+
+    def _poll(self) -> Iterator[Tuple[List[Dict], int]]:
+        """Yield the batches of changes (possibly empty) with the sequence number that follows them"""
+        if self.since is None:
+            self.since = self.client.get_changes(params={'last': True})['Last']
+
+        is_filtered_by_orthanc = self.change_types is not None and get_capabilities(self.client).has_extended_changes
+        interval = self.min_interval
+        position = self.since  # The checkpoint may lag behind, while batches are being handled
+        self._is_stopped = False
+
+        while not self._is_stopped:
+            response = self.client.get_changes(
+                params=_make_params(position, self.limit, self.change_types, is_filtered_by_orthanc)
+            )
+            position = response['Last']
+            changes = _filter_changes(response['Changes'], self.change_types)
+
+            if len(changes) > 0:
+                interval = self.min_interval
+
+            yield changes, position
+
+            if response['Done']:
+                if self.stop_when_done:
+                    return
+
+                time.sleep(interval)
+                interval = min(interval * 2, self.max_interval)
+
+    def _complete(self, future, last: int) -> None:
+        if future is not None:
+            future.result()  # Raises the errors of the handler, the checkpoint is then not moved
+
+        self._save_checkpoint(last)
+
+    def _save_checkpoint(self, last: int) -> None:
+        if last != self.since:
+            self.since = last
+            _write_checkpoint(self.checkpoint_path, last)
+
+
+class AsyncChangesFeed:
+    """Iterate over the batches of changes of an Orthanc server, with an asynchronous client
+
+    See `ChangesFeed`.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    async_client = pyorthanc.AsyncOrthanc('http://localhost:8042', 'orthanc', 'orthanc')
+    feed = pyorthanc.AsyncChangesFeed(async_client, change_types=['StableStudy'])
+
+    async for changes in feed:
+        ...
+    ```
+    """
+
+    def __init__(self,
+                 async_client: AsyncOrthanc,
+                 change_types: Optional[List[str]] = None,
+                 since: Optional[int] = None,
+                 checkpoint_path: Optional[str] = None,
+                 limit: int = DEFAULT_CHANGES_LIMIT,
+                 min_interval: float = DEFAULT_MIN_INTERVAL,
+                 max_interval: float = DEFAULT_MAX_INTERVAL,
+                 stop_when_done: bool = False) -> None:
+        """Constructor, see `ChangesFeed`"""
+        # In this class, client that return raw responses are not supported.
+        self.async_client = util.ensure_non_raw_response(async_client)
+        self.change_types = change_types
+        self.checkpoint_path = checkpoint_path
+        self.limit = limit
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.stop_when_done = stop_when_done
+
+        self.since = since if since is not None else _read_checkpoint(checkpoint_path)
+        self._is_stopped = False
+
+    async def __aiter__(self) -> AsyncIterator[List[Dict]]:
+        async for changes, last in self._poll():
+            if len(changes) > 0:
+                yield changes
+
+            self._save_checkpoint(last)
+
+    async def run(self, handler: Callable[[List[Dict]], Awaitable], max_concurrency: int = 1) -> None:
+        """Deliver the batches of changes to a coroutine function, until `stop()` is called (or the end of the log)
+
+        Parameters
+        ----------
+        handler
+            Coroutine function called with each batch of changes.
+        max_concurrency
+            Number of batches handled concurrently. The checkpoint only moves past
+            a batch when this batch and all the previous batches have been handled.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f'max_concurrency must be at least 1, got {max_concurrency}.')
+
+        pending = deque()  # (Task or None, last) in the order of the log
+
+        try:
+            async for changes, last in self._poll():
+                pending.append((asyncio.create_task(handler(changes)) if changes else None, last))
+
+                # Bounds the number of batches in memory
+                if sum(task is not None for task, _ in pending) >= max_concurrency:
+                    await pending[0][0]
+
+                while pending and (pending[0][0] is None or pending[0][0].done()):
+                    await self._complete(*pending.popleft())
+        finally:
+            while pending:
+                await self._complete(*pending.popleft())
+
+    def stop(self) -> None:
+        """Stop the iteration (or `run()`) after the current batch"""
+        self._is_stopped = True
+
+    async def _poll(self) -> AsyncIterator[Tuple[List[Dict], int]]:
+        if self.since is None:
+            self.since = (await self.async_client.get_changes(params={'last': True}))['Last']
+
+        is_filtered_by_orthanc = (
+            self.change_types is not None and (await async_get_capabilities(self.async_client)).has_extended_changes
+        )
+        interval = self.min_interval
+        position = self.since  # The checkpoint may lag behind, while batches are being handled
+        self._is_stopped = False
+
+        while not self._is_stopped:
+            response = await self.async_client.get_changes(
+                params=_make_params(position, self.limit, self.change_types, is_filtered_by_orthanc)
+            )
+            position = response['Last']
+            changes = _filter_changes(response['Changes'], self.change_types)
+
+            if len(changes) > 0:
+                interval = self.min_interval
+
+            yield changes, position
+
+            if response['Done']:
+                if self.stop_when_done:
+                    return
+
+                await asyncio.sleep(interval)
+                interval = min(interval * 2, self.max_interval)
+
+    async def _complete(self, task: Optional[asyncio.Task], last: int) -> None:
+        if task is not None:
+            await task  # Raises the errors of the handler, the checkpoint is then not moved
+
+        self._save_checkpoint(last)
+
+    def _save_checkpoint(self, last: int) -> None:
+        if last != self.since:
+            self.since = last
+            _write_checkpoint(self.checkpoint_path, last)
+
+
+def _make_params(since: int, limit: int, change_types: Optional[List[str]], is_filtered_by_orthanc: bool) -> Dict:
+    params = {'since': since, 'limit': limit}
+
+    if is_filtered_by_orthanc:
+        params['type'] = ';'.join(change_types)
+
+    return params
+
+
+def _filter_changes(changes: List[Dict], change_types: Optional[List[str]]) -> List[Dict]:
+    if change_types is None:
+        return changes
+
+    return [change for change in changes if change['ChangeType'] in change_types]
+
+
+def _read_checkpoint(checkpoint_path: Optional[str]) -> Optional[int]:
+    if checkpoint_path is None or not os.path.exists(checkpoint_path):
+        return None
+
+    with open(checkpoint_path) as file:
+        return int(file.read().strip())
+
+
+def _write_checkpoint(checkpoint_path: Optional[str], last: int) -> None:
+    if checkpoint_path is None:
+        return
+
+    # Written to a temporary file first, so that an interrupted write does not corrupt the checkpoint
+    temporary_path = f'{checkpoint_path}.tmp'
+    with open(temporary_path, 'w') as file:
+        file.write(str(last))
+
+    os.replace(temporary_path, checkpoint_path)
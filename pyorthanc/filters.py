@@ -0,0 +1,314 @@
+"""Declarative filters for `pyorthanc.find()`
+
+Unlike lambdas, these filters can be translated into /tools/find queries,
+so Orthanc evaluates them and `find()` only fetches the matching part of the tree.
+Filters that cannot be evaluated by Orthanc (e.g. on a tag that is not a main DICOM tag
+of the level) are evaluated on the client, like lambdas. Orthanc matches some values more loosely
+than the filters (e.g. case-insensitively, or '*' in an `Equals` value as a wildcard), so the filters
+evaluated by Orthanc are checked again on the client, and the results do not depend on where
+a filter is evaluated.
+
+On the client, the tag filters read the main DICOM tags of the resources (and the tags requested
+with `requested_tags`), which do not send any request. The other tags of an instance are read from
+its simplified tags, which sends one request per instance: prefer main DICOM tags in the filters.
+
+Examples
+--------
+```python
+from datetime import date
+
+import pyorthanc
+from pyorthanc import filters
+
+client = pyorthanc.Orthanc('http://localhost:8042', 'orthanc', 'orthanc')
+patients = pyorthanc.find(
+    client,
+    study_filter=filters.DateRange('StudyDate', date(2020, 1, 1), date(2020, 12, 31)),
+    series_filter=filters.InSet('Modality', ['CT', 'MR']) & filters.HasLabels(['to_export'])
+)
+```
+"""
+import re
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from . import errors
+from ._resources.instance import Instance
+from ._resources.resource import Resource
+
+# Main DICOM tags of each level (Orthanc defaults), on which Orthanc can evaluate a query from its database.
+MAIN_DICOM_TAGS = {
+    'Patient': [
+        'PatientName', 'PatientID', 'PatientBirthDate', 'PatientSex', 'OtherPatientIDs'
+    ],
+    'Study': [
+        'StudyDate', 'StudyTime', 'StudyID', 'StudyDescription', 'AccessionNumber', 'StudyInstanceUID',
+        'RequestedProcedureDescription', 'InstitutionName', 'RequestingPhysician', 'ReferringPhysicianName'
+    ],
+    'Series': [
+        'SeriesDate', 'SeriesTime', 'Modality', 'Manufacturer', 'StationName', 'SeriesDescription',
+        'BodyPartExamined', 'SequenceName', 'ProtocolName', 'SeriesNumber', 'CardiacNumberOfImages',
+        'ImagesInAcquisition', 'NumberOfTemporalPositions', 'NumberOfSlices', 'NumberOfTimeSlices',
+        'SeriesInstanceUID', 'ImageOrientationPatient', 'SeriesType', 'OperatorsName',
+        'PerformedProcedureStepDescription', 'AcquisitionDeviceProcessingDescription', 'ContrastBolusAgent'
+    ],
+    'Instance': [
+        'InstanceCreationDate', 'InstanceCreationTime', 'AcquisitionNumber', 'ImageIndex', 'InstanceNumber',
+        'NumberOfFrames', 'TemporalPositionIdentifier', 'SOPInstanceUID', 'ImagePositionPatient',
+        'ImageComments', 'ImageOrientationPatient'
+    ],
+}
+
+
+class Filter:
+    """Base class of the declarative filters
+
+    A filter is callable on a resource (like the lambdas accepted by `find()`),
+    and can be combined with `&`.
+    """
+
+    def __call__(self, resource: Resource) -> bool:
+        raise NotImplementedError
+
+    def __and__(self, other: Union['Filter', Callable]) -> 'And':
+        return And(self, other)
+
+    def _to_query(self, level: str) -> Optional[Dict[str, str]]:
+        """Translate the filter into a /tools/find query at the level, None if Orthanc cannot evaluate it"""
+        return None
+
+
+class _TagFilter(Filter):
+    def __init__(self, tag: str) -> None:
+        self.tag = tag
+
+    def __call__(self, resource: Resource) -> bool:
+        try:
+            value = _get_tag_value(resource, self.tag)
+        except errors.TagDoesNotExistError:
+            return False
+
+        return value is not None and self._match(value)
+
+    def _match(self, value: Any) -> bool:
+        raise NotImplementedError
+
+    def _make_query_value(self) -> str:
+        raise NotImplementedError
+
+    def _to_query(self, level: str) -> Optional[Dict[str, str]]:
+        if self.tag not in MAIN_DICOM_TAGS[level]:
+            return None
+
+        return {self.tag: self._make_query_value()}
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.tag!r}, {self._make_query_value()!r})'
+
+
+class Equals(_TagFilter):
+    """Keep the resources whose tag is equal to the value
+
+    Examples
+    --------
+    ```python
+    filters.Equals('Modality', 'CT')
+    ```
+    """
+
+    def __init__(self, tag: str, value: str) -> None:
+        super().__init__(tag)
+        self.value = value
+
+    def _match(self, value: Any) -> bool:
+        return value == self.value
+
+    def _make_query_value(self) -> str:
+        return self.value
+
+
+class Wildcard(_TagFilter):
+    """Keep the resources whose tag matches the pattern ('*' matches any sequence, '?' matches one character)
+
+    Examples
+    --------
+    ```python
+    filters.Wildcard('PatientName', 'DOE^*')
+    ```
+    """
+
+    def __init__(self, tag: str, pattern: str) -> None:
+        super().__init__(tag)
+        self.pattern = pattern
+        self._regex = re.compile(
+            ''.join('.*' if c == '*' else '.' if c == '?' else re.escape(c) for c in pattern), re.DOTALL
+        )
+
+    def _match(self, value: Any) -> bool:
+        return self._regex.fullmatch(str(value)) is not None
+
+    def _make_query_value(self) -> str:
+        return self.pattern
+
+
+class DateRange(_TagFilter):
+    """Keep the resources whose date tag is in the range (bounds included)
+
+    Examples
+    --------
+    ```python
+    filters.DateRange('StudyDate', start=date(2020, 1, 1))  # Since 2020
+    filters.DateRange('StudyDate', date(2020, 1, 1), date(2020, 12, 31))
+    ```
+    """
+
+    def __init__(self, tag: str, start: Optional[date] = None, end: Optional[date] = None) -> None:
+        if start is None and end is None:
+            raise ValueError('At least one of start and end must be provided.')
+
+        super().__init__(tag)
+        self.start = start
+        self.end = end
+
+    def _match(self, value: Any) -> bool:
+        value = str(value)[:8]  # Dates are formatted as YYYYMMDD, like the DICOM DA value representation
+
+        if self.start is not None and value < self.start.strftime('%Y%m%d'):
+            return False
+
+        return self.end is None or value <= self.end.strftime('%Y%m%d')
+
+    def _make_query_value(self) -> str:
+        start = '' if self.start is None else self.start.strftime('%Y%m%d')
+        end = '' if self.end is None else self.end.strftime('%Y%m%d')
+
+        return f'{start}-{end}'
+
+
+class InSet(_TagFilter):
+    """Keep the resources whose tag is one of the values
+
+    Examples
+    --------
+    ```python
+    filters.InSet('Modality', ['CT', 'MR'])
+    ```
+    """
+
+    def __init__(self, tag: str, values: List[str]) -> None:
+        super().__init__(tag)
+        self.values = list(values)
+
+    def _match(self, value: Any) -> bool:
+        return value in self.values
+
+    def _make_query_value(self) -> str:
+        return '\\'.join(self.values)  # DICOM list matching
+
+
+class HasLabels(Filter):
+    """Keep the resources that have the labels
+
+    Parameters
+    ----------
+    labels
+        Labels to look for.
+    constraint
+        'All' (the resource has all the labels), 'Any' (the resource has at least one of the labels)
+        or 'None' (the resource has none of the labels).
+    """
+
+    def __init__(self, labels: Union[List[str], str], constraint: str = 'All') -> None:
+        if constraint not in ['All', 'Any', 'None']:
+            raise ValueError(f"constraint should be one of ['All', 'Any', 'None'], got {constraint} instead.")
+
+        self.labels = [labels] if isinstance(labels, str) else list(labels)
+        self.constraint = constraint
+
+    def __call__(self, resource: Resource) -> bool:
+        resource_labels = resource.labels
+
+        if self.constraint == 'All':
+            return all(label in resource_labels for label in self.labels)
+        if self.constraint == 'Any':
+            return any(label in resource_labels for label in self.labels)
+
+        return not any(label in resource_labels for label in self.labels)
+
+    def __repr__(self) -> str:
+        return f'HasLabels({self.labels!r}, {self.constraint!r})'
+
+
+class And(Filter):
+    """Keep the resources that pass all the filters (also built with `filter_1 & filter_2`)"""
+
+    def __init__(self, *filters: Union[Filter, Callable]) -> None:
+        self.filters = []
+        for resource_filter in filters:
+            # Flattening nested And, so that each part can be pushed down to Orthanc
+            self.filters += resource_filter.filters if isinstance(resource_filter, And) else [resource_filter]
+
+    def __call__(self, resource: Resource) -> bool:
+        return all(resource_filter(resource) for resource_filter in self.filters)
+
+    def __repr__(self) -> str:
+        return ' & '.join(repr(f) for f in self.filters)
+
+
+def split_filter(resource_filter: Optional[Callable],
+                 level: str) -> Tuple[Dict[str, str], Optional[HasLabels], Optional[Callable]]:
+    """Split a filter into the parts evaluated by Orthanc and the part evaluated on the client
+
+    Parameters
+    ----------
+    resource_filter
+        Filter of a level of `find()` (a `Filter`, a callable or None).
+    level
+        Level of the filter ['Patient', 'Study', 'Series', 'Instance'].
+
+    Returns
+    -------
+    Tuple[Dict[str, str], Optional[HasLabels], Optional[Callable]]
+        The /tools/find query, the labels filter (evaluated by Orthanc) and the leftover filter (None if nothing is left).
+        The tag filters of the query are also in the leftover filter, since Orthanc matches them more loosely.
+    """
+    if resource_filter is None:
+        return {}, None, None
+
+    query = {}
+    labels_filter = None
+    leftovers = []
+
+    for part in resource_filter.filters if isinstance(resource_filter, And) else [resource_filter]:
+        part_query = part._to_query(level) if isinstance(part, Filter) else None
+
+        if part_query is not None and not set(part_query).intersection(query):
+            query.update(part_query)
+            leftovers.append(part)  # Orthanc narrows the resources, the filter keeps its own semantics
+        elif isinstance(part, HasLabels) and labels_filter is None:
+            labels_filter = part
+        else:
+            leftovers.append(part)
+
+    if len(leftovers) == 0:
+        leftover = None
+    elif len(leftovers) == 1:
+        leftover = leftovers[0]
+    else:
+        leftover = And(*leftovers)
+
+    return query, labels_filter, leftover
+
+
+def _get_tag_value(resource: Resource, tag: str) -> Any:
+    if tag in resource.main_dicom_tags:
+        return resource.main_dicom_tags[tag]
+
+    if tag in resource.requested_tags:
+        return resource.requested_tags[tag]
+
+    if isinstance(resource, Instance):
+        return resource.simplified_tags.get(tag)  # Not a main DICOM tag: one request per instance
+
+    # Studies also report the main DICOM tags of their patient
+    return resource.information.get('PatientMainDicomTags', {}).get(tag)
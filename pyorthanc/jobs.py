@@ -1,3 +1,4 @@
+import asyncio
 import time
 from datetime import datetime
 from enum import Enum
@@ -5,6 +6,7 @@ from typing import Dict, Optional
 
 from . import util
 from ._orthanc_sdk_enums import ErrorCode
+from .async_client import AsyncOrthanc
 from .client import Orthanc
 
 
@@ -112,3 +114,64 @@ class Job:
 
     def get_information(self):
         return self.client.get_jobs_id(self.id_)
+
+
+class AsyncJob:
+    """Job class to follow a Job in Orthanc with an asynchronous client
+
+    Properties are awaitable, e.g. `await job.state`.
+    """
+
+    def __init__(self, id_: str, client: AsyncOrthanc):
+        client = util.ensure_non_raw_response(client)
+
+        self.id_ = id_
+        self.client = client
+
+    @property
+    def state(self):
+        return self._get_state()
+
+    async def _get_state(self) -> State:
+        state = (await self.get_information())['State']
+
+        return State(state)
+
+    @property
+    def content(self):
+        return self._get_field('Content')
+
+    @property
+    def type(self):
+        return self._get_field('Type')
+
+    @property
+    def priority(self):
+        return self._get_field('Priority', int)
+
+    @property
+    def progress(self):
+        return self._get_field('Progress', int)
+
+    @property
+    def error(self):
+        return self._get_field('ErrorCode', ErrorCode)
+
+    async def _get_field(self, field: str, converter=None):
+        value = (await self.get_information())[field]
+
+        return value if converter is None else converter(value)
+
+    async def wait_until_completion(self, time_interval: int = 2) -> None:
+        """Stop execution until job is not Pending/Running
+
+        Parameters
+        ----------
+        time_interval
+            Time interval to check the job status, default 2s.
+        """
+        while (await self.state) in [State.pending, State.running]:
+            await asyncio.sleep(time_interval)
+
+    async def get_information(self):
+        return await self.client.get_jobs_id(self.id_)
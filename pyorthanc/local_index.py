@@ -0,0 +1,441 @@
+"""Local SQLite index of the resources of an Orthanc server
+
+The index holds the main information (main DICOM tags, labels, parents) of every
+patient/study/series/instance. It is bootstrapped with paged expanded listings,
+then kept up to date from the changes log of Orthanc (`/changes`), so repeated queries
+run locally rather than on the server.
+"""
+import json
+import sqlite3
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from . import util
+from ._filtering import _list_level
+from ._find import DEFAULT_RESOURCES_LIMIT, _make_resource, _validate_labels_constraint, _validate_level, \
+    query_orthanc
+from ._resources.instance import Instance
+from ._resources.patient import Patient
+from ._resources.resource import Resource
+from ._resources.series import Series
+from ._resources.study import Study
+from .capabilities import _check_response
+from .client import Orthanc
+from .filters import MAIN_DICOM_TAGS
+
+LEVELS = ['Patient', 'Study', 'Series', 'Instance']
+ROUTES = {'Patient': 'patients', 'Study': 'studies', 'Series': 'series', 'Instance': 'instances'}
+PARENT_KEYS = {'Study': 'ParentPatient', 'Series': 'ParentStudy', 'Instance': 'ParentSeries'}
+CHILDREN_KEYS = {'Patient': 'Studies', 'Study': 'Series', 'Series': 'Instances'}
+STATISTICS_KEYS = {
+    'Patient': 'CountPatients', 'Study': 'CountStudies', 'Series': 'CountSeries', 'Instance': 'CountInstances'
+}
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS resources (
+    id TEXT PRIMARY KEY,
+    level TEXT NOT NULL,
+    parent_id TEXT,
+    information TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resources_parent_id ON resources (parent_id);
+CREATE INDEX IF NOT EXISTS resources_level ON resources (level);
+CREATE TABLE IF NOT EXISTS tags (
+    id TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (id, tag)
+);
+CREATE INDEX IF NOT EXISTS tags_tag_value ON tags (tag, value);
+CREATE TABLE IF NOT EXISTS labels (
+    id TEXT NOT NULL,
+    label TEXT NOT NULL,
+    PRIMARY KEY (id, label)
+);
+CREATE INDEX IF NOT EXISTS labels_label ON labels (label);
+CREATE TABLE IF NOT EXISTS checkpoint (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+'''
+
+
+class LocalIndex:
+    """Local SQLite index of the resources of an Orthanc server
+
+    The first call to `synchronize()` lists all the resources of the server (a few paged requests per level)
+    and records the position in the changes log. The following calls only apply the new changes.
+    The queries (`find_patients()`, ..., `query()`) run on the local index, and fall back to
+    /tools/find when the query involves tags that are not main DICOM tags.
+
+    Notes
+    -----
+    Label changes are not recorded in the Orthanc changes log. The labels of a resource are updated
+    when the resource itself changes (e.g. new child instance) or with `reindex()`.
+    Orthanc also removes the changes of the deleted resources from the changes log. After applying the
+    changes, `synchronize()` compares the number of resources of each level with /statistics, and lists
+    the identifiers of the levels that differ to drop the deleted resources. A deletion that is offset by
+    a new resource not yet indexed is caught by the next `synchronize()`.
+    The child lists of the returned resources (e.g. `study.series`) are those of the index.
+    The tag matching is case-sensitive.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    client = pyorthanc.Orthanc('http://localhost:8042', 'orthanc', 'orthanc')
+
+    with pyorthanc.LocalIndex(client, 'orthanc_index.sqlite') as index:
+        index.synchronize()
+        series = index.find_series(query={'Modality': 'CT', 'StudyDate': '20200101-20201231'})
+    ```
+    """
+
+    def __init__(self, client: Orthanc, path: str = ':memory:', changes_limit: int = DEFAULT_RESOURCES_LIMIT) -> None:
+        """Constructor
+
+        Parameters
+        ----------
+        client
+            Orthanc client.
+        path
+            Path of the SQLite file (created if it does not exist). Defaults to an in-memory database.
+        changes_limit
+            Number of changes fetched per request during the synchronization.
+        """
+        # In this class, client that return raw responses are not supported.
+        self.client = util.ensure_non_raw_response(client)
+        self.path = path
+        self.changes_limit = changes_limit
+
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(SCHEMA)
+
+    def __enter__(self) -> 'LocalIndex':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the SQLite database"""
+        self._connection.close()
+
+    @property
+    def last_change(self) -> Optional[int]:
+        """Sequence number of the last change applied to the index, None if the index has not been bootstrapped"""
+        row = self._connection.execute("SELECT value FROM checkpoint WHERE key = 'last_change'").fetchone()
+
+        return None if row is None else row[0]
+
+    def synchronize(self) -> int:
+        """Bring the index up to date with the Orthanc server
+
+        Returns
+        -------
+        int
+            Number of changes applied and of deleted resources found without a change
+            (or number of indexed resources when the index is bootstrapped).
+        """
+        if self.last_change is None:
+            return self.reindex()
+
+        nbr_of_changes = self._apply_changes()
+
+        return nbr_of_changes + self._delete_missing_resources()
+
+    def reindex(self) -> int:
+        """Rebuild the whole index from the Orthanc server
+
+        Returns
+        -------
+        int
+            Number of indexed resources.
+        """
+        # The position in the changes log is recorded first, so changes made during the listing are applied later
+        last_change = self.client.get_changes(params={'last': True})['Last']
+
+        resources_information = {
+            'Patient': _list_level(self.client.get_patients),
+            'Study': _list_level(self.client.get_studies),
+            'Series': _list_level(self.client.get_series),
+            'Instance': _list_level(self.client.get_instances),
+        }
+
+        with self._connection:
+            for table in ['resources', 'tags', 'labels', 'checkpoint']:
+                self._connection.execute(f'DELETE FROM {table}')
+
+            for level in LEVELS:
+                for information in resources_information[level].values():
+                    self._upsert(level, information)
+
+            self._set_last_change(last_change)
+
+        return sum(len(i) for i in resources_information.values())
+
+    def find_patients(self,
+                      query: Dict[str, str] = None,
+                      labels: Union[List[str], str] = None,
+                      labels_constraint: str = 'All') -> List[Patient]:
+        """Find patients in the index (see `query()`)"""
+        return self.query('Patient', query, labels, labels_constraint)
+
+    def find_studies(self,
+                     query: Dict[str, str] = None,
+                     labels: Union[List[str], str] = None,
+                     labels_constraint: str = 'All') -> List[Study]:
+        """Find studies in the index (see `query()`)"""
+        return self.query('Study', query, labels, labels_constraint)
+
+    def find_series(self,
+                    query: Dict[str, str] = None,
+                    labels: Union[List[str], str] = None,
+                    labels_constraint: str = 'All') -> List[Series]:
+        """Find series in the index (see `query()`)"""
+        return self.query('Series', query, labels, labels_constraint)
+
+    def find_instances(self,
+                       query: Dict[str, str] = None,
+                       labels: Union[List[str], str] = None,
+                       labels_constraint: str = 'All') -> List[Instance]:
+        """Find instances in the index (see `query()`)"""
+        return self.query('Instance', query, labels, labels_constraint)
+
+    def query(self,
+              level: str,
+              query: Dict[str, str] = None,
+              labels: Union[List[str], str] = None,
+              labels_constraint: str = 'All') -> List[Resource]:
+        """Query the resources of the index, with the semantics of /tools/find
+
+        Parameters
+        ----------
+        level
+            Level of the query ['Patient', 'Study', 'Series', 'Instance'].
+        query
+            Dictionary that specifies the filters on the main DICOM tags of the level (or of the parent levels).
+            Supports exact values, wildcards ('*' and '?'), ranges on dates and times ('20200101-20201231')
+            and lists of values ('CT\\MR'). If a tag is not a main DICOM tag, the query is sent to Orthanc.
+        labels
+            List of strings specifying which labels to look for in the resources.
+        labels_constraint
+            Constraint on the labels, can be 'All', 'Any', or 'None'.
+
+        Returns
+        -------
+        List[Resource]
+            Resources that fit the provided criteria.
+        """
+        _validate_level(level)
+        _validate_labels_constraint(labels_constraint)
+
+        query = {} if query is None else query
+        labels = [labels] if isinstance(labels, str) else labels
+
+        indexed_tags = [tag for i in LEVELS[:LEVELS.index(level) + 1] for tag in MAIN_DICOM_TAGS[i]]
+        if any(tag not in indexed_tags for tag in query):
+            return query_orthanc(self.client, level, query, labels, labels_constraint)
+
+        sql = 'SELECT information FROM resources WHERE level = ?'
+        parameters = [level]
+
+        for tag, value in query.items():
+            clause, clause_parameters = _make_tag_clause(tag, value, level)
+            sql += f' AND {clause}'
+            parameters += clause_parameters
+
+        if labels:
+            clause, clause_parameters = _make_labels_clause(labels, labels_constraint)
+            sql += f' AND {clause}'
+            parameters += clause_parameters
+
+        return [
+            _make_resource(level, self._load_information(level, row[0]), self.client)
+            for row in self._connection.execute(sql, parameters).fetchall()
+        ]
+
+    def _load_information(self, level: str, stored_information: str) -> Dict:
+        """Load the stored information, with the child lists derived from the indexed children
+
+        The stored child lists are those of the last update of the resource, they do not
+        include the children created (or exclude the children deleted) since then.
+        """
+        information = json.loads(stored_information)
+
+        if level in CHILDREN_KEYS:
+            rows = self._connection.execute(
+                'SELECT id FROM resources WHERE parent_id = ? ORDER BY id', (information['ID'],)
+            )
+            information[CHILDREN_KEYS[level]] = [row[0] for row in rows]
+
+        return information
+
+    def _apply_changes(self) -> int:
+        nbr_of_changes = 0
+
+        while True:
+            changes = self.client.get_changes(params={'since': self.last_change, 'limit': self.changes_limit})
+            resources = {}  # Resources changed in this batch, each resource is updated once
+
+            for change in changes['Changes']:
+                if change['ResourceType'] in LEVELS:
+                    resources[change['ID']] = (change['ResourceType'], change['ChangeType'] == 'Deleted')
+
+            with self._connection:
+                for identifier, (level, is_deleted) in resources.items():
+                    information = None if is_deleted else self._get_information(level, identifier)
+
+                    if information is None:
+                        self._delete(identifier)
+                    else:
+                        self._upsert(level, information)
+
+                self._set_last_change(changes['Last'])
+
+            nbr_of_changes += len(changes['Changes'])
+            if changes['Done']:
+                return nbr_of_changes
+
+    def _delete_missing_resources(self) -> int:
+        """Delete the indexed resources that are no longer on the server, for the levels whose counts differ"""
+        statistics = self.client.get_statistics()
+        nbr_of_indexed = self._count()
+
+        for level in LEVELS:
+            # Counted at each level, since the deletions cascade to the descendants
+            if self._count(level) == int(statistics[STATISTICS_KEYS[level]]):
+                continue
+
+            identifiers = set(_list_identifiers(getattr(self.client, f'get_{ROUTES[level]}')))
+            rows = self._connection.execute('SELECT id FROM resources WHERE level = ?', (level,)).fetchall()
+
+            with self._connection:
+                for (identifier,) in rows:
+                    if identifier not in identifiers:
+                        self._delete(identifier)
+
+        return nbr_of_indexed - self._count()
+
+    def _count(self, level: Optional[str] = None) -> int:
+        if level is None:
+            return self._connection.execute('SELECT COUNT(*) FROM resources').fetchone()[0]
+
+        return self._connection.execute('SELECT COUNT(*) FROM resources WHERE level = ?', (level,)).fetchone()[0]
+
+    def _get_information(self, level: str, identifier: str) -> Optional[Dict]:
+        """Get the information of the resource, None if it has been deleted"""
+        response = self.client.get(f'{self.client.url}/{ROUTES[level]}/{identifier}')
+        if response.status_code == 404:
+            return None
+
+        return _check_response(response).json()
+
+    def _upsert(self, level: str, information: Dict) -> None:
+        identifier = information['ID']
+        self._connection.execute(
+            'INSERT OR REPLACE INTO resources (id, level, parent_id, information) VALUES (?, ?, ?, ?)',
+            (identifier, level, information.get(PARENT_KEYS.get(level)), json.dumps(information))
+        )
+
+        self._connection.execute('DELETE FROM tags WHERE id = ?', (identifier,))
+        self._connection.executemany(
+            'INSERT INTO tags (id, tag, value) VALUES (?, ?, ?)',
+            [(identifier, tag, value) for tag, value in _get_indexed_tags(level, information)]
+        )
+
+        self._connection.execute('DELETE FROM labels WHERE id = ?', (identifier,))
+        self._connection.executemany(
+            'INSERT INTO labels (id, label) VALUES (?, ?)',
+            [(identifier, label) for label in information.get('Labels', [])]
+        )
+
+        if level in CHILDREN_KEYS:
+            # Children that are no longer listed by their parent have been deleted
+            children = set(information.get(CHILDREN_KEYS[level], []))
+            rows = self._connection.execute('SELECT id FROM resources WHERE parent_id = ?', (identifier,)).fetchall()
+            for (child_id,) in rows:
+                if child_id not in children:
+                    self._delete(child_id)
+
+    def _delete(self, identifier: str) -> None:
+        """Delete the resource and its descendants"""
+        identifiers = [identifier]
+
+        while identifiers:
+            placeholders = ', '.join('?' * len(identifiers))
+
+            for table in ['resources', 'tags', 'labels']:
+                self._connection.execute(f'DELETE FROM {table} WHERE id IN ({placeholders})', identifiers)
+
+            identifiers = [
+                row[0] for row in
+                self._connection.execute(f'SELECT id FROM resources WHERE parent_id IN ({placeholders})', identifiers)
+            ]
+
+    def _set_last_change(self, last_change: int) -> None:
+        self._connection.execute(
+            "INSERT OR REPLACE INTO checkpoint (key, value) VALUES ('last_change', ?)", (last_change,)
+        )
+
+
+def _list_identifiers(get_resources: Callable) -> List[str]:
+    identifiers = []
+    since = 0
+
+    while True:
+        page = get_resources(params={'since': since, 'limit': DEFAULT_RESOURCES_LIMIT})
+        if len(page) == 0:
+            return identifiers
+
+        identifiers += page
+        since += DEFAULT_RESOURCES_LIMIT
+
+
+def _get_indexed_tags(level: str, information: Dict) -> Iterator[Tuple[str, str]]:
+    for tag, value in information.get('MainDicomTags', {}).items():
+        if tag in MAIN_DICOM_TAGS[level] and isinstance(value, str):
+            yield tag, value
+
+
+def _make_tag_clause(tag: str, value: str, level: str) -> Tuple[str, List[str]]:
+    """Make the SQL condition on the `id` of the resources of the level, for a tag of the level or of a parent level"""
+    if '\\' in value:
+        values = value.split('\\')
+        condition, parameters = f'value IN ({", ".join("?" * len(values))})', values
+    elif '-' in value and tag.endswith(('Date', 'Time')):
+        start, end = value.split('-', 1)
+        conditions, parameters = ['value IS NOT NULL'], []
+        if start:
+            conditions.append('value >= ?')
+            parameters.append(start)
+        if end:
+            conditions.append('value <= ?')
+            parameters.append(end)
+        condition = ' AND '.join(conditions)
+    elif '*' in value or '?' in value:
+        condition, parameters = 'value GLOB ?', [value.replace('[', '[[]')]
+    else:
+        condition, parameters = 'value = ?', [value]
+
+    clause = f'SELECT id FROM tags WHERE tag = ? AND {condition}'
+    parameters = [tag] + parameters
+
+    # The tag may belong to a parent level, the clause is then nested once per level
+    tag_level = next(i for i in reversed(LEVELS[:LEVELS.index(level) + 1]) if tag in MAIN_DICOM_TAGS[i])
+    for _ in range(LEVELS.index(level) - LEVELS.index(tag_level)):
+        clause = f'SELECT id FROM resources WHERE parent_id IN ({clause})'
+
+    return f'id IN ({clause})', parameters
+
+
+def _make_labels_clause(labels: List[str], labels_constraint: str) -> Tuple[str, List[str]]:
+    placeholders = ', '.join('?' * len(labels))
+    clause = f'SELECT id FROM labels WHERE label IN ({placeholders})'
+
+    if labels_constraint == 'All':
+        return f'id IN ({clause} GROUP BY id HAVING COUNT(*) = {len(labels)})', labels
+    if labels_constraint == 'Any':
+        return f'id IN ({clause})', labels
+
+    return f'id NOT IN ({clause})', labels
@@ -0,0 +1,224 @@
+"""Instrumentation of the requests sent to Orthanc
+
+The requests are observed by an `InstrumentedTransport` (or `AsyncInstrumentedTransport`), which
+reports a `RequestRecord` to an observer for each request. The observer can be any callable;
+`MetricsAggregator` aggregates the records per route in memory, and exports them in the
+Prometheus text format.
+"""
+import bisect
+import contextvars
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ._paging import AdaptivePager
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1., 2.5, 5., 10.)  # Seconds
+
+# Name of the path parameter that follows each collection of the REST API (e.g. '/instances/{id}')
+ROUTE_PARAMETERS = {
+    'patients': 'id',
+    'studies': 'id',
+    'series': 'id',
+    'instances': 'id',
+    'modalities': 'id',
+    'peers': 'id',
+    'queries': 'id',
+    'jobs': 'id',
+    'plugins': 'id',
+    'storage-commitment': 'id',
+    'attachments': 'name',
+    'metadata': 'name',
+    'labels': 'label',
+    'frames': 'frame',
+    'answers': 'index',
+}
+
+# Retry attempt of the request being sent (0 for the first attempt), set by the code that retries
+current_attempt: contextvars.ContextVar[int] = contextvars.ContextVar('current_attempt', default=0)
+
+
+@dataclass
+class RequestRecord:
+    """Request observed by an `InstrumentedTransport`"""
+    method: str
+    route: str  # Route template, e.g. '/instances/{id}/tags'
+    status_code: Optional[int]  # None if no response was received (e.g. timeout)
+    duration: float  # Seconds, until the response body was read
+    request_bytes: int
+    response_bytes: int  # As they came, e.g. gzip encoded
+    attempt: int = 0  # 0 for the first attempt, n for the n-th retry
+    error: Optional[str] = None  # Name of the exception, if the request failed
+
+
+@dataclass
+class RouteMetrics:
+    """Metrics of the requests of a route, aggregated by a `MetricsAggregator`"""
+    nbr_of_requests: int = 0
+    nbr_of_errors: int = 0  # Requests without a response
+    nbr_of_retries: int = 0
+    status_codes: Counter = field(default_factory=Counter)
+    total_duration: float = 0.
+    bucket_counts: List[int] = field(default_factory=list)  # Not cumulative, the last one is +Inf
+    request_bytes: int = 0
+    response_bytes: int = 0
+
+    @property
+    def mean_duration(self) -> float:
+        return self.total_duration / self.nbr_of_requests if self.nbr_of_requests > 0 else 0.
+
+
+class MetricsAggregator:
+    """Aggregate the records of the requests per method and route template, in memory
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    metrics = pyorthanc.MetricsAggregator()
+    client = pyorthanc.Orthanc(
+        'http://localhost:8042', 'orthanc', 'orthanc',
+        transport=pyorthanc.InstrumentedTransport(metrics)
+    )
+    pyorthanc.find(client, series_filter=lambda s: s.modality == 'CT')
+
+    for (method, route), route_metrics in metrics.most_expensive(5):
+        print(method, route, route_metrics.nbr_of_requests, route_metrics.total_duration)
+
+    print(metrics.to_prometheus())
+    ```
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> None:
+        """Constructor
+
+        Parameters
+        ----------
+        buckets
+            Upper bounds (in seconds) of the buckets of the latency histograms.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self.pagers: Dict[str, AdaptivePager] = {}
+
+        self._lock = threading.Lock()
+
+    def __call__(self, record: RequestRecord) -> None:
+        with self._lock:
+            metrics = self.routes.get((record.method, record.route))
+            if metrics is None:
+                metrics = self.routes[record.method, record.route] = RouteMetrics(
+                    bucket_counts=[0] * (len(self.buckets) + 1)
+                )
+
+            metrics.nbr_of_requests += 1
+            metrics.nbr_of_retries += record.attempt > 0
+            metrics.total_duration += record.duration
+            metrics.bucket_counts[bisect.bisect_left(self.buckets, record.duration)] += 1
+            metrics.request_bytes += record.request_bytes
+            metrics.response_bytes += record.response_bytes
+
+            if record.status_code is None:
+                metrics.nbr_of_errors += 1
+            else:
+                metrics.status_codes[record.status_code] += 1
+
+    def add_pager(self, name: str, pager: AdaptivePager) -> None:
+        """Export the page sizes chosen by an `AdaptivePager` along with the requests metrics"""
+        self.pagers[name] = pager
+
+    def clear(self) -> None:
+        with self._lock:
+            self.routes.clear()
+
+    def most_expensive(self, n: Optional[int] = None) -> List[Tuple[Tuple[str, str], RouteMetrics]]:
+        """Routes sorted by their total duration, the most expensive first"""
+        with self._lock:
+            routes = sorted(self.routes.items(), key=lambda item: item[1].total_duration, reverse=True)
+
+        return routes if n is None else routes[:n]
+
+    def to_prometheus(self, namespace: str = 'pyorthanc') -> str:
+        """Export the metrics in the Prometheus text format"""
+        with self._lock:
+            routes = sorted(self.routes.items())
+            lines = []
+
+            name = f'{namespace}_request_duration_seconds'
+            lines += _make_header(name, 'histogram', 'Duration of the requests.')
+            for (method, route), metrics in routes:
+                labels = _format_labels(method=method, route=route)
+                count = 0
+                for bucket, bucket_count in zip(self.buckets, metrics.bucket_counts):
+                    count += bucket_count
+                    lines.append(f'{name}_bucket{{{labels},le="{bucket}"}} {count}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {metrics.nbr_of_requests}')
+                lines.append(f'{name}_sum{{{labels}}} {metrics.total_duration}')
+                lines.append(f'{name}_count{{{labels}}} {metrics.nbr_of_requests}')
+
+            lines += _make_header(f'{namespace}_responses_total', 'counter', 'Responses by status code.')
+            for (method, route), metrics in routes:
+                for status_code, count in sorted(metrics.status_codes.items()):
+                    labels = _format_labels(method=method, route=route, status_code=str(status_code))
+                    lines.append(f'{namespace}_responses_total{{{labels}}} {count}')
+
+            for name, attribute, help_text in [
+                ('request_errors_total', 'nbr_of_errors', 'Requests that got no response.'),
+                ('request_retries_total', 'nbr_of_retries', 'Retried requests.'),
+                ('request_bytes_total', 'request_bytes', 'Size of the request bodies.'),
+                ('response_bytes_total', 'response_bytes', 'Size of the response bodies.'),
+            ]:
+                lines += _make_header(f'{namespace}_{name}', 'counter', help_text)
+                for (method, route), metrics in routes:
+                    labels = _format_labels(method=method, route=route)
+                    lines.append(f'{namespace}_{name}{{{labels}}} {getattr(metrics, attribute)}')
+
+        if self.pagers:
+            lines += _make_header(f'{namespace}_pager_limit', 'gauge', 'Page size of the next page of the pagers.')
+            for name, pager in sorted(self.pagers.items()):
+                lines.append(f'{namespace}_pager_limit{{{_format_labels(pager=name)}}} {pager.limit}')
+
+            lines += _make_header(f'{namespace}_pager_pages_total', 'counter', 'Pages fetched by the pagers.')
+            for name, pager in sorted(self.pagers.items()):
+                lines.append(f'{namespace}_pager_pages_total{{{_format_labels(pager=name)}}} {len(pager.history)}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def make_route_template(path: str) -> str:
+    """Replace the path parameters of a route by their name, e.g. '/instances/{id}/frames/{frame}'"""
+    segments = path.split('/')
+    template = []
+    index = 0
+
+    while index < len(segments):
+        segment = segments[index]
+        template.append(segment)
+        has_next_segment = index + 1 < len(segments) and segments[index + 1] != ''
+
+        if segment == 'content' and has_next_segment:
+            template.append('{path}')  # The path of a DICOM tag has several segments
+            break
+
+        parameter = ROUTE_PARAMETERS.get(segment)
+        if parameter is not None and has_next_segment:
+            template.append(f'{{{parameter}}}')
+            index += 1
+
+        index += 1
+
+    return '/'.join(template)
+
+
+def _make_header(name: str, metric_type: str, help_text: str) -> List[str]:
+    return [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}']
+
+
+def _format_labels(**labels: str) -> str:
+    return ','.join(f'{key}="{_escape_label_value(value)}"' for key, value in labels.items())
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
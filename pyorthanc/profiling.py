@@ -0,0 +1,335 @@
+"""Profiling of the requests made by the high-level API (resources, `find()`, `retrieve_*`, ...)
+
+Much of the cost of the high-level API is hidden in properties (e.g. `Series.instances`),
+which makes N+1 request patterns easy to miss. `profile()` records every request sent by the
+Orthanc clients, along with the code that triggered it, and reports the repeated routes.
+"""
+import os
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from types import FrameType
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from .async_client import AsyncOrthanc
+from .client import Orthanc
+from .metrics import make_route_template
+
+DEFAULT_N_PLUS_ONE_THRESHOLD = 5
+
+_PYORTHANC_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+_HTTPX_DIRECTORY = os.path.dirname(os.path.abspath(httpx.__file__))
+_STDLIB_DIRECTORY = os.path.abspath(sysconfig.get_paths()['stdlib'])  # E.g. asyncio, concurrent.futures, threading
+_SITE_PACKAGES_DIRECTORIES = tuple({
+    os.path.abspath(sysconfig.get_paths()['purelib']),
+    os.path.abspath(sysconfig.get_paths()['platlib'])
+})
+
+_active_profiles: List['Profile'] = []
+_lock = threading.Lock()
+
+
+@dataclass
+class ProfiledRequest:
+    """Request recorded by a `Profile`"""
+    method: str
+    url: str
+    route: str  # Route template, e.g. '/series/{id}/instances'
+    status_code: Optional[int]  # None if no response was received
+    duration: float  # Seconds
+    caller: str  # Code that triggered the request, e.g. 'script.py:12 in main'
+    api: str  # pyorthanc function or property that sent the request, e.g. 'Series.instances'
+
+
+@dataclass
+class NPlusOnePattern:
+    """Requests of the same route, sent from the same code for different resources"""
+    method: str
+    route: str
+    caller: str
+    api: str
+    nbr_of_requests: int
+    nbr_of_urls: int
+
+    def __str__(self) -> str:
+        return (f'{self.method} {self.route}: {self.nbr_of_requests} requests for {self.nbr_of_urls} resources '
+                f'from {self.caller} (via {self.api})')
+
+
+class Profile:
+    """Requests recorded by `profile()`"""
+
+    def __init__(self,
+                 max_requests: Optional[int] = None,
+                 n_plus_one_threshold: int = DEFAULT_N_PLUS_ONE_THRESHOLD) -> None:
+        """Constructor, see `profile()`"""
+        self.max_requests = max_requests
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.requests: List[ProfiledRequest] = []
+
+        self._start = time.perf_counter()
+        self._duration: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        """Time (in seconds) spent in the profiled block"""
+        return time.perf_counter() - self._start if self._duration is None else self._duration
+
+    def __enter__(self) -> 'Profile':
+        self._start = time.perf_counter()
+        _start_profiling(self)
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        _stop_profiling(self)
+        self._duration = time.perf_counter() - self._start
+
+        if exc_type is None and self.max_requests is not None:
+            self.assert_max_requests(self.max_requests)
+
+    def count(self, route: Optional[str] = None, method: Optional[str] = None) -> int:
+        """Number of recorded requests, of a route template (e.g. '/series/{id}') and method if given"""
+        return sum(
+            1 for request in self.requests
+            if (route is None or request.route == route) and (method is None or request.method == method)
+        )
+
+    def group_by_route(self) -> List[Tuple[Tuple[str, str], int, float]]:
+        """Number of requests and total duration per (method, route), the most frequent first"""
+        groups: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+        for request in self.requests:
+            groups[request.method, request.route].append(request.duration)
+
+        return sorted(
+            [(key, len(durations), sum(durations)) for key, durations in groups.items()],
+            key=lambda group: group[1],
+            reverse=True
+        )
+
+    def find_n_plus_one(self) -> List[NPlusOnePattern]:
+        """Routes requested for at least `n_plus_one_threshold` different resources from the same code"""
+        groups: Dict[Tuple[str, str, str, str], List[str]] = defaultdict(list)
+        for request in self.requests:
+            groups[request.method, request.route, request.caller, request.api].append(request.url)
+
+        patterns = [
+            NPlusOnePattern(method, route, caller, api, nbr_of_requests=len(urls), nbr_of_urls=len(set(urls)))
+            for (method, route, caller, api), urls in groups.items()
+            if len(set(urls)) >= self.n_plus_one_threshold
+        ]
+
+        return sorted(patterns, key=lambda pattern: pattern.nbr_of_requests, reverse=True)
+
+    def find_repeated(self) -> List[Tuple[str, int]]:
+        """GET requests sent several times for the same URL, as (url, count), the most frequent first"""
+        counts = Counter(request.url for request in self.requests if request.method == 'GET')
+
+        return [(url, count) for url, count in counts.most_common() if count > 1]
+
+    def report(self) -> str:
+        """Summary of the recorded requests, with the N+1 patterns and the repeated requests"""
+        lines = [f'{len(self.requests)} requests in {self.duration:.3f} s', '', 'Requests by route:']
+        lines += [
+            f'  {count:6d} {total_duration:9.3f} s  {method:<6} {route}'
+            for (method, route), count, total_duration in self.group_by_route()
+        ]
+
+        n_plus_one_patterns = self.find_n_plus_one()
+        if n_plus_one_patterns:
+            lines += ['', 'Possible N+1 patterns:']
+            lines += [f'  {pattern}' for pattern in n_plus_one_patterns]
+
+        repeated_requests = self.find_repeated()
+        if repeated_requests:
+            lines += ['', 'Repeated requests:']
+            lines += [f'  GET {url}: {count} times' for url, count in repeated_requests]
+
+        return '\n'.join(lines)
+
+    def assert_max_requests(self, max_requests: int, route: Optional[str] = None, method: Optional[str] = None) -> None:
+        """Raise an AssertionError if more than `max_requests` requests (of a route and method if given) were sent"""
+        count = self.count(route, method)
+
+        if count > max_requests:
+            target = ' '.join(part for part in [method, route] if part is not None) or 'all routes'
+            raise AssertionError(f'{count} requests were sent ({target}), the budget is {max_requests}.\n\n'
+                                 f'{self.report()}')
+
+    def assert_no_n_plus_one(self) -> None:
+        """Raise an AssertionError if a N+1 pattern was found"""
+        if self.find_n_plus_one():
+            raise AssertionError(f'N+1 request patterns were found.\n\n{self.report()}')
+
+    def _record(self, request: ProfiledRequest) -> None:
+        self.requests.append(request)
+
+
+def profile(max_requests: Optional[int] = None,
+            n_plus_one_threshold: int = DEFAULT_N_PLUS_ONE_THRESHOLD) -> Profile:
+    """Record the requests sent by all the Orthanc clients (`Orthanc` and `AsyncOrthanc`) within a block
+
+    Each request is recorded with its route template, its duration, the code that triggered it
+    and the pyorthanc function (or property) that sent it. The requests sent by all the threads
+    are recorded, including the workers of e.g. `find(..., max_workers=4)`.
+
+    Parameters
+    ----------
+    max_requests
+        Budget of requests. If given, an AssertionError is raised at the end of the block
+        when more requests were sent, which makes it usable in the tests.
+    n_plus_one_threshold
+        Minimum number of different resources requested with the same route from the same code
+        for it to be reported as a N+1 pattern.
+
+    Returns
+    -------
+    Profile
+        The recorded requests, once the block is exited.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    client = pyorthanc.Orthanc('http://localhost:8042', 'orthanc', 'orthanc')
+
+    with pyorthanc.profile() as p:
+        for study in pyorthanc.find_studies(client):
+            for series in study.series:
+                print(series.modality)
+
+    print(p.report())
+
+    # In a test
+    def test_find_budget(client):
+        with pyorthanc.profile() as p:
+            pyorthanc.find(client, series_filter=lambda s: s.modality == 'CT')
+
+        p.assert_max_requests(10)
+        p.assert_max_requests(1, route='/tools/find')
+        p.assert_no_n_plus_one()
+    ```
+    """
+    return Profile(max_requests, n_plus_one_threshold)
+
+
+def _start_profiling(profile_: Profile) -> None:
+    with _lock:
+        if not _active_profiles:
+            Orthanc.send = _profiled_send
+            AsyncOrthanc.send = _async_profiled_send
+
+        _active_profiles.append(profile_)
+
+
+def _stop_profiling(profile_: Profile) -> None:
+    with _lock:
+        _active_profiles.remove(profile_)
+
+        if not _active_profiles:
+            del Orthanc.send  # Back to httpx.Client.send
+            del AsyncOrthanc.send
+
+
+def _profiled_send(self: Orthanc, request: httpx.Request, *args, **kwargs) -> httpx.Response:
+    caller, api = _find_origin(sys._getframe(1))
+    start = time.perf_counter()
+
+    try:
+        response = httpx.Client.send(self, request, *args, **kwargs)
+    except Exception:
+        _record(request, None, start, caller, api)
+        raise
+
+    _record(request, response.status_code, start, caller, api)
+
+    return response
+
+
+async def _async_profiled_send(self: AsyncOrthanc, request: httpx.Request, *args, **kwargs) -> httpx.Response:
+    caller, api = _find_origin(sys._getframe(1))
+    start = time.perf_counter()
+
+    try:
+        response = await httpx.AsyncClient.send(self, request, *args, **kwargs)
+    except Exception:
+        _record(request, None, start, caller, api)
+        raise
+
+    _record(request, response.status_code, start, caller, api)
+
+    return response
+
+
+def _record(request: httpx.Request, status_code: Optional[int], start: float, caller: str, api: str) -> None:
+    profiled_request = ProfiledRequest(
+        method=request.method,
+        url=str(request.url),
+        route=make_route_template(request.url.path),
+        status_code=status_code,
+        duration=time.perf_counter() - start,
+        caller=caller,
+        api=api
+    )
+
+    with _lock:
+        for profile_ in _active_profiles:
+            profile_._record(profiled_request)
+
+
+def _find_origin(frame: Optional[FrameType]) -> Tuple[str, str]:
+    """Find the first frame outside the libraries (the caller), and the last pyorthanc frame before it (the api)"""
+    api_frame = None
+    public_api_frame = None
+
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+
+        if filename.startswith(_PYORTHANC_DIRECTORY + os.sep):  # Not the siblings, e.g. pyorthanc_scripts/
+            api_frame = frame
+            if not frame.f_code.co_name.startswith('_'):
+                public_api_frame = frame
+        elif not _is_library_file(filename):
+            break
+
+        frame = frame.f_back
+
+    caller = '?' if frame is None else f'{_format_filename(frame)}:{frame.f_lineno} in {_get_function_name(frame)}'
+    api_frame = public_api_frame if public_api_frame is not None else api_frame
+    api = '?' if api_frame is None else _get_function_name(api_frame)
+
+    return caller, api
+
+
+def _is_library_file(filename: str) -> bool:
+    if filename.startswith(_HTTPX_DIRECTORY + os.sep):
+        return True
+
+    # The site-packages are in the standard library directory, but hold the user's packages too
+    return (
+        filename.startswith(_STDLIB_DIRECTORY + os.sep)
+        and not filename.startswith(tuple(d + os.sep for d in _SITE_PACKAGES_DIRECTORIES))
+    )
+
+
+def _format_filename(frame: FrameType) -> str:
+    try:
+        return os.path.relpath(frame.f_code.co_filename)
+    except ValueError:  # On another drive (Windows)
+        return frame.f_code.co_filename
+
+
+def _get_function_name(frame: FrameType) -> str:
+    code = frame.f_code
+    qualified_name = getattr(code, 'co_qualname', None)  # Python >= 3.11
+    if qualified_name is not None:
+        return qualified_name
+
+    instance = frame.f_locals.get('self')
+    return code.co_name if instance is None else f'{type(instance).__name__}.{code.co_name}'
@@ -1,10 +1,15 @@
 import os
-from typing import List, Union
+from typing import Dict, List, Optional, Union
 
 from ._resources.instance import Instance
 from ._resources.patient import Patient
+from ._resources.resource import Resource
 from ._resources.series import Series
 from ._resources.study import Study
+from .capabilities import _is_version_at_least
+
+# First Orthanc version with the /tools/bulk-content route
+BULK_CONTENT_VERSION = '1.9.4'
 
 
 def retrieve_and_write_patients(patients: List[Patient], path: Union[str, os.PathLike]) -> None:
@@ -28,6 +33,10 @@ def retrieve_and_write_patient(patient: Patient, path: Union[str, os.PathLike])
     else:
         patient_path = os.path.join(path, patient.patient_id)
 
+    if _has_all_children(patient) and _supports_bulk_content(patient):
+        _retrieve_and_write_with_bulk_content(patient, patient_path, ['Study', 'Series'])
+        return
+
     for study in patient.studies:
         retrieve_and_write_study(study, patient_path)
 
@@ -35,6 +44,10 @@ def retrieve_and_write_patient(patient: Patient, path: Union[str, os.PathLike])
 def retrieve_and_write_study(study: Study, patient_path: Union[str, os.PathLike]) -> None:
     study_path = os.path.join(patient_path, study.uid)
 
+    if _has_all_children(study) and _supports_bulk_content(study):
+        _retrieve_and_write_with_bulk_content(study, study_path, ['Series'])
+        return
+
     for series in study.series:
         retrieve_and_write_series(series, study_path)
 
@@ -43,6 +56,12 @@ def retrieve_and_write_series(series: Series, study_path: Union[str, os.PathLike
     series_path = os.path.join(study_path, series.uid)
     os.makedirs(series_path, exist_ok=True)
 
+    if _supports_bulk_content(series):
+        # The instances kept by e.g. `find()` are described by identifier, rather than the whole series
+        identifiers = None if _has_all_children(series) else [i.id_ for i in series.instances]
+        _retrieve_and_write_with_bulk_content(series, series_path, [], identifiers)
+        return
+
     for instance in series.instances:
         retrieve_and_write_instance(instance, series_path)
 
@@ -54,3 +73,63 @@ def retrieve_and_write_instance(instance: Instance, series_path) -> None:
 
     with open(path, 'wb') as file_handler:
         file_handler.write(dicom_file_bytes)
+
+
+def _supports_bulk_content(resource: Resource) -> bool:
+    return _is_version_at_least(resource.client, BULK_CONTENT_VERSION)
+
+
+def _has_all_children(resource: Resource) -> bool:
+    """Whether the children of the resource are all its children in Orthanc (not e.g. filtered by `find()`)"""
+    return not resource._lock_children or resource._child_resources is None
+
+
+def _retrieve_and_write_with_bulk_content(resource: Resource,
+                                          path: Union[str, os.PathLike],
+                                          path_levels: List[str],
+                                          identifiers: Optional[List[str]] = None) -> None:
+    """Retrieve and write the instances of a resource, described with /tools/bulk-content
+
+    One request per level describes the whole subtree of the resource, rather than
+    one request per study, series and instance.
+
+    Parameters
+    ----------
+    resource
+        Patient, study or series to retrieve.
+    path
+        Path of the resource.
+    path_levels
+        Levels of the directories between the resource path and the instances (e.g. ['Study', 'Series'] for a patient).
+    identifiers
+        Identifiers of the described resources, defaults to the resource itself.
+    """
+    identifiers = [resource.id_] if identifiers is None else identifiers
+    if len(identifiers) == 0:
+        return
+
+    information_by_level: Dict[str, Dict[str, Dict]] = {}
+    for level in path_levels + ['Instance']:
+        resources_information = resource.client.post_tools_bulk_content({
+            'Resources': identifiers,
+            'Level': level,
+            'Metadata': False
+        })
+        information_by_level[level] = {i['ID']: i for i in resources_information}
+
+    for instance_information in information_by_level['Instance'].values():
+        series_information = information_by_level.get('Series', {}).get(instance_information['ParentSeries'])
+
+        path_components = []
+        if 'Study' in path_levels:
+            study_information = information_by_level['Study'][series_information['ParentStudy']]
+            path_components.append(study_information['MainDicomTags']['StudyInstanceUID'])
+        if 'Series' in path_levels:
+            path_components.append(series_information['MainDicomTags']['SeriesInstanceUID'])
+
+        series_path = os.path.join(path, *path_components)
+        os.makedirs(series_path, exist_ok=True)
+
+        instance = Instance(instance_information['ID'], resource.client)
+        instance._set_information(instance_information)
+        retrieve_and_write_instance(instance, series_path)
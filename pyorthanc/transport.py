@@ -0,0 +1,870 @@
+"""HTTP transports for the Orthanc clients
+
+A transport is given to a client with the `transport` argument, which is passed to
+`httpx.Client` (or `httpx.AsyncClient`), e.g.
+`pyorthanc.Orthanc('https://orthanc.example.com', transport=pyorthanc.HTTP2Transport())`.
+"""
+import asyncio
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import httpx
+
+from .metrics import RequestRecord, current_attempt, make_route_template
+
+DEFAULT_MAX_STREAMS = 100
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY = 60.  # Seconds
+
+DEFAULT_CACHED_ROUTES = (
+    '/statistics',
+    '/system',
+    '/patients/*',
+    '/studies/*',
+    '/series/*',
+    '/instances/*',
+    '/instances/*/tags',
+    '/instances/*/simplified-tags',
+)
+DEFAULT_COALESCED_ROUTES = DEFAULT_CACHED_ROUTES
+DEFAULT_CACHE_MAX_ENTRIES = 1_024
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+RequestKey = Tuple[str, str, str]  # URL, Accept header and hash of the Authorization header
+
+
+class HTTP2Transport(httpx.BaseTransport):
+    """HTTP/2 transport for `Orthanc`, which multiplexes the requests over a few connections
+
+    With the default HTTP/1.1 pooling, each concurrent request needs its own connection,
+    so fan-out workloads (e.g. `find()` with `max_workers`) open many connections through
+    the reverse proxy in front of Orthanc. With HTTP/2, the concurrent requests are streams
+    of the same connection.
+
+    HTTP/2 is negotiated with the server (over HTTPS), the transport falls back to HTTP/1.1
+    when the server does not support it. Note that Orthanc itself only speaks HTTP/1.1,
+    HTTP/2 requires a reverse proxy (e.g. nginx) in front of it.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    client = pyorthanc.Orthanc(
+        'https://orthanc.example.com', 'orthanc', 'orthanc',
+        transport=pyorthanc.HTTP2Transport(max_streams=200)
+    )
+    ```
+    """
+
+    def __init__(self,
+                 max_streams: int = DEFAULT_MAX_STREAMS,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+                 prior_knowledge: bool = False,
+                 **kwargs) -> None:
+        """Constructor
+
+        Parameters
+        ----------
+        max_streams
+            Maximum number of requests in flight at the same time, over all the connections.
+            The requests beyond it wait for a stream to be free.
+        max_connections
+            Maximum number of connections. A new connection is only opened when the server
+            limits the number of streams per connection, or does not support HTTP/2.
+        keepalive_expiry
+            Time (in seconds) after which an idle connection is closed. Never closed if None.
+        prior_knowledge
+            If True, HTTP/2 is spoken without negotiation, which allows HTTP/2 over plain HTTP (h2c).
+            The server must then support HTTP/2.
+        kwargs
+            Other arguments of `httpx.HTTPTransport` (e.g. `verify`, `retries`).
+        """
+        _check_h2_is_installed()
+        _validate_limits(max_streams, max_connections)
+
+        self.max_streams = max_streams
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.prior_knowledge = prior_knowledge
+        self._kwargs = kwargs
+
+        self._transport = httpx.HTTPTransport(
+            http1=not prior_knowledge,
+            http2=True,
+            limits=_make_limits(max_connections, keepalive_expiry),
+            **kwargs
+        )
+        self._streams = threading.BoundedSemaphore(max_streams)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self._streams.acquire()
+
+        try:
+            response = self._transport.handle_request(request)
+        except BaseException:
+            self._streams.release()
+            raise
+
+        # The stream is in use until the response body is read (or the response closed)
+        response.stream = _ObservedStream(response.stream, lambda _: self._streams.release())
+
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncHTTP2Transport(httpx.AsyncBaseTransport):
+    """HTTP/2 transport for `AsyncOrthanc`, which multiplexes the requests over a few connections
+
+    See `HTTP2Transport`.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    async_client = pyorthanc.AsyncOrthanc(
+        'https://orthanc.example.com', 'orthanc', 'orthanc',
+        transport=pyorthanc.AsyncHTTP2Transport(max_streams=200)
+    )
+    ```
+    """
+
+    def __init__(self,
+                 max_streams: int = DEFAULT_MAX_STREAMS,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+                 prior_knowledge: bool = False,
+                 **kwargs) -> None:
+        """Constructor, see `HTTP2Transport`"""
+        _check_h2_is_installed()
+        _validate_limits(max_streams, max_connections)
+
+        self.max_streams = max_streams
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.prior_knowledge = prior_knowledge
+        self._kwargs = kwargs
+
+        self._transport = httpx.AsyncHTTPTransport(
+            http1=not prior_knowledge,
+            http2=True,
+            limits=_make_limits(max_connections, keepalive_expiry),
+            **kwargs
+        )
+        self._streams = asyncio.BoundedSemaphore(max_streams)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self._streams.acquire()
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self._streams.release()
+            raise
+
+        # The stream is in use until the response body is read (or the response closed)
+        response.stream = _AsyncObservedStream(response.stream, lambda _: self._streams.release())
+
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class CachingTransport(httpx.BaseTransport):
+    """Transport for `Orthanc` that caches the responses of some GET routes, and revalidates them with their ETag
+
+    A cached response is revalidated with the `If-None-Match` header. When the resource did not change,
+    the server answers with an empty `304 Not Modified` response and the cached body is used instead.
+    With a `ttl`, a cached response is used without revalidation while it is younger than the `ttl`
+    (changes made in the meantime are then not seen).
+
+    The cache is a LRU cache, bounded in number of entries and in bytes. It is keyed by the URL
+    (route and parameters) and the `Accept` header. Only the responses with an ETag are cached
+    (and, if a `ttl` is given, the responses without one).
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    client = pyorthanc.Orthanc(
+        'http://localhost:8042', 'orthanc', 'orthanc',
+        transport=pyorthanc.CachingTransport(routes=['/series/*', '/instances/*/tags', '/statistics'])
+    )
+    client.get_statistics()
+    client.get_statistics()  # Revalidated, the body is not downloaded again if it did not change
+
+    print(client._transport.cache.nbr_of_not_modified)
+    ```
+    """
+
+    def __init__(self,
+                 transport: Optional[httpx.BaseTransport] = None,
+                 routes: Optional[List[str]] = DEFAULT_CACHED_ROUTES,
+                 max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 ttl: Optional[float] = None,
+                 cache: Optional['ResponseCache'] = None) -> None:
+        """Constructor
+
+        Parameters
+        ----------
+        transport
+            Transport that sends the requests (e.g. a `HTTP2Transport`), a `httpx.HTTPTransport` if None.
+        routes
+            Routes whose responses are cached, relative to the server URL. A `*` matches a path segment,
+            e.g. '/series/*' matches '/series/{id}' but not '/series/{id}/instances'. All the routes if None.
+        max_entries
+            Maximum number of cached responses.
+        max_bytes
+            Maximum size (in bytes) of the cached response bodies.
+        ttl
+            Time (in seconds) during which a cached response is used without revalidation.
+            Always revalidated if None.
+        cache
+            Cache to use, e.g. to share it with another transport. The `routes`, `max_entries`,
+            `max_bytes` and `ttl` arguments are then ignored.
+        """
+        self.transport = httpx.HTTPTransport() if transport is None else transport
+        self.cache = ResponseCache(routes, max_entries, max_bytes, ttl) if cache is None else cache
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = self.cache.make_key(request)
+        if key is None:
+            return self.transport.handle_request(request)
+
+        entry = self.cache.get(key)
+        if entry is not None and entry.is_fresh(self.cache.ttl):
+            return self.cache.make_response(entry, request)
+
+        if entry is not None and entry.etag is not None:
+            request.headers['If-None-Match'] = entry.etag
+
+        response = self.transport.handle_request(request)
+
+        if entry is not None and response.status_code == 304:
+            response.close()
+            return self.cache.make_response(self.cache.revalidate(entry), request)
+
+        if not self.cache.is_storable(response):
+            return response
+
+        content = _read_raw(response)
+        return self.cache.make_response(self.cache.store(key, response, content), request)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncCachingTransport(httpx.AsyncBaseTransport):
+    """Transport for `AsyncOrthanc` that caches the responses of some GET routes, and revalidates them with their ETag
+
+    See `CachingTransport`.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    async_client = pyorthanc.AsyncOrthanc(
+        'http://localhost:8042', 'orthanc', 'orthanc',
+        transport=pyorthanc.AsyncCachingTransport(routes=['/series/*', '/instances/*/tags'])
+    )
+    ```
+    """
+
+    def __init__(self,
+                 transport: Optional[httpx.AsyncBaseTransport] = None,
+                 routes: Optional[List[str]] = DEFAULT_CACHED_ROUTES,
+                 max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 ttl: Optional[float] = None,
+                 cache: Optional['ResponseCache'] = None) -> None:
+        """Constructor, see `CachingTransport`"""
+        self.transport = httpx.AsyncHTTPTransport() if transport is None else transport
+        self.cache = ResponseCache(routes, max_entries, max_bytes, ttl) if cache is None else cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = self.cache.make_key(request)
+        if key is None:
+            return await self.transport.handle_async_request(request)
+
+        entry = self.cache.get(key)
+        if entry is not None and entry.is_fresh(self.cache.ttl):
+            return self.cache.make_response(entry, request)
+
+        if entry is not None and entry.etag is not None:
+            request.headers['If-None-Match'] = entry.etag
+
+        response = await self.transport.handle_async_request(request)
+
+        if entry is not None and response.status_code == 304:
+            await response.aclose()
+            return self.cache.make_response(self.cache.revalidate(entry), request)
+
+        if not self.cache.is_storable(response):
+            return response
+
+        content = await _async_read_raw(response)
+        return self.cache.make_response(self.cache.store(key, response, content), request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+@dataclass
+class CacheEntry:
+    """Response cached by a `ResponseCache`"""
+    status_code: int
+    headers: List[Tuple[bytes, bytes]]
+    content: bytes  # As it came, e.g. gzip encoded
+    etag: Optional[str]
+    validated_at: float  # Time of the last download or revalidation, from time.monotonic()
+
+    def is_fresh(self, ttl: Optional[float]) -> bool:
+        return ttl is not None and time.monotonic() - self.validated_at < ttl
+
+
+class ResponseCache:
+    """LRU cache of responses, used by `CachingTransport` and `AsyncCachingTransport`
+
+    The cache is thread-safe, and can be shared between transports.
+    """
+
+    def __init__(self,
+                 routes: Optional[List[str]] = DEFAULT_CACHED_ROUTES,
+                 max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 ttl: Optional[float] = None) -> None:
+        """Constructor, see `CachingTransport`"""
+        if max_entries < 1:
+            raise ValueError(f'max_entries must be at least 1, got {max_entries}.')
+
+        self.routes = routes
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self.nbr_of_hits = 0  # Used without revalidation (within the ttl)
+        self.nbr_of_not_modified = 0  # Revalidated with a 304 response
+        self.nbr_of_misses = 0  # Downloaded and cached
+        self.nbr_of_bytes = 0
+
+        self._route_pattern = _make_route_pattern(routes)
+        self._entries: 'OrderedDict[RequestKey, CacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbr_of_bytes = 0
+
+    def make_key(self, request: httpx.Request) -> Optional[RequestKey]:
+        """Key of the request, None if the request is not cached"""
+        return _make_request_key(request, self._route_pattern)
+
+    def get(self, key: RequestKey) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry.is_fresh(self.ttl):
+                    self.nbr_of_hits += 1
+
+            return entry
+
+    def is_storable(self, response: httpx.Response) -> bool:
+        if response.status_code != 200 or 'no-store' in response.headers.get('Cache-Control', ''):
+            return False
+
+        return 'ETag' in response.headers or self.ttl is not None
+
+    def store(self, key: RequestKey, response: httpx.Response, content: bytes) -> CacheEntry:
+        entry = CacheEntry(
+            status_code=response.status_code,
+            headers=response.headers.raw,
+            content=content,
+            etag=response.headers.get('ETag'),
+            validated_at=time.monotonic()
+        )
+        if len(content) > self.max_bytes:
+            return entry  # Not cached, too large
+
+        with self._lock:
+            self.nbr_of_misses += 1
+            previous_entry = self._entries.pop(key, None)
+            if previous_entry is not None:
+                self.nbr_of_bytes -= len(previous_entry.content)
+
+            self._entries[key] = entry
+            self.nbr_of_bytes += len(content)
+
+            while len(self._entries) > self.max_entries or self.nbr_of_bytes > self.max_bytes:
+                _, evicted_entry = self._entries.popitem(last=False)
+                self.nbr_of_bytes -= len(evicted_entry.content)
+
+        return entry
+
+    def revalidate(self, entry: CacheEntry) -> CacheEntry:
+        with self._lock:
+            self.nbr_of_not_modified += 1
+            entry.validated_at = time.monotonic()
+
+        return entry
+
+    @staticmethod
+    def make_response(entry: CacheEntry, request: httpx.Request) -> httpx.Response:
+        return _make_response(entry.status_code, entry.headers, entry.content, request)
+
+
+class CoalescingTransport(httpx.BaseTransport):
+    """Transport for `Orthanc` that coalesces the identical GET requests in flight (single-flight)
+
+    When a thread sends a GET request while the same request (same URL and `Accept` header) is
+    already in flight in another thread, it waits for the response of the request in flight
+    instead of sending its own. Each thread gets its own copy of the response.
+
+    Examples
+    --------
+    ```python
+    from concurrent.futures import ThreadPoolExecutor
+    import pyorthanc
+
+    transport = pyorthanc.CoalescingTransport()
+    client = pyorthanc.Orthanc('http://localhost:8042', 'orthanc', 'orthanc', transport=transport)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: client.get_system(), range(8)))
+
+    print(transport.nbr_of_coalesced_requests)  # Number of requests that were not sent
+    ```
+    """
+
+    def __init__(self,
+                 transport: Optional[httpx.BaseTransport] = None,
+                 routes: Optional[List[str]] = DEFAULT_COALESCED_ROUTES) -> None:
+        """Constructor
+
+        Parameters
+        ----------
+        transport
+            Transport that sends the requests (e.g. a `CachingTransport`), a `httpx.HTTPTransport` if None.
+        routes
+            Routes whose requests are coalesced, relative to the server URL (see `CachingTransport`).
+            All the routes if None. Note that the coalesced responses are read completely before being
+            shared, which does not suit the large downloads (e.g. '/instances/{id}/file').
+        """
+        self.transport = httpx.HTTPTransport() if transport is None else transport
+        self.routes = routes
+
+        self.nbr_of_sent_requests = 0
+        self.nbr_of_coalesced_requests = 0
+        self.nbr_of_saved_bytes = 0
+
+        self._route_pattern = _make_route_pattern(routes)
+        self._flights: Dict[RequestKey, '_Flight'] = {}
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = _make_request_key(request, self._route_pattern)
+        if key is None:
+            return self.transport.handle_request(request)
+
+        with self._lock:
+            flight = self._flights.get(key)
+            is_leader = flight is None
+
+            if is_leader:
+                flight = self._flights[key] = _Flight()
+                self.nbr_of_sent_requests += 1
+
+        if is_leader:
+            try:
+                response = self.transport.handle_request(request)
+                flight.result = (response.status_code, response.headers.raw, _read_raw(response))
+            except BaseException as error:
+                flight.error = error
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.event.set()
+        else:
+            flight.event.wait()
+
+            with self._lock:
+                self.nbr_of_coalesced_requests += 1
+                self.nbr_of_saved_bytes += 0 if flight.result is None else len(flight.result[2])
+
+        if flight.error is not None:
+            raise flight.error
+
+        return _make_response(*flight.result, request)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncCoalescingTransport(httpx.AsyncBaseTransport):
+    """Transport for `AsyncOrthanc` that coalesces the identical GET requests in flight (single-flight)
+
+    When a task sends a GET request while the same request (same URL and `Accept` header) is
+    already in flight, it waits for the response of the request in flight instead of sending its own.
+    Each task gets its own copy of the response. The request in flight is not cancelled
+    when one of the waiting tasks is cancelled.
+
+    Examples
+    --------
+    ```python
+    import asyncio
+    import pyorthanc
+
+    transport = pyorthanc.AsyncCoalescingTransport()
+    async_client = pyorthanc.AsyncOrthanc('http://localhost:8042', 'orthanc', 'orthanc', transport=transport)
+
+    async def main():
+        await asyncio.gather(*[async_client.get_system() for _ in range(8)])
+
+    asyncio.run(main())
+    print(transport.nbr_of_coalesced_requests)  # 7
+    ```
+    """
+
+    def __init__(self,
+                 transport: Optional[httpx.AsyncBaseTransport] = None,
+                 routes: Optional[List[str]] = DEFAULT_COALESCED_ROUTES) -> None:
+        """Constructor, see `CoalescingTransport`"""
+        self.transport = httpx.AsyncHTTPTransport() if transport is None else transport
+        self.routes = routes
+
+        self.nbr_of_sent_requests = 0
+        self.nbr_of_coalesced_requests = 0
+        self.nbr_of_saved_bytes = 0
+
+        self._route_pattern = _make_route_pattern(routes)
+        self._flights: Dict[RequestKey, asyncio.Task] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = _make_request_key(request, self._route_pattern)
+        if key is None:
+            return await self.transport.handle_async_request(request)
+
+        flight = self._flights.get(key)
+
+        if flight is None:
+            flight = self._flights[key] = asyncio.ensure_future(self._send(key, request))
+            self.nbr_of_sent_requests += 1
+            # Shielded, so that cancelling this task does not cancel the request the others wait for
+            result = await asyncio.shield(flight)
+        else:
+            result = await asyncio.shield(flight)
+            self.nbr_of_coalesced_requests += 1
+            self.nbr_of_saved_bytes += len(result[2])
+
+        return _make_response(*result, request)
+
+    async def _send(self, key: RequestKey, request: httpx.Request) -> Tuple[int, List, bytes]:
+        try:
+            response = await self.transport.handle_async_request(request)
+            return response.status_code, response.headers.raw, await _async_read_raw(response)
+        finally:
+            del self._flights[key]
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class InstrumentedTransport(httpx.BaseTransport):
+    """Transport for `Orthanc` that reports the method, route, duration, sizes and status code of each request
+
+    A `RequestRecord` is given to the observer when the response body has been read (or the
+    request failed). The routes are reported as templates (e.g. '/instances/{id}/tags'),
+    so that the records can be aggregated per route, e.g. with a `MetricsAggregator`.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    metrics = pyorthanc.MetricsAggregator()
+    client = pyorthanc.Orthanc(
+        'http://localhost:8042', 'orthanc', 'orthanc',
+        transport=pyorthanc.InstrumentedTransport(metrics, transport=pyorthanc.HTTP2Transport())
+    )
+    ```
+    """
+
+    def __init__(self,
+                 observer: Callable[[RequestRecord], None],
+                 transport: Optional[httpx.BaseTransport] = None) -> None:
+        """Constructor
+
+        Parameters
+        ----------
+        observer
+            Callable called with the `RequestRecord` of each request (e.g. a `MetricsAggregator`).
+            It must be thread-safe if the client is used by several threads.
+        transport
+            Transport that sends the requests, a `httpx.HTTPTransport` if None.
+        """
+        self.observer = observer
+        self.transport = httpx.HTTPTransport() if transport is None else transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        attempt = current_attempt.get()
+
+        try:
+            response = self.transport.handle_request(request)
+        except Exception as error:
+            self.observer(_make_record(request, None, start, 0, attempt, error))
+            raise
+
+        def on_close(nbr_of_bytes: int) -> None:
+            self.observer(_make_record(request, response.status_code, start, nbr_of_bytes, attempt))
+
+        response.stream = _ObservedStream(response.stream, on_close)
+
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncInstrumentedTransport(httpx.AsyncBaseTransport):
+    """Transport for `AsyncOrthanc` that reports the method, route, duration, sizes and status code of each request
+
+    See `InstrumentedTransport`.
+
+    Examples
+    --------
+    ```python
+    import pyorthanc
+
+    metrics = pyorthanc.MetricsAggregator()
+    async_client = pyorthanc.AsyncOrthanc(
+        'http://localhost:8042', 'orthanc', 'orthanc',
+        transport=pyorthanc.AsyncInstrumentedTransport(metrics)
+    )
+    ```
+    """
+
+    def __init__(self,
+                 observer: Callable[[RequestRecord], None],
+                 transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        """Constructor, see `InstrumentedTransport`"""
+        self.observer = observer
+        self.transport = httpx.AsyncHTTPTransport() if transport is None else transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        attempt = current_attempt.get()
+
+        try:
+            response = await self.transport.handle_async_request(request)
+        except Exception as error:
+            self.observer(_make_record(request, None, start, 0, attempt, error))
+            raise
+
+        def on_close(nbr_of_bytes: int) -> None:
+            self.observer(_make_record(request, response.status_code, start, nbr_of_bytes, attempt))
+
+        response.stream = _AsyncObservedStream(response.stream, on_close)
+
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class _Flight:
+    """Request in flight of a `CoalescingTransport`"""
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Optional[Tuple[int, List, bytes]] = None
+        self.error: Optional[BaseException] = None
+
+
+def _make_request_key(request: httpx.Request, route_pattern: Optional[re.Pattern]) -> Optional[RequestKey]:
+    """Key of a GET request of the routes (URL, Accept header and credentials), None for the other requests"""
+    if request.method != 'GET' or 'If-None-Match' in request.headers or 'Range' in request.headers:
+        return None
+
+    if route_pattern is not None and route_pattern.search(request.url.path) is None:
+        return None
+
+    # Responses depend on the credentials (e.g. with an authorization plugin), only a hash of them is kept
+    authorization = hashlib.sha256(request.headers.get('Authorization', '').encode()).hexdigest()
+
+    return str(request.url), request.headers.get('Accept', ''), authorization
+
+
+def _make_record(request: httpx.Request, status_code: Optional[int], start: float, response_bytes: int,
+                 attempt: int, error: Optional[Exception] = None) -> RequestRecord:
+    return RequestRecord(
+        method=request.method,
+        route=make_route_template(request.url.path),
+        status_code=status_code,
+        duration=time.perf_counter() - start,
+        request_bytes=int(request.headers.get('Content-Length', 0)),
+        response_bytes=response_bytes,
+        attempt=attempt,
+        error=None if error is None else type(error).__name__
+    )
+
+
+def _make_response(status_code: int, headers: List[Tuple[bytes, bytes]], content: bytes,
+                   request: httpx.Request) -> httpx.Response:
+    return httpx.Response(status_code=status_code, headers=headers, stream=httpx.ByteStream(content), request=request)
+
+
+def _read_raw(response: httpx.Response) -> bytes:
+    """Read the body as it came (e.g. gzip encoded), the response is then closed"""
+    try:
+        return b''.join(response.stream)
+    finally:
+        response.stream.close()
+
+
+async def _async_read_raw(response: httpx.Response) -> bytes:
+    """Read the body as it came (e.g. gzip encoded), the response is then closed"""
+    try:
+        return b''.join([chunk async for chunk in response.stream])
+    finally:
+        await response.stream.aclose()
+
+
+def _make_route_pattern(routes: Optional[List[str]]) -> Optional[re.Pattern]:
+    if routes is None:
+        return None
+
+    # Matched against the end of the path, since the server may be behind a prefix (e.g. https://host/orthanc/)
+    patterns = [
+        '/'.join('[^/]+' if segment == '*' else re.escape(segment) for segment in route.strip('/').split('/'))
+        for route in routes
+    ]
+
+    return re.compile(f"(?:^|/)(?:{'|'.join(patterns)})/?$")
+
+
+def _make_counterpart_transport(
+        transport: Union[httpx.BaseTransport, httpx.AsyncBaseTransport]
+) -> Optional[Union[httpx.BaseTransport, httpx.AsyncBaseTransport]]:
+    """Make the synchronous transport of an asynchronous transport (or the reverse), for the derived clients"""
+    if isinstance(transport, (HTTP2Transport, AsyncHTTP2Transport)):
+        transport_class = AsyncHTTP2Transport if isinstance(transport, HTTP2Transport) else HTTP2Transport
+
+        return transport_class(
+            max_streams=transport.max_streams,
+            max_connections=transport.max_connections,
+            keepalive_expiry=transport.keepalive_expiry,
+            prior_knowledge=transport.prior_knowledge,
+            **transport._kwargs
+        )
+
+    if isinstance(transport, (InstrumentedTransport, AsyncInstrumentedTransport)):
+        is_sync = isinstance(transport, InstrumentedTransport)
+        transport_class = AsyncInstrumentedTransport if is_sync else InstrumentedTransport
+
+        # The derived client reports to the same observer
+        return transport_class(transport.observer, _make_counterpart_transport(transport.transport))
+
+    if isinstance(transport, (CoalescingTransport, AsyncCoalescingTransport)):
+        is_sync = isinstance(transport, CoalescingTransport)
+        transport_class = AsyncCoalescingTransport if is_sync else CoalescingTransport
+
+        return transport_class(_make_counterpart_transport(transport.transport), routes=transport.routes)
+
+    if isinstance(transport, (CachingTransport, AsyncCachingTransport)):
+        transport_class = AsyncCachingTransport if isinstance(transport, CachingTransport) else CachingTransport
+
+        # The derived client shares the cache
+        return transport_class(_make_counterpart_transport(transport.transport), cache=transport.cache)
+
+    return None
+
+
+class _ObservedStream(httpx.SyncByteStream):
+    """Stream that counts its bytes, and calls `on_close` with their number when it is closed"""
+
+    def __init__(self, stream: httpx.SyncByteStream, on_close: Callable[[int], None]) -> None:
+        self._stream = stream
+        self._on_close = on_close
+        self._nbr_of_bytes = 0
+        self._is_closed = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            self._nbr_of_bytes += len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if not self._is_closed:
+                self._is_closed = True
+                self._on_close(self._nbr_of_bytes)
+
+
+class _AsyncObservedStream(httpx.AsyncByteStream):
+    """Stream that counts its bytes, and calls `on_close` with their number when it is closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[int], None]) -> None:
+        self._stream = stream
+        self._on_close = on_close
+        self._nbr_of_bytes = 0
+        self._is_closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._nbr_of_bytes += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._is_closed:
+                self._is_closed = True
+                self._on_close(self._nbr_of_bytes)
+
+
+def _make_limits(max_connections: int, keepalive_expiry: Optional[float]) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=keepalive_expiry
+    )
+
+
+def _validate_limits(max_streams: int, max_connections: int) -> None:
+    if max_streams < 1:
+        raise ValueError(f'max_streams must be at least 1, got {max_streams}.')
+
+    if max_connections < 1:
+        raise ValueError(f'max_connections must be at least 1, got {max_connections}.')
+
+
+def _check_h2_is_installed() -> None:
+    try:
+        import h2  # noqa: F401
+    except ModuleNotFoundError:
+        raise ModuleNotFoundError(
+            'Optional dependency h2 have to be installed for HTTP/2. '
+            'Install with `pip install pyorthanc[http2]` or `pip install pyorthanc[all]`'
+        )
@@ -2,6 +2,7 @@ import copy
 import hashlib
 import re
 import warnings
+import weakref
 from datetime import datetime
 from io import BytesIO
 from typing import Optional
@@ -10,6 +11,7 @@ import pydicom
 
 from .async_client import AsyncOrthanc
 from .client import Orthanc
+from .transport import _make_counterpart_transport
 
 
 def delete_queries(client: Orthanc) -> None:
@@ -44,15 +46,45 @@ def make_datetime_from_dicom_date(date: str, time: str = None) -> Optional[datet
             return None
 
 
+# Synchronous clients derived with `async_to_sync`, keyed by their source client. Reusing them
+# means that all the derived clients of an AsyncOrthanc share one connection pool.
+_derived_clients: 'weakref.WeakKeyDictionary[AsyncOrthanc, Orthanc]' = weakref.WeakKeyDictionary()
+
+
 def async_to_sync(orthanc: AsyncOrthanc) -> Orthanc:
-    sync_orthanc = Orthanc(url=orthanc.url)
+    """Get a synchronous client pointing to the same server as the provided asynchronous client
+
+    The derived client is created once per source client and then reused, so repeated calls
+    share the same connection pool instead of opening a new one every time.
+    """
+    sync_orthanc = _derived_clients.get(orthanc)
+
+    if sync_orthanc is None or sync_orthanc.is_closed:
+        sync_orthanc = Orthanc(
+            url=orthanc.url,
+            headers=orthanc.headers,
+            timeout=orthanc.timeout,
+            transport=_make_counterpart_transport(orthanc._transport)  # E.g. the HTTP/2 mode
+        )
+        _derived_clients[orthanc] = sync_orthanc
+
     sync_orthanc._auth = orthanc.auth
 
     return sync_orthanc
 
 
 def sync_to_async(orthanc: Orthanc) -> AsyncOrthanc:
-    async_orthanc = AsyncOrthanc(url=orthanc.url)
+    """Get an asynchronous client pointing to the same server as the provided synchronous client
+
+    Unlike `async_to_sync`, a new client is returned on each call, since the connections
+    of an asynchronous client are bound to the event loop in which they were opened.
+    """
+    async_orthanc = AsyncOrthanc(
+        url=orthanc.url,
+        headers=orthanc.headers,
+        timeout=orthanc.timeout,
+        transport=_make_counterpart_transport(orthanc._transport)  # E.g. the HTTP/2 mode
+    )
     async_orthanc._auth = orthanc.auth
 
     return async_orthanc
@@ -0,0 +1,134 @@
+"""Helpers shared by the benchmark scripts
+
+The benchmarks run against a live Orthanc server (e.g. `docker compose up orthanc1`).
+"""
+import argparse
+import os
+import threading
+import time
+from io import BytesIO
+from typing import Callable, Tuple
+
+import pydicom
+from pydicom.dataset import FileMetaDataset
+from pydicom.uid import ExplicitVRLittleEndian, generate_uid
+
+from pyorthanc import Orthanc
+
+SECONDARY_CAPTURE_SOP_CLASS_UID = '1.2.840.10008.5.1.4.1.1.7'
+
+
+def make_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--url', default='http://localhost:8042', help='Orthanc server URL')
+    parser.add_argument('--username', default='orthanc')
+    parser.add_argument('--password', default='orthanc')
+    parser.add_argument(
+        '--populate', type=int, nargs=4, metavar=('PATIENTS', 'STUDIES', 'SERIES', 'INSTANCES'),
+        help='Upload a synthetic tree before running the benchmark (counts are per parent)'
+    )
+
+    return parser
+
+
+def populate(client: Orthanc, nbr_of_patients: int, studies_per_patient: int,
+             series_per_study: int, instances_per_series: int) -> int:
+    """Upload a synthetic tree of small DICOM instances, returns the number of uploaded instances"""
+    count = 0
+
+    for patient_index in range(nbr_of_patients):
+        for _ in range(studies_per_patient):
+            study_uid = generate_uid()
+
+            for series_index in range(series_per_study):
+                series_uid = generate_uid()
+
+                for instance_index in range(instances_per_series):
+                    ds = _make_dataset(
+                        f'BENCH-{patient_index:06d}', study_uid, series_uid,
+                        modality='CT' if series_index % 2 == 0 else 'MR',
+                        instance_number=instance_index
+                    )
+                    client.post_instances(_to_bytes(ds))
+                    count += 1
+
+    return count
+
+
+def count_open_sockets() -> int:
+    """Count the sockets opened by the current process (Linux only)"""
+    count = 0
+
+    for fd in os.listdir('/proc/self/fd'):
+        try:
+            if os.readlink(f'/proc/self/fd/{fd}').startswith('socket:'):
+                count += 1
+        except OSError:
+            pass  # The file descriptor was closed in the meantime
+
+    return count
+
+
+class SocketSampler:
+    """Sample the number of open sockets in a background thread and keep the peak"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, count_open_sockets())
+            time.sleep(self.interval)
+
+    def __enter__(self) -> 'SocketSampler':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, count_open_sockets())
+
+
+def measure(func: Callable) -> Tuple[float, int, object]:
+    """Run `func` and returns (wall time in seconds, peak number of open sockets, result)"""
+    with SocketSampler() as sampler:
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+
+    return elapsed, sampler.peak, result
+
+
+def _make_dataset(patient_id: str, study_uid: str, series_uid: str,
+                  modality: str, instance_number: int) -> pydicom.Dataset:
+    ds = pydicom.Dataset()
+    ds.PatientID = patient_id
+    ds.PatientName = f'BENCH^{patient_id}'
+    ds.StudyInstanceUID = study_uid
+    ds.StudyDate = '20240101'
+    ds.SeriesInstanceUID = series_uid
+    ds.Modality = modality
+    ds.SOPClassUID = SECONDARY_CAPTURE_SOP_CLASS_UID
+    ds.SOPInstanceUID = generate_uid()
+    ds.InstanceNumber = instance_number
+
+    ds.file_meta = FileMetaDataset()
+    ds.file_meta.MediaStorageSOPClassUID = ds.SOPClassUID
+    ds.file_meta.MediaStorageSOPInstanceUID = ds.SOPInstanceUID
+    ds.file_meta.TransferSyntaxUID = ExplicitVRLittleEndian
+
+    return ds
+
+
+def _to_bytes(ds: pydicom.Dataset) -> bytes:
+    buffer = BytesIO()
+    try:
+        pydicom.dcmwrite(buffer, ds, enforce_file_format=True)
+    except TypeError:  # pydicom < 3
+        pydicom.dcmwrite(buffer, ds, write_like_original=False)
+
+    return buffer.getvalue()
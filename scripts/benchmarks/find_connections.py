@@ -0,0 +1,39 @@
+"""Benchmark the wall time and the number of opened sockets of `pyorthanc.find()`
+
+Usage:
+    python scripts/benchmarks/find_connections.py --url http://localhost:8042 --populate 50 2 4 10
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))  # To import _common
+
+from _common import make_parser, measure, populate  # noqa: E402
+
+from pyorthanc import AsyncOrthanc, Orthanc, find  # noqa: E402
+
+
+def main():
+    args = make_parser(__doc__).parse_args()
+
+    client = Orthanc(args.url, args.username, args.password, timeout=600)
+    async_client = AsyncOrthanc(args.url, args.username, args.password, timeout=600)
+
+    if args.populate is not None:
+        print(f'Uploaded {populate(client, *args.populate)} instances')
+
+    statistics = client.get_statistics()
+    print(f"Tree: {statistics['CountPatients']} patients, {statistics['CountStudies']} studies, "
+          f"{statistics['CountSeries']} series, {statistics['CountInstances']} instances")
+
+    for name, orthanc in [('Orthanc', client), ('AsyncOrthanc', async_client)]:
+        # The filter reads a main DICOM tag of every series, which exercises the derived clients.
+        elapsed, peak_sockets, patients = measure(
+            lambda: find(orthanc, series_filter=lambda s: s.modality in ['CT', 'MR'])
+        )
+        print(f'find() with {name:<12}: {elapsed:8.2f} s, peak open sockets: {peak_sockets:5d}, '
+              f'patients: {len(patients)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Benchmark the sequential and the parallel paging of `pyorthanc.query_orthanc()`
+
+Usage:
+    python scripts/benchmarks/find_paging.py --url http://localhost:8042 --limit 100 --max-workers 2 4 8
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))  # To import _common
+
+from _common import make_parser, measure, populate  # noqa: E402
+
+from pyorthanc import Orthanc, query_orthanc  # noqa: E402
+
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument('--level', default='Instance', choices=['Patient', 'Study', 'Series', 'Instance'])
+    parser.add_argument('--limit', type=int, default=100, help='Number of resources per page')
+    parser.add_argument('--max-workers', type=int, nargs='+', default=[2, 4, 8])
+    args = parser.parse_args()
+
+    client = Orthanc(args.url, args.username, args.password, timeout=600)
+
+    if args.populate is not None:
+        print(f'Uploaded {populate(client, *args.populate)} instances')
+
+    elapsed, peak_sockets, sequential_resources = measure(
+        lambda: query_orthanc(client, args.level, limit=args.limit)
+    )
+    print(f'{len(sequential_resources)} resources ({args.level}), pages of {args.limit}')
+    print(f'sequential          : {elapsed:8.2f} s, peak open sockets: {peak_sockets:5d}')
+
+    for max_workers in args.max_workers:
+        elapsed, peak_sockets, resources = measure(
+            lambda: query_orthanc(client, args.level, limit=args.limit, max_workers=max_workers)
+        )
+        assert [r.id_ for r in resources] == [r.id_ for r in sequential_resources]
+        print(f'max_workers={max_workers:<8}: {elapsed:8.2f} s, peak open sockets: {peak_sockets:5d}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+"""Benchmark the request throughput and the number of connections of HTTP/2 against HTTP/1.1
+
+The requests are sent to a local stand-in server (speaking HTTP/1.1, and HTTP/2 over plain HTTP),
+which answers every GET with a JSON body after a fixed latency, like a reverse proxy in front of Orthanc.
+The connections are counted by the server.
+
+Usage:
+    python scripts/benchmarks/http2.py --requests 5000 --concurrency 200 --latency 0.01
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import h11
+import h2.config
+import h2.connection
+import h2.events
+import h2.exceptions
+import h2.settings
+
+from pyorthanc import AsyncHTTP2Transport, AsyncOrthanc, HTTP2Transport, Orthanc
+
+H2_PREFACE = b'PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n'
+
+
+class StandInServer:
+    """Answer every GET with the same JSON body, over HTTP/1.1 or HTTP/2 (with prior knowledge)"""
+
+    def __init__(self, latency: float, body_size: int, max_streams: int):
+        self.latency = latency
+        self.max_streams = max_streams
+        self.body = json.dumps({'Name': 'STAND-IN', 'Padding': 'x' * body_size}).encode()
+
+        self.nbr_of_connections = 0
+        self.nbr_of_open_connections = 0
+        self.peak_open_connections = 0
+
+        self._loop = asyncio.new_event_loop()
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> None:
+        self._server = self._loop.run_until_complete(asyncio.start_server(self._handle, '127.0.0.1', 0))
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+
+    def reset_counts(self) -> None:
+        self.nbr_of_connections = 0
+        self.peak_open_connections = self.nbr_of_open_connections
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.nbr_of_connections += 1
+        self.nbr_of_open_connections += 1
+        self.peak_open_connections = max(self.peak_open_connections, self.nbr_of_open_connections)
+
+        try:
+            start = await reader.readexactly(len(H2_PREFACE))
+            if start == H2_PREFACE:
+                await self._handle_http2(start, reader, writer)
+            else:
+                await self._handle_http1(start, reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError, h11.RemoteProtocolError):
+            pass  # The client closed the connection
+        finally:
+            self.nbr_of_open_connections -= 1
+            writer.close()
+
+    async def _handle_http1(self, data: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = h11.Connection(h11.SERVER)
+
+        while data:
+            connection.receive_data(data)
+
+            while True:
+                event = connection.next_event()
+
+                if event is h11.NEED_DATA:
+                    break
+                if isinstance(event, h11.ConnectionClosed):
+                    return
+
+                if isinstance(event, h11.EndOfMessage):
+                    await asyncio.sleep(self.latency)
+                    headers = [('content-type', 'application/json'), ('content-length', str(len(self.body)))]
+                    writer.write(connection.send(h11.Response(status_code=200, headers=headers)))
+                    writer.write(connection.send(h11.Data(data=self.body)))
+                    writer.write(connection.send(h11.EndOfMessage()))
+                    await writer.drain()
+                    connection.start_next_cycle()
+
+            data = await reader.read(65536)
+
+    async def _handle_http2(self, data: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        connection.initiate_connection()
+        connection.update_settings({h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: self.max_streams})
+        pending = {}  # Body left to send, by stream ID
+
+        def send_pending():
+            for stream_id, body in list(pending.items()):
+                try:
+                    while body:
+                        size = min(connection.local_flow_control_window(stream_id), connection.max_outbound_frame_size)
+                        if size <= 0:
+                            break  # Waits for a window update
+                        connection.send_data(stream_id, body[:size])
+                        body = body[size:]
+
+                    if body:
+                        pending[stream_id] = body
+                    else:
+                        connection.end_stream(stream_id)
+                        del pending[stream_id]
+                except h2.exceptions.StreamClosedError:
+                    del pending[stream_id]
+
+            writer.write(connection.data_to_send())
+
+        async def respond(stream_id: int):
+            await asyncio.sleep(self.latency)
+            headers = [(':status', '200'), ('content-type', 'application/json'), ('content-length', str(len(self.body)))]
+            connection.send_headers(stream_id, headers)
+            pending[stream_id] = self.body
+            send_pending()
+
+        tasks = set()
+        while data:
+            for event in connection.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    task = asyncio.create_task(respond(event.stream_id))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                elif isinstance(event, h2.events.DataReceived):
+                    connection.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+
+            send_pending()
+            await writer.drain()
+            data = await reader.read(65536)
+
+
+def run_sync(client: Orthanc, nbr_of_requests: int, concurrency: int) -> None:
+    with client, ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda _: client.get_system(), range(nbr_of_requests)))
+
+
+async def run_async(async_client: AsyncOrthanc, nbr_of_requests: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def get_system():
+        async with semaphore:
+            await async_client.get_system()
+
+    async with async_client:
+        await asyncio.gather(*[get_system() for _ in range(nbr_of_requests)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=5_000, help='Number of requests per variant')
+    parser.add_argument('--concurrency', type=int, default=200, help='Number of requests in flight')
+    parser.add_argument('--latency', type=float, default=0.01, help='Response time of the stand-in server (s)')
+    parser.add_argument('--body-size', type=int, default=1_024, help='Size of the response bodies (bytes)')
+    parser.add_argument('--server-max-streams', type=int, default=100, help='Streams per HTTP/2 connection')
+    args = parser.parse_args()
+
+    server = StandInServer(args.latency, args.body_size, args.server_max_streams)
+    server.start()
+
+    variants = [
+        ('Orthanc, HTTP/1.1', lambda: run_sync(
+            Orthanc(server.url, timeout=600), args.requests, args.concurrency
+        )),
+        ('Orthanc, HTTP/2', lambda: run_sync(
+            Orthanc(server.url, timeout=600, transport=HTTP2Transport(prior_knowledge=True)),
+            args.requests, args.concurrency
+        )),
+        ('AsyncOrthanc, HTTP/1.1', lambda: asyncio.run(run_async(
+            AsyncOrthanc(server.url, timeout=600), args.requests, args.concurrency
+        ))),
+        ('AsyncOrthanc, HTTP/2', lambda: asyncio.run(run_async(
+            AsyncOrthanc(server.url, timeout=600, transport=AsyncHTTP2Transport(prior_knowledge=True)),
+            args.requests, args.concurrency
+        ))),
+    ]
+
+    for name, run in variants:
+        time.sleep(0.1)  # Lets the server see the connections of the previous variant closed
+        server.reset_counts()
+
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+
+        print(f'{name:<24}: {args.requests / elapsed:9.1f} requests/s, '
+              f'opened connections: {server.nbr_of_connections:5d}, '
+              f'peak open connections: {server.peak_open_connections:5d}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark the peak memory of listing all the resources of a level
+
+Compares the single `client.get_instances()` call (and the other listings) with `pyorthanc.iter_listing()`.
+Each variant runs in a fresh process, so that the peak RSS of one does not hide the other.
+
+Usage:
+    python scripts/benchmarks/listing_memory.py --url http://localhost:8042 --level Instance --expand
+"""
+import multiprocessing
+import resource
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))  # To import _common
+
+from _common import make_parser, populate  # noqa: E402
+
+from pyorthanc import Orthanc, iter_listing  # noqa: E402
+
+LISTINGS = {'Patient': 'get_patients', 'Study': 'get_studies', 'Series': 'get_series', 'Instance': 'get_instances'}
+
+
+def run_variant(args, variant: str, queue: multiprocessing.Queue) -> None:
+    client = Orthanc(args.url, args.username, args.password, timeout=600)
+    params = {'expand': True} if args.expand else None
+
+    start = time.perf_counter()
+    if variant == 'single call':
+        count = len(getattr(client, LISTINGS[args.level])(params=params))
+    else:
+        page_size = None if variant == 'iter_listing (single request)' else args.page_size
+        count = sum(1 for _ in iter_listing(client, args.level, expand=args.expand, page_size=page_size))
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is in kilobytes on Linux
+    queue.put((count, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument('--level', default='Instance', choices=list(LISTINGS))
+    parser.add_argument('--expand', action='store_true', help='List the main information rather than the identifiers')
+    parser.add_argument('--page-size', type=int, default=1_000)
+    args = parser.parse_args()
+
+    if args.populate is not None:
+        client = Orthanc(args.url, args.username, args.password, timeout=600)
+        print(f'Uploaded {populate(client, *args.populate)} instances')
+
+    context = multiprocessing.get_context('spawn')
+
+    for variant in ['single call', 'iter_listing (single request)', f'iter_listing (pages of {args.page_size})']:
+        queue = context.Queue()
+        process = context.Process(target=run_variant, args=(args, variant, queue))
+        process.start()
+        count, elapsed, peak_rss = queue.get()
+        process.join()
+
+        print(f'{variant:<32}: {count:9d} resources, {elapsed:8.2f} s, peak RSS: {peak_rss:8.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
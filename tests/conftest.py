@@ -2,7 +2,8 @@ import tempfile
 
 import pytest
 
-from pyorthanc import AsyncOrthanc, Instance, Modality, Orthanc, Patient, Series, Study
+from pyorthanc import AsyncInstance, AsyncOrthanc, AsyncPatient, AsyncSeries, AsyncStudy, Instance, Modality, Orthanc, \
+    Patient, Series, Study
 from .data import a_patient, a_series, a_study, an_instance
 from .setup_server import ORTHANC_1, ORTHANC_2, add_modality, clear_data, setup_data
 
@@ -93,6 +94,26 @@ def instance(client_with_data_and_labels):
     return Instance(client=client_with_data_and_labels, id_=an_instance.IDENTIFIER)
 
 
+@pytest.fixture
+def async_patient(client_with_data_and_labels, async_client):
+    return AsyncPatient(client=async_client, id_=a_patient.IDENTIFIER)
+
+
+@pytest.fixture
+def async_study(client_with_data_and_labels, async_client):
+    return AsyncStudy(client=async_client, id_=a_study.IDENTIFIER)
+
+
+@pytest.fixture
+def async_series(client_with_data_and_labels, async_client):
+    return AsyncSeries(client=async_client, id_=a_series.IDENTIFIER)
+
+
+@pytest.fixture
+def async_instance(client_with_data_and_labels, async_client):
+    return AsyncInstance(client=async_client, id_=an_instance.IDENTIFIER)
+
+
 @pytest.fixture
 def tmp_dir():
     with tempfile.TemporaryDirectory() as dir_path:
@@ -0,0 +1,100 @@
+import asyncio
+import io
+from datetime import datetime
+from zipfile import ZipFile
+
+import pytest
+
+from pyorthanc import AsyncInstance, AsyncJob, AsyncPatient, AsyncSeries, AsyncStudy, errors
+from pyorthanc.jobs import State
+from tests.conftest import LABEL_INSTANCE, LABEL_PATIENT, LABEL_SERIES, LABEL_STUDY
+from tests.data import a_patient, a_series, a_study, an_instance
+
+
+def test_patient_attributes(async_patient: AsyncPatient):
+    async def check():
+        assert (await async_patient.main_dicom_tags) == a_patient.INFORMATION['MainDicomTags']
+        assert (await async_patient.patient_id) == a_patient.ID
+        assert (await async_patient.name) == a_patient.NAME
+        assert (await async_patient.birth_date) == datetime(year=1941, month=9, day=1)
+        assert (await async_patient.labels) == [LABEL_PATIENT]
+        assert isinstance(await async_patient.last_update, datetime)
+        assert [s.identifier for s in await async_patient.studies] == a_patient.INFORMATION['Studies']
+
+    asyncio.run(check())
+    assert str(async_patient) == f'AsyncPatient({a_patient.IDENTIFIER})'
+
+
+def test_study_attributes(async_study: AsyncStudy):
+    async def check():
+        assert (await async_study.date) == a_study.DATE
+        assert (await async_study.uid) == a_study.UID
+        assert (await async_study.labels) == [LABEL_STUDY]
+        assert (await async_study.patient_identifier) == a_study.PARENT_PATIENT_IDENTIFIER
+        assert isinstance(await async_study.parent_patient, AsyncPatient)
+        assert sorted([s.identifier for s in await async_study.series]) == sorted(a_study.INFORMATION['Series'])
+
+    asyncio.run(check())
+
+
+def test_series_attributes(async_series: AsyncSeries):
+    async def check():
+        assert (await async_series.modality) == a_series.MODALITY
+        assert (await async_series.manufacturer) == a_series.MANUFACTURER
+        assert (await async_series.labels) == [LABEL_SERIES]
+        assert (await async_series.image_orientation_patient) == [1, 0, 0, 0, 1, 0]
+        assert isinstance(await async_series.parent_study, AsyncStudy)
+        assert [i.identifier for i in await async_series.instances] == a_series.INSTANCES
+
+        with pytest.raises(errors.TagDoesNotExistError):
+            await async_series.protocol_name
+
+    asyncio.run(check())
+
+
+def test_instance_attributes(async_instance: AsyncInstance):
+    async def check():
+        assert (await async_instance.uid) == an_instance.UID
+        assert (await async_instance.file_size) == an_instance.FILE_SIZE
+        assert (await async_instance.labels) == [LABEL_INSTANCE]
+        assert (await async_instance.series_identifier) == an_instance.SERIES_ID
+        assert isinstance(await async_instance.parent_patient, AsyncPatient)
+
+    asyncio.run(check())
+
+
+def test_download(async_series: AsyncSeries):
+    buffer = io.BytesIO()
+    asyncio.run(async_series.download(buffer))
+    buffer.seek(0)
+
+    assert ZipFile(buffer).testzip() is None
+
+
+def test_anonymize_as_job(async_series: AsyncSeries):
+    async def anonymize():
+        job = await async_series.anonymize_as_job()
+        await job.wait_until_completion(time_interval=1)
+        anonymous_series = AsyncSeries((await job.content)['ID'], async_series.client)
+
+        # Awaited within the same event loop, the connections of the client are bound to it
+        return job, await job.state, await anonymous_series.uid
+
+    job, state, anonymous_uid = asyncio.run(anonymize())
+
+    assert isinstance(job, AsyncJob)
+    assert state == State.success
+    assert anonymous_uid != a_series.UID
+
+
+def test_label_invalidates_information(async_series: AsyncSeries):
+    async def check():
+        assert 'a_label' not in await async_series.labels
+
+        await async_series.add_label('a_label')
+        assert 'a_label' in await async_series.labels
+
+        await async_series.remove_label('a_label')
+        assert 'a_label' not in await async_series.labels
+
+    asyncio.run(check())
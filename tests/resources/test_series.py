@@ -237,3 +237,33 @@ def test_label(series, label):
 
     series.remove_label(label)
     assert label not in series.labels
+
+
+def test_information_cache(series):
+    assert series.information == series.get_main_information()
+
+    cached_information = series.information
+    assert series.information is cached_information  # Cached for information_ttl seconds
+
+    series.refresh()
+    assert series.information is not cached_information
+
+    series.information_ttl = 0
+    cached_information = series.information
+    assert series.information is not cached_information
+
+
+def test_anonymize_without_source_invalidates_information(series):
+    assert series.information == series.get_main_information()
+
+    series.anonymize(keep_source=False)
+
+    with pytest.raises(httpx.HTTPError):  # The source series has been deleted, not read from the cache
+        series.information
+
+
+def test_children_inherit_information_ttl(client_with_data_and_labels):
+    series = Series(a_series.IDENTIFIER, client_with_data_and_labels, information_ttl=None)
+
+    assert all(i.information_ttl is None for i in series.instances)
+    assert series.parent_study.information_ttl is None
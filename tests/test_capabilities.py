@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from pyorthanc import async_get_capabilities, get_capabilities
+from pyorthanc.capabilities import Capabilities
+
+
+def test_get_capabilities(client):
+    capabilities = get_capabilities(client, refresh=True)
+    system = client.get_system()
+
+    assert capabilities.version == system['Version']
+    assert capabilities.api_version == system['ApiVersion']
+    assert capabilities.plugins is None  # Only queried when requested
+    assert capabilities.is_version_at_least('1.0.0')
+    assert get_capabilities(client) is capabilities  # Cached
+
+    assert get_capabilities(client, with_plugins=True).plugins == client.get_plugins()
+
+
+def test_async_get_capabilities(async_client):
+    capabilities = asyncio.run(async_get_capabilities(async_client, refresh=True))
+
+    assert capabilities.version != ''
+    assert capabilities.is_version_at_least('1.0.0')
+
+
+@pytest.mark.parametrize('server_version, version, expected', [
+    ('1.12.5', '1.12.5', True),
+    ('1.12.5', '1.12.4', True),
+    ('1.12.5', '1.9.4', True),
+    ('1.12.4', '1.12.5', False),
+    ('1.9.7', '1.12.0', False),
+    ('mainline', '99.0.0', True),
+])
+def test_is_version_at_least(server_version, version, expected):
+    capabilities = Capabilities({'Version': server_version}, plugins=[], is_http_compression_enabled=False)
+
+    assert capabilities.is_version_at_least(version) == expected
+
+
+def test_extended_capabilities():
+    system = {'Version': '1.12.5', 'Capabilities': {'HasExtendedFind': True, 'HasExtendedChanges': False}}
+
+    capabilities = Capabilities(system, plugins=['dicom-web'], is_http_compression_enabled=True)
+
+    assert capabilities.has_extended_find
+    assert not capabilities.has_extended_changes
+    assert capabilities.has_plugin('dicom-web')
+    assert not capabilities.has_plugin('transfers')
+
+
+def test_has_plugin_without_plugins():
+    capabilities = Capabilities({'Version': '1.12.5'})
+
+    with pytest.raises(ValueError):
+        capabilities.has_plugin('dicom-web')
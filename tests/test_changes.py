@@ -0,0 +1,49 @@
+import asyncio
+
+from pyorthanc import AsyncChangesFeed, ChangesFeed
+
+
+def test_changes_feed(client_with_data, tmp_path):
+    checkpoint_path = str(tmp_path / 'changes.checkpoint')
+    expected = client_with_data.get_changes(params={'since': 0, 'limit': 10_000})['Changes']
+
+    feed = ChangesFeed(client_with_data, since=0, limit=5, checkpoint_path=checkpoint_path, stop_when_done=True)
+    result = [change for changes in feed for change in changes]
+
+    assert [c['Seq'] for c in result] == [c['Seq'] for c in expected]
+    assert all(len(changes) <= 5 for changes in ChangesFeed(client_with_data, since=0, limit=5, stop_when_done=True))
+    with open(checkpoint_path) as file:
+        assert int(file.read()) == expected[-1]['Seq']
+
+    # Resumes from the checkpoint
+    assert list(ChangesFeed(client_with_data, checkpoint_path=checkpoint_path, stop_when_done=True)) == []
+
+
+def test_changes_feed_with_change_types(client_with_data):
+    feed = ChangesFeed(client_with_data, change_types=['NewInstance'], since=0, limit=5, stop_when_done=True)
+    result = [change for changes in feed for change in changes]
+
+    assert len(result) > 0
+    assert all(c['ChangeType'] == 'NewInstance' for c in result)
+
+
+def test_changes_feed_run(client_with_data):
+    batches = []
+
+    feed = ChangesFeed(client_with_data, since=0, limit=2, stop_when_done=True)
+    feed.run(batches.append, max_workers=4)
+
+    expected = client_with_data.get_changes(params={'since': 0, 'limit': 10_000})['Changes']
+    assert sorted(c['Seq'] for changes in batches for c in changes) == [c['Seq'] for c in expected]
+    assert feed.since == expected[-1]['Seq']
+
+
+def test_async_changes_feed(async_client_with_data, client_with_data):
+    async def collect():
+        feed = AsyncChangesFeed(async_client_with_data, since=0, limit=5, stop_when_done=True)
+        return [change async for changes in feed for change in changes]
+
+    result = asyncio.run(collect())
+
+    expected = client_with_data.get_changes(params={'since': 0, 'limit': 10_000})['Changes']
+    assert [c['Seq'] for c in result] == [c['Seq'] for c in expected]
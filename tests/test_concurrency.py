@@ -0,0 +1,54 @@
+import asyncio
+
+import httpx
+import pytest
+
+from pyorthanc._concurrency import AdaptiveLimiter, is_overload_error
+
+
+def test_adaptive_limiter_bounds_concurrency_and_retries():
+    in_flight = 0
+    peak = 0
+    failures = {i: 1 for i in range(0, 20, 5)}  # Some calls fail once with a 503
+
+    async def request(i):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+
+        if failures.get(i, 0) > 0:
+            failures[i] -= 1
+            raise httpx.HTTPError('HTTP code: 503, with content: busy')
+
+        return i
+
+    async def run():
+        limiter = AdaptiveLimiter(max_concurrency=3, backoff=0.001)
+        return limiter, await asyncio.gather(*[limiter.call(request, i) for i in range(20)])
+
+    limiter, result = asyncio.run(run())
+
+    assert result == list(range(20))
+    assert peak <= 3
+    assert limiter.nbr_of_retries == 4
+
+
+def test_adaptive_limiter_does_not_retry_other_errors():
+    async def request():
+        raise httpx.HTTPError('HTTP code: 404, with content: not found')
+
+    with pytest.raises(httpx.HTTPError):
+        asyncio.run(AdaptiveLimiter(max_concurrency=2).call(request))
+
+
+@pytest.mark.parametrize('error, expected', [
+    (httpx.HTTPError('HTTP code: 503, with content: busy'), True),
+    (httpx.HTTPError('HTTP code: 429, with content: too many requests'), True),
+    (httpx.ReadTimeout('timeout'), True),
+    (httpx.HTTPError('HTTP code: 500, with content: error'), False),
+    (ValueError('HTTP code: 503,'), False),
+])
+def test_is_overload_error(error, expected):
+    assert is_overload_error(error) == expected
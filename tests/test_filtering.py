@@ -1,8 +1,15 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from unittest.mock import patch
+
 import pytest
 
-from pyorthanc import Instance, Patient, Series, Study, find
+from pyorthanc import Instance, Orthanc, Patient, Series, Study, async_iter_find, filters, find, iter_find, profile
+from pyorthanc._filtering import _async_build_patients
 from pyorthanc.util import make_datetime_from_dicom_date
 from tests.data import a_patient, a_series, a_study, an_instance
+from .conftest import LABEL_SERIES, LABEL_STUDY
 
 
 @pytest.mark.parametrize(
@@ -59,3 +66,193 @@ def test_find(client_fixture, patient_filter, study_filter, series_filter, insta
         instance = series.instances[0]
         assert type(instance) == Instance
         assert instance.uid == an_instance.INFORMATION['MainDicomTags']['SOPInstanceUID']
+
+
+@pytest.mark.parametrize('max_concurrency', [1, 4])
+def test_find_with_max_concurrency(async_client_with_data, max_concurrency):
+    patients = find(
+        orthanc=async_client_with_data,
+        series_filter=lambda s: s.modality == 'RTDOSE',
+        max_concurrency=max_concurrency
+    )
+
+    assert len(patients) == 1
+    assert len(patients[0].studies[0].series) == 1
+    assert patients[0].studies[0].series[0].uid == a_series.INFORMATION['MainDicomTags']['SeriesInstanceUID']
+
+
+@pytest.mark.parametrize('client_fixture', ['client_with_data', 'async_client_with_data'])
+@pytest.mark.parametrize('series_filter, expected_nbr_of_series', [
+    (None, 3),
+    (lambda s: s.modality == 'RTDOSE', 1),
+    (lambda s: s.modality == 'NOT_EXISTING_MODALITY', 0),
+])
+def test_find_with_snapshot(client_fixture, series_filter, expected_nbr_of_series, request):
+    patients = find(
+        orthanc=request.getfixturevalue(client_fixture),
+        series_filter=series_filter,
+        snapshot=True
+    )
+
+    assert len(patients) == (1 if expected_nbr_of_series else 0)
+    if expected_nbr_of_series:
+        assert patients[0].patient_id == a_patient.ID
+        assert len(patients[0].studies[0].series) == expected_nbr_of_series
+        assert sum(len(s.instances) for s in patients[0].studies[0].series) == expected_nbr_of_series
+
+
+@pytest.mark.parametrize('client_fixture', ['client_with_data', 'async_client_with_data'])
+def test_find_with_snapshot_sends_no_per_resource_requests(client_fixture, request):
+    with profile() as p:
+        patients = find(orthanc=request.getfixturevalue(client_fixture), snapshot=True)
+
+        for patient in patients:
+            for study in patient.studies:
+                for series in study.series:
+                    assert series.information['ID'] == series.id_
+                    assert all(instance.information['ParentSeries'] == series.id_ for instance in series.instances)
+
+    # Only the paged listings of the levels, the resources are never queried one by one
+    assert p.count() == p.count('/patients') + p.count('/studies') + p.count('/series') + p.count('/instances')
+    assert patients[0].information_ttl is None
+
+
+@pytest.mark.parametrize('client_fixture', ['client_with_data_and_labels', 'async_client_with_data'])
+@pytest.mark.parametrize('patient_filter, study_filter, series_filter, expected_nbr_of_series', [
+    (filters.Equals('PatientName', 'MR-R'), None, None, 3),
+    (filters.Wildcard('PatientName', 'NOT_EXISTING*'), None, None, 0),
+    (filters.Wildcard('PatientName', 'MR-?'), None, None, 3),
+    (filters.Equals('PatientName', 'mr-r'), None, None, 0),  # Orthanc matches person names case-insensitively
+    (None, None, filters.Equals('Modality', 'RT*'), 0),  # Orthanc reads '*' as a wildcard
+    (None, None, filters.Equals('Modality', 'rtdose'), 0),  # Orthanc matches the modality case-insensitively
+    (None, filters.DateRange('StudyDate', date(2010, 1, 1), date(2010, 12, 31)), None, 3),
+    (None, filters.DateRange('StudyDate', end=date(1999, 1, 1)), None, 0),
+    (None, None, filters.Equals('Modality', 'RTDOSE'), 1),
+    (None, None, filters.InSet('Modality', ['RTDOSE', 'RTPLAN']), 2),
+    (None, None, filters.InSet('Modality', ['RTDOSE']) & (lambda s: s.modality == 'NOT_EXISTING_MODALITY'), 0),
+])
+def test_find_with_declarative_filters(client_fixture, patient_filter, study_filter, series_filter,
+                                       expected_nbr_of_series, request):
+    patients = find(
+        orthanc=request.getfixturevalue(client_fixture),
+        patient_filter=patient_filter,
+        study_filter=study_filter,
+        series_filter=series_filter
+    )
+
+    assert len(patients) == (1 if expected_nbr_of_series else 0)
+    if expected_nbr_of_series:
+        assert patients[0].patient_id == a_patient.ID
+        assert len(patients[0].studies[0].series) == expected_nbr_of_series
+
+
+@pytest.mark.parametrize('level, resource_filter, expected_query', [
+    ('Series', filters.Equals('Modality', 'CT'), {'Modality': 'CT'}),
+    ('Series', filters.Equals('Modality', 'C*'), {'Modality': 'C*'}),
+    ('Patient', filters.Equals('PatientName', 'DOE^JOHN'), {'PatientName': 'DOE^JOHN'}),
+    ('Study', filters.Wildcard('StudyDescription', 'HEAD*'), {'StudyDescription': 'HEAD*'}),
+    ('Series', filters.InSet('Modality', ['CT', 'MR']), {'Modality': 'CT\\MR'}),
+])
+def test_split_filter(level, resource_filter, expected_query):
+    query, labels_filter, leftover = filters.split_filter(resource_filter, level)
+
+    assert query == expected_query
+    assert labels_filter is None
+    assert leftover is resource_filter  # Checked again on the client, Orthanc matches more loosely
+
+
+def test_wildcard_matches_brackets_literally():
+    resource = Series('an-id', Orthanc('http://localhost:8042'))  # No request, the tags are set
+    resource._main_dicom_tags = {'SeriesDescription': 'T1[post]'}
+
+    assert filters.Wildcard('SeriesDescription', 'T1[post]*')(resource)
+    assert not filters.Wildcard('SeriesDescription', 'T1[pt]ost]')(resource)
+    assert not filters.Wildcard('SeriesDescription', 't1*')(resource)
+
+
+def test_find_with_labels_filter(client_with_data_and_labels):
+    patients = find(
+        orthanc=client_with_data_and_labels,
+        study_filter=filters.HasLabels(LABEL_STUDY),
+        series_filter=filters.HasLabels([LABEL_SERIES])
+    )
+
+    assert len(patients) == 1
+    assert len(patients[0].studies[0].series) == 1
+    assert patients[0].studies[0].series[0].uid == a_series.INFORMATION['MainDicomTags']['SeriesInstanceUID']
+
+    patients = find(client_with_data_and_labels, series_filter=filters.HasLabels('NOT_EXISTING_LABEL'))
+    assert patients == []
+
+
+@pytest.mark.parametrize('series_filter, expected_nbr_of_series', [
+    (None, 3),
+    (lambda s: s.modality == 'RTDOSE', 1),
+    (lambda s: s.modality == 'NOT_EXISTING_MODALITY', 0),
+])
+def test_find_with_max_workers(client_with_data, series_filter, expected_nbr_of_series):
+    patients = find(orthanc=client_with_data, series_filter=series_filter, max_workers=4)
+
+    assert len(patients) == (1 if expected_nbr_of_series else 0)
+    if expected_nbr_of_series:
+        assert patients[0].patient_id == a_patient.ID
+        assert len(patients[0].studies[0].series) == expected_nbr_of_series
+        assert [s.id_ for s in patients[0].studies[0].series] == \
+               [s.id_ for s in find(client_with_data, series_filter=series_filter)[0].studies[0].series]
+
+    with pytest.raises(ValueError):
+        find(orthanc=client_with_data, max_workers=0)
+
+
+@pytest.mark.parametrize('series_filter, expected_nbr_of_series', [
+    (None, 3),
+    (lambda s: s.modality == 'RTDOSE', 1),
+    (filters.Equals('Modality', 'RTDOSE'), 1),
+    (lambda s: s.modality == 'NOT_EXISTING_MODALITY', 0),
+])
+def test_iter_find(client_with_data, async_client_with_data, series_filter, expected_nbr_of_series):
+    async def collect():
+        return [p async for p in async_iter_find(async_client_with_data, series_filter=series_filter)]
+
+    for patients in [list(iter_find(client_with_data, series_filter=series_filter)), asyncio.run(collect())]:
+        assert len(patients) == (1 if expected_nbr_of_series else 0)
+        if expected_nbr_of_series:
+            assert type(patients[0]) == Patient
+            assert patients[0].patient_id == a_patient.ID
+            assert len(patients[0].studies[0].series) == expected_nbr_of_series
+
+
+def test_async_iter_find_with_declarative_filters_and_max_concurrency(async_client_with_data):
+    async def collect():
+        return [p async for p in async_iter_find(
+            async_client_with_data, series_filter=filters.Equals('Modality', 'RTDOSE'), max_concurrency=2
+        )]
+
+    with patch('pyorthanc._filtering.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as executor:
+        patients = asyncio.run(collect())
+
+    executor.assert_called_once_with(max_workers=2)
+    assert [s.uid for s in patients[0].studies[0].series] == [a_series.UID]
+
+
+def test_async_build_patients_bounds_the_pending_patients():
+    nbr_of_pending, max_nbr_of_pending = 0, 0
+
+    async def build_patient(patient_id, *args):
+        nonlocal nbr_of_pending, max_nbr_of_pending
+        nbr_of_pending += 1
+        max_nbr_of_pending = max(max_nbr_of_pending, nbr_of_pending)
+        await asyncio.sleep(0)
+        nbr_of_pending -= 1
+
+        return patient_id
+
+    async def collect():
+        patients = _async_build_patients([str(i) for i in range(100)], None, None, None, 10, None, None, None, None)
+        return [p async for p in patients]
+
+    with patch('pyorthanc._filtering._async_build_patient', build_patient):
+        patient_identifiers = asyncio.run(collect())
+
+    assert sorted(patient_identifiers, key=int) == [str(i) for i in range(100)]
+    assert max_nbr_of_pending == 10
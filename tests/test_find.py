@@ -1,7 +1,13 @@
+import json
+from unittest.mock import patch
+
+import httpx
 import pytest
 
-from pyorthanc import find_instances, find_patients, find_series, find_studies, query_orthanc
-from pyorthanc._find import DEFAULT_RESOURCES_LIMIT
+from pyorthanc import AdaptivePager, FindCursor, Orthanc, count_instances, count_patients, count_resources, \
+    count_series, count_studies, find_instances, find_patients, find_series, find_studies, query_orthanc
+from pyorthanc._find import DEFAULT_RESOURCES_LIMIT, PREFIX_COMPRESSION_MIN_VALUES, PREFIX_COMPRESSION_WILDCARDS, \
+    _split_multiple_values
 from .conftest import LABEL_INSTANCE, LABEL_PATIENT, LABEL_SERIES, LABEL_STUDY
 from .data import a_patient, a_series, a_study, an_instance
 
@@ -146,3 +152,224 @@ def test_query_orthanc_errors(client_with_data_and_labels, level, labels_constra
             level=level,
             labels_constraint=labels_constraint
         )
+
+
+def test_query_orthanc_seeds_main_information(client_with_data_and_labels):
+    result = query_orthanc(client=client_with_data_and_labels, level='Series', query={'Modality': 'RTDose'})
+
+    assert len(result) == 1
+    assert result[0]._main_dicom_tags == a_series.INFORMATION['MainDicomTags']
+    assert result[0].modality == a_series.MODALITY
+
+
+@pytest.mark.parametrize('limit, since, max_workers', [
+    (1, DEFAULT_SINCE, 1),
+    (1, DEFAULT_SINCE, 4),
+    (2, 1, 4),
+    (DEFAULT_RESOURCES_LIMIT, DEFAULT_SINCE, 2),
+])
+def test_query_orthanc_with_max_workers(client_with_data_and_labels, limit, since, max_workers):
+    expected = query_orthanc(client_with_data_and_labels, level='Instance', limit=limit, since=since)
+
+    result = query_orthanc(
+        client_with_data_and_labels,
+        level='Instance',
+        limit=limit,
+        since=since,
+        max_workers=max_workers
+    )
+
+    assert [r.id_ for r in result] == [r.id_ for r in expected]
+
+
+@pytest.mark.parametrize('page_size', [1, 2, DEFAULT_RESOURCES_LIMIT])
+def test_find_cursor(client_with_data_and_labels, page_size):
+    expected = query_orthanc(client_with_data_and_labels, level='Instance')
+
+    result = list(FindCursor(client_with_data_and_labels, 'Instance', page_size=page_size))
+
+    assert sorted([r.id_ for r in result]) == sorted([r.id_ for r in expected])
+
+
+def test_find_cursor_resume(client_with_data_and_labels):
+    cursor = FindCursor(client_with_data_and_labels, 'Series', page_size=1)
+    first_page = cursor.fetch_page()
+
+    resumed_cursor = FindCursor(
+        client_with_data_and_labels,
+        'Series',
+        page_size=1,
+        position=cursor.position,
+        anchor=cursor.anchor
+    )
+    remaining_series = list(resumed_cursor)
+
+    assert len(first_page) == 1
+    assert len(remaining_series) == 2
+    assert first_page[0].id_ not in [s.id_ for s in remaining_series]
+    assert resumed_cursor.exhausted
+
+
+@pytest.mark.parametrize('nbr_of_inserted', [1, 2, 3, 7])
+def test_find_cursor_with_insertions_before_anchor(nbr_of_inserted):
+    identifiers = ['b', 'd', 'f', 'h']
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/system':
+            return httpx.Response(200, json={'Version': '1.12.1'})
+
+        data = json.loads(request.content)
+        page = identifiers[data['Since']:data['Since'] + data['Limit']]
+        return httpx.Response(200, json=[{'ID': i, 'Type': 'Series', 'MainDicomTags': {}} for i in page])
+
+    client = Orthanc('http://cursor-test', transport=httpx.MockTransport(handler))
+    cursor = FindCursor(client, 'Series', page_size=2)
+
+    first_page = [r.id_ for r in cursor.fetch_page()]
+    identifiers[:0] = [f'a{i}' for i in range(nbr_of_inserted)]  # Inserted before the anchor
+
+    assert first_page == ['b', 'd']
+    assert [r.id_ for r in cursor] == ['f', 'h']
+
+
+def test_query_orthanc_with_order_by(client_with_data_and_labels):
+    order_by = [{'Type': 'DicomTag', 'Key': 'SOPInstanceUID', 'Direction': 'DESC'}]
+
+    result = query_orthanc(client_with_data_and_labels, level='Instance', order_by=order_by)
+
+    uids = [r.uid for r in result]
+    assert uids == sorted(uids, reverse=True)
+
+
+def test_query_orthanc_with_requested_tags(client_with_data_and_labels):
+    result = query_orthanc(
+        client=client_with_data_and_labels,
+        level='Instance',
+        query={'InstanceCreationDate': an_instance.CREATION_DATE},
+        labels=[LABEL_INSTANCE],
+        requested_tags=['Modality', 'Manufacturer']
+    )
+
+    assert len(result) == 1
+    assert result[0].requested_tags == {'Modality': a_series.MODALITY, 'Manufacturer': a_series.MANUFACTURER}
+
+
+@pytest.mark.parametrize('level, query, labels, expected', [
+    ('Patient', None, None, 1),
+    ('Study', None, None, 1),
+    ('Series', None, None, 3),
+    ('Series', {'Modality': 'RTDose'}, None, 1),
+    ('Series', {'Modality': 'RTDose'}, [LABEL_SERIES], 1),
+    ('Series', None, ['NOT_EXISTING_LABEL'], 0),
+    ('Instance', {'Modality': 'NOT_EXISTING_MODALITY'}, None, 0),
+])
+def test_count_resources(client_with_data_and_labels, level, query, labels, expected):
+    result = count_resources(client_with_data_and_labels, level, query, labels)
+
+    assert result == expected
+    assert result == len(query_orthanc(client_with_data_and_labels, level, query, labels))
+
+
+def test_count_resources_when_the_capabilities_cannot_be_queried(client_with_data):
+    with patch('pyorthanc.capabilities.get_capabilities', side_effect=httpx.HTTPError('HTTP code: 403')):
+        result = count_resources(client_with_data, 'Series', {'Modality': 'RTDose'})  # Pages the identifiers
+
+    assert result == 1
+
+
+def test_count_functions(client_with_data):
+    assert count_patients(client_with_data) == len(find_patients(client_with_data))
+    assert count_studies(client_with_data) == len(find_studies(client_with_data))
+    assert count_series(client_with_data, query={'Modality': 'RTDose'}) == 1
+    assert count_instances(client_with_data) == len(find_instances(client_with_data))
+
+
+@pytest.mark.parametrize('modalities, prefix_compression, expected', [
+    (['RTDose', 'RTPlan'], False, 2),
+    (['RTDose', 'RTDose', 'NOT_EXISTING_MODALITY'], False, 1),
+    (['RT*', 'RTDose'], False, 3),
+    ([], False, 0),
+    (['RTDose', 'RTPlan', 'RTStruct'], True, 3),
+])
+def test_query_orthanc_with_multiple_values(client_with_data, modalities, prefix_compression, expected):
+    result = query_orthanc(
+        client_with_data, 'Series', query={'Modality': modalities}, prefix_compression=prefix_compression
+    )
+
+    assert len(result) == expected
+    assert len({r.id_ for r in result}) == expected  # No duplicates
+
+
+@pytest.mark.parametrize('with_series_uid, expected', [(True, [a_series.IDENTIFIER]), (False, [])])
+def test_query_orthanc_with_prefix_compression(client_with_data, with_series_uid, expected):
+    prefix = a_series.UID[:-PREFIX_COMPRESSION_WILDCARDS]
+    values = [f'{prefix}{i:0{PREFIX_COMPRESSION_WILDCARDS}d}' for i in range(PREFIX_COMPRESSION_MIN_VALUES + 2)]
+    values = [v for v in values if v != a_series.UID] + ([a_series.UID] if with_series_uid else [])
+
+    assert _split_multiple_values(values, prefix_compression=True) == [(prefix + '??', True)]  # A single query
+
+    result = query_orthanc(
+        client_with_data, 'Series', query={'SeriesInstanceUID': values}, prefix_compression=True
+    )
+
+    assert [r.id_ for r in result] == expected  # The wildcard matches are filtered on the exact values
+
+
+def test_query_orthanc_with_prefix_compression_and_other_case(client_with_data):
+    prefix = a_patient.ID.lower()[:-PREFIX_COMPRESSION_WILDCARDS]
+    values = [f'{prefix}{i:0{PREFIX_COMPRESSION_WILDCARDS}d}' for i in range(PREFIX_COMPRESSION_MIN_VALUES + 2)]
+
+    compressed = query_orthanc(client_with_data, 'Patient', query={'PatientID': values}, prefix_compression=True)
+    exact = query_orthanc(client_with_data, 'Patient', query={'PatientID': values})
+
+    # Orthanc matches the identifiers case-insensitively, with or without the compression
+    assert [r.id_ for r in compressed] == [r.id_ for r in exact] == [a_patient.IDENTIFIER]
+
+
+@pytest.mark.parametrize('kwargs', [{'since': 1}, {'order_by': []}, {'retrieve_all_resources': False}])
+def test_query_orthanc_with_multiple_values_and_window(client_with_data, kwargs):
+    with pytest.raises(ValueError):
+        query_orthanc(client_with_data, 'Series', query={'Modality': ['RTDose', 'RTPlan']}, **kwargs)
+
+
+def test_find_patients_with_multiple_values(client_with_data):
+    result = find_patients(client_with_data, query={'PatientID': [a_patient.ID, 'NOT_EXISTING_ID']}, max_workers=2)
+
+    assert [r.id_ for r in result] == [a_patient.IDENTIFIER]
+
+    with pytest.raises(ValueError):
+        find_patients(client_with_data, query={'PatientID': [a_patient.ID], 'PatientName': ['A', 'B']})
+
+
+def test_query_orthanc_with_pager(client_with_data):
+    pager = AdaptivePager(initial_limit=2, min_limit=1, max_limit=10)
+
+    result = query_orthanc(client_with_data, 'Instance', pager=pager)
+    expected = query_orthanc(client_with_data, 'Instance')
+
+    assert [r.id_ for r in result] == [r.id_ for r in expected]
+    assert sum(page.nbr_of_resources for page in pager.history) == len(expected)
+    assert pager.history[0].limit == 2
+    assert all(1 <= page.limit <= 10 for page in pager.history)
+
+    with pytest.raises(ValueError):
+        query_orthanc(client_with_data, 'Instance', pager=pager, max_workers=2)
+
+    with pytest.raises(ValueError):
+        query_orthanc(client_with_data, 'Series', query={'Modality': ['RTDose', 'RTPlan']}, pager=pager)
+
+    with pytest.raises(ValueError):
+        query_orthanc(client_with_data, 'Series', query={'Modality': ['RTDose']}, pager=pager, max_workers=2)
+
+
+@pytest.mark.parametrize('duration, nbr_of_bytes, expected_limit', [
+    (0.5, 1_000, 200),  # Fast and small pages, the limit is doubled
+    (2., 1_000, 50),  # Slow pages
+    (0.5, 16 * 1024 * 1024, 50),  # Large pages
+])
+def test_adaptive_pager_record(duration, nbr_of_bytes, expected_limit):
+    pager = AdaptivePager(initial_limit=100, min_limit=10, target_duration=1., max_page_bytes=8 * 1024 * 1024)
+
+    pager.record(100, 100, duration, nbr_of_bytes)
+
+    assert pager.limit == expected_limit
@@ -0,0 +1,124 @@
+import asyncio
+
+import httpx
+import pytest
+
+from pyorthanc import AsyncSeries, Orthanc, Series, async_iter_listing, async_iter_series, iter_instances, \
+    iter_listing, iter_query_orthanc, iter_series, query_orthanc
+from .conftest import LABEL_SERIES
+from .data import a_series
+
+ALL_SERIES = [
+    '60108266-ece4d8f7-7b028286-a7b61f25-c6d33f0b',
+    'c4c1fcc9-ae63f793-40cbcf25-fbd3efe5-ad72ff06',
+    'e2a7df26-99673e0f-05aa84cd-c89677c0-634a2a96'
+]
+
+
+@pytest.mark.parametrize('limit', [1, 2, 1000])
+def test_iter_series(client_with_data_and_labels, limit):
+    result = list(iter_series(client_with_data_and_labels, limit=limit))
+
+    assert sorted([s.id_ for s in result]) == sorted(ALL_SERIES)
+    assert all(isinstance(s, Series) for s in result)
+
+
+def test_iter_series_with_query_and_labels(client_with_data_and_labels):
+    result = list(iter_series(client_with_data_and_labels, query={'Modality': 'RTDose'}, labels=[LABEL_SERIES]))
+
+    assert [s.id_ for s in result] == [a_series.IDENTIFIER]
+    assert result[0].modality == a_series.MODALITY
+
+
+def test_iter_instances_stops_early(client_with_data_and_labels):
+    iterator = iter_instances(client_with_data_and_labels, limit=1)
+    first_instance = next(iterator)
+    iterator.close()
+
+    assert first_instance.id_ is not None
+
+
+def test_iter_query_orthanc_errors(client_with_data_and_labels):
+    with pytest.raises(ValueError):
+        iter_query_orthanc(client_with_data_and_labels, level='bad_level')
+
+
+def test_async_iter_series(async_client_with_data):
+    async def collect():
+        return [s async for s in async_iter_series(async_client_with_data, limit=2)]
+
+    result = asyncio.run(collect())
+
+    assert sorted([s.id_ for s in result]) == sorted(ALL_SERIES)
+    assert all(isinstance(s, AsyncSeries) for s in result)
+
+
+def test_iter_series_with_multiple_values(client_with_data, async_client_with_data):
+    query = {'Modality': ['RTDOSE', 'RT*', 'NOT_EXISTING_MODALITY']}  # RTDOSE matches two sub-queries
+
+    async def collect():
+        return [s async for s in async_iter_series(async_client_with_data, query=query, limit=1)]
+
+    expected = sorted(s.id_ for s in query_orthanc(client_with_data, 'Series', query))
+    assert sorted(s.id_ for s in iter_series(client_with_data, query=query, limit=1)) == expected
+    assert sorted(s.id_ for s in asyncio.run(collect())) == expected
+
+    with pytest.raises(ValueError):
+        iter_series(client_with_data, query=query, since=1)
+
+
+def test_async_iter_series_stops_early(async_client_with_data):
+    async def take_first():
+        iterator = async_iter_series(async_client_with_data, limit=1)
+        async for series in iterator:
+            break
+        await iterator.aclose()
+
+        # The prefetched page has been cancelled, not left pending
+        return series, asyncio.all_tasks() - {asyncio.current_task()}
+
+    first_series, pending_tasks = asyncio.run(take_first())
+
+    assert first_series.id_ in ALL_SERIES
+    assert pending_tasks == set()
+
+
+@pytest.mark.parametrize('level, listing', [
+    ('Patient', 'get_patients'), ('Study', 'get_studies'), ('Series', 'get_series'), ('Instance', 'get_instances')
+])
+@pytest.mark.parametrize('page_size', [None, 1, 2, 1_000])
+def test_iter_listing(client_with_data, level, listing, page_size):
+    result = list(iter_listing(client_with_data, level, page_size=page_size))
+
+    assert result == getattr(client_with_data, listing)()
+
+
+@pytest.mark.parametrize('page_size', [0, -1])
+def test_iter_listing_with_bad_page_size(client_with_data, async_client_with_data, page_size):
+    async def collect():
+        return [i async for i in async_iter_listing(async_client_with_data, 'Series', page_size=page_size)]
+
+    with pytest.raises(ValueError):
+        list(iter_listing(client_with_data, 'Series', page_size=page_size))
+
+    with pytest.raises(ValueError):
+        asyncio.run(collect())
+
+
+def test_iter_listing_expand(client_with_data, async_client_with_data):
+    async def collect():
+        return [i async for i in async_iter_listing(async_client_with_data, 'Series', expand=True, page_size=2)]
+
+    expected = client_with_data.get_series(params={'expand': True})
+
+    assert list(iter_listing(client_with_data, 'Series', expand=True, page_size=2)) == expected
+    assert asyncio.run(collect()) == expected
+
+
+@pytest.mark.parametrize('body', [b'{"HttpError": "Bad Request"}', b'["a", "b"', b''])
+def test_iter_listing_with_bad_body(body):
+    transport = httpx.MockTransport(lambda _: httpx.Response(200, content=body))
+    client = Orthanc('http://listing-with-bad-body', transport=transport)
+
+    with pytest.raises(ValueError):
+        list(iter_listing(client, 'Patient'))
@@ -0,0 +1,79 @@
+import pytest
+
+from pyorthanc import LocalIndex, Series, Study, query_orthanc
+from tests.data import a_patient, a_series
+from .conftest import LABEL_SERIES
+
+
+@pytest.fixture
+def index(client_with_data_and_labels, tmp_path):
+    with LocalIndex(client_with_data_and_labels, str(tmp_path / 'index.sqlite')) as index:
+        index.synchronize()
+        yield index
+
+
+@pytest.mark.parametrize('level, query, labels, labels_constraint', [
+    ('Patient', {}, None, 'All'),
+    ('Study', {'StudyDate': '20100101-20101231'}, None, 'All'),
+    ('Series', {'Modality': 'RTDOSE'}, None, 'All'),
+    ('Series', {'Modality': 'RTDOSE\\RTPLAN'}, None, 'All'),
+    ('Series', {'PatientID': a_patient.ID[:3] + '*'}, None, 'All'),
+    ('Series', {}, [LABEL_SERIES], 'All'),
+    ('Series', {}, [LABEL_SERIES], 'None'),
+    ('Instance', {'Modality': 'NOT_EXISTING_MODALITY'}, None, 'All'),
+])
+def test_query(index, client_with_data_and_labels, level, query, labels, labels_constraint):
+    result = index.query(level, query, labels, labels_constraint)
+    expected = query_orthanc(client_with_data_and_labels, level, query, labels, labels_constraint)
+
+    assert sorted(r.id_ for r in result) == sorted(r.id_ for r in expected)
+    assert all(type(r) == type(e) for r, e in zip(result, expected))
+
+
+def test_find_series(index):
+    result = index.find_series(query={'Modality': 'RTDOSE'})
+
+    assert len(result) == 1
+    assert type(result[0]) == Series
+    assert result[0].id_ == a_series.IDENTIFIER
+    assert result[0].modality == a_series.MODALITY
+
+
+def test_synchronize(index, client_with_data_and_labels):
+    assert index.last_change is not None
+    assert index.synchronize() == 0  # No change since the bootstrap
+
+    client_with_data_and_labels.delete_series_id(a_series.IDENTIFIER)
+    assert index.synchronize() > 0
+
+    assert index.find_series(query={'Modality': 'RTDOSE'}) == []
+    assert len(index.find_series()) == 2
+    assert len(index.find_instances()) == len(query_orthanc(client_with_data_and_labels, 'Instance'))
+
+
+def test_synchronize_updates_the_children_of_the_parents(index, client_with_data_and_labels):
+    client_with_data_and_labels.delete_series_id(a_series.IDENTIFIER)
+    index.synchronize()
+
+    study = index.find_studies()[0]
+    expected = client_with_data_and_labels.get_studies_id(study.id_)['Series']
+    assert sorted(s.id_ for s in study.series) == sorted(expected)
+    assert a_series.IDENTIFIER not in [s.id_ for s in study.series]
+
+
+def test_synchronize_after_patient_deletion(index, client_with_data_and_labels):
+    # Orthanc removes the changes of the deleted resources, the index is reconciled with /statistics
+    client_with_data_and_labels.delete_patients_id(a_patient.IDENTIFIER)
+    assert index.synchronize() > 0
+
+    assert index.find_patients() == []
+    assert index.find_instances() == []
+
+
+def test_query_not_indexed_tag(index, client_with_data_and_labels):
+    result = index.find_studies(query={'PatientPosition': '*'})  # Not a main DICOM tag, sent to Orthanc
+
+    expected = query_orthanc(client_with_data_and_labels, 'Study', {'PatientPosition': '*'})
+
+    assert [r.id_ for r in result] == [r.id_ for r in expected]
+    assert all(type(r) == Study for r in result)
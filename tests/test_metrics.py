@@ -0,0 +1,82 @@
+import asyncio
+
+import httpx
+import pytest
+
+from pyorthanc import AdaptivePager, AsyncInstrumentedTransport, AsyncOrthanc, InstrumentedTransport, \
+    MetricsAggregator, Orthanc, RequestRecord
+from pyorthanc.metrics import make_route_template
+from .data import a_patient
+from .setup_server import ORTHANC_1
+
+
+def test_instrumented_transport(client_with_data):
+    records = []
+    client = Orthanc(
+        ORTHANC_1.url, ORTHANC_1.username, ORTHANC_1.password, transport=InstrumentedTransport(records.append)
+    )
+
+    client.get_patients_id(a_patient.IDENTIFIER)
+    client.post_tools_find({'Level': 'Patient', 'Query': {}})
+
+    assert [(record.method, record.route, record.status_code) for record in records] == [
+        ('GET', '/patients/{id}', 200),
+        ('POST', '/tools/find', 200),
+    ]
+    assert records[0].response_bytes > 0
+    assert records[1].request_bytes > 0
+
+
+def test_async_instrumented_transport(async_client_with_data):
+    metrics = MetricsAggregator()
+    async_client = AsyncOrthanc(
+        ORTHANC_1.url, ORTHANC_1.username, ORTHANC_1.password, transport=AsyncInstrumentedTransport(metrics)
+    )
+
+    async def get_patient():
+        await async_client.get_patients_id(a_patient.IDENTIFIER)
+        with pytest.raises(httpx.HTTPError):
+            await async_client.get_patients_id('not-an-id')
+
+    asyncio.run(get_patient())
+
+    route_metrics = metrics.routes['GET', '/patients/{id}']
+    assert route_metrics.nbr_of_requests == 2
+    assert route_metrics.status_codes == {200: 1, 404: 1}
+
+
+@pytest.mark.parametrize('path, expected', [
+    ('/system', '/system'),
+    ('/instances/an-id/tags', '/instances/{id}/tags'),
+    ('/orthanc/series/an-id/instances', '/orthanc/series/{id}/instances'),
+    ('/instances/an-id/frames/0/preview', '/instances/{id}/frames/{frame}/preview'),
+    ('/instances/an-id/content/0008-1115/0/0020-000e', '/instances/{id}/content/{path}'),
+    ('/queries/an-id/answers/3/retrieve', '/queries/{id}/answers/{index}/retrieve'),
+    ('/patients/an-id/labels/a-label', '/patients/{id}/labels/{label}'),
+])
+def test_make_route_template(path, expected):
+    assert make_route_template(path) == expected
+
+
+def test_metrics_aggregator():
+    metrics = MetricsAggregator(buckets=(0.1, 1.))
+    metrics(RequestRecord('GET', '/system', 200, duration=0.05, request_bytes=0, response_bytes=100))
+    metrics(RequestRecord('GET', '/system', 503, duration=0.5, request_bytes=0, response_bytes=10))
+    metrics(RequestRecord('GET', '/system', 200, duration=2., request_bytes=0, response_bytes=100, attempt=1))
+    metrics(RequestRecord('GET', '/tools/find', None, duration=0.01, request_bytes=0, response_bytes=0,
+                          error='ReadTimeout'))
+    pager = AdaptivePager(initial_limit=100)
+    metrics.add_pager('studies', pager)
+
+    route_metrics = metrics.routes['GET', '/system']
+    assert route_metrics.bucket_counts == [1, 1, 1]
+    assert route_metrics.nbr_of_retries == 1
+    assert [route for route, _ in metrics.most_expensive(1)] == [('GET', '/system')]
+
+    text = metrics.to_prometheus()
+    assert 'pyorthanc_request_duration_seconds_bucket{method="GET",route="/system",le="1.0"} 2' in text
+    assert 'pyorthanc_request_duration_seconds_bucket{method="GET",route="/system",le="+Inf"} 3' in text
+    assert 'pyorthanc_responses_total{method="GET",route="/system",status_code="503"} 1' in text
+    assert 'pyorthanc_request_errors_total{method="GET",route="/tools/find"} 1' in text
+    assert 'pyorthanc_response_bytes_total{method="GET",route="/system"} 210' in text
+    assert 'pyorthanc_pager_limit{pager="studies"} 100' in text
@@ -0,0 +1,71 @@
+import asyncio
+import os
+
+import pytest
+
+import pyorthanc
+from pyorthanc import AsyncOrthanc, Orthanc
+from pyorthanc.profiling import _PYORTHANC_DIRECTORY, _find_origin
+from .data import a_patient
+
+
+def test_profile(client_with_data):
+    with pyorthanc.profile(n_plus_one_threshold=3) as p:
+        for study in pyorthanc.find_studies(client_with_data):
+            for series in study.series:
+                _ = series.modality
+
+    assert p.count(route='/series/{id}') == 3
+    assert p.count(route='/tools/find', method='POST') >= 1
+    assert 'send' not in Orthanc.__dict__  # Not profiled anymore
+
+    patterns = p.find_n_plus_one()
+    assert [(pattern.method, pattern.route, pattern.nbr_of_urls) for pattern in patterns] == [
+        ('GET', '/series/{id}', 3)
+    ]
+    assert 'test_profiling.py' in patterns[0].caller
+    assert patterns[0].api == 'Series.modality'
+
+    with pytest.raises(AssertionError):
+        p.assert_no_n_plus_one()
+    with pytest.raises(AssertionError):
+        p.assert_max_requests(2, route='/series/{id}')
+    p.assert_max_requests(3, route='/series/{id}')
+
+
+def test_profile_with_max_requests(client_with_data):
+    with pytest.raises(AssertionError, match='the budget is 1'):
+        with pyorthanc.profile(max_requests=1):
+            client_with_data.get_patients_id(a_patient.IDENTIFIER)
+            client_with_data.get_patients_id(a_patient.IDENTIFIER)
+
+    with pyorthanc.profile() as p:
+        client_with_data.get_patients_id(a_patient.IDENTIFIER)
+        client_with_data.get_patients_id(a_patient.IDENTIFIER)
+
+    assert p.find_repeated() == [(f'{client_with_data.url}/patients/{a_patient.IDENTIFIER}', 2)]
+
+
+def test_profile_with_async_client(async_client_with_data):
+    async def get_patient():
+        await async_client_with_data.get_patients_id(a_patient.IDENTIFIER)
+
+    with pyorthanc.profile() as p:
+        asyncio.run(get_patient())
+
+    assert [(request.method, request.route, request.status_code) for request in p.requests] == [
+        ('GET', '/patients/{id}', 200)
+    ]
+    assert 'send' not in AsyncOrthanc.__dict__
+
+
+def test_find_origin_in_a_sibling_directory():
+    # E.g. the scripts of a project next to the pyorthanc package, which are not part of pyorthanc
+    filename = os.path.join(os.path.dirname(_PYORTHANC_DIRECTORY), 'pyorthanc_scripts', 'run.py')
+    namespace = {}
+    exec(compile('import sys\nframe = sys._getframe()', filename, 'exec'), namespace)
+
+    caller, api = _find_origin(namespace['frame'])
+
+    assert caller.endswith('run.py:2 in <module>')
+    assert api == '?'
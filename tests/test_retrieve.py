@@ -1,9 +1,12 @@
 import glob
+import os
 import shutil
 
 import pytest
 
+from pyorthanc import find
 from pyorthanc.retrieve import retrieve_and_write_patients
+from .data import a_series
 
 PATH = 'tmp'
 
@@ -22,3 +25,13 @@ def test_retrieve_and_write_patients(patient, study, series, instance, path):
         f'{path}/**/*.dcm',
         recursive=True
     )
+
+
+def test_retrieve_and_write_filtered_patients(client_with_data, path):
+    patients = find(client_with_data, series_filter=lambda s: s.modality == 'RTDOSE')
+
+    retrieve_and_write_patients(patients, path)
+
+    # Only the series kept by the filter are written, not the whole patient
+    series_paths = {os.path.dirname(p) for p in glob.glob(f'{path}/**/*.dcm', recursive=True)}
+    assert [os.path.basename(p) for p in series_paths] == [a_series.UID]
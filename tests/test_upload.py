@@ -74,6 +74,38 @@ def test_upload_with_directory(client):
         assert len(client.get_patients()) == 3
 
 
+@pytest.mark.parametrize('batch_size', [None, 1, 2, 100])
+def test_upload_with_directory_by_batches(client, batch_size):
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        for filename in ['rtplan.dcm', 'MR_small.dcm', 'CT_small.dcm']:
+            shutil.copy(get_testdata_file(filename), os.path.join(tmpdirname, filename))
+
+        with patch('pyorthanc.client.Orthanc.post_instances', wraps=client.post_instances) as mock_post_instances:
+            instances = upload(client, tmpdirname, batch_size=batch_size)
+
+    assert len(instances) == 3
+    assert len(client.get_patients()) == 3
+    assert mock_post_instances.call_count == (3 if batch_size is None else -(-3 // batch_size))
+
+
+def test_upload_by_batches_when_the_capabilities_cannot_be_queried(client):
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        shutil.copy(get_testdata_file('CT_small.dcm'), os.path.join(tmpdirname, 'CT_small.dcm'))
+        shutil.copy(get_testdata_file('MR_small.dcm'), os.path.join(tmpdirname, 'MR_small.dcm'))
+
+        with patch('pyorthanc.capabilities.get_capabilities', side_effect=httpx.HTTPError('HTTP code: 403')), \
+                patch('pyorthanc.client.Orthanc.post_instances', wraps=client.post_instances) as mock_post_instances:
+            instances = upload(client, tmpdirname, batch_size=100)
+
+    assert len(instances) == 2
+    assert mock_post_instances.call_count == 2  # Fell back to one request per file, rather than a zip batch
+
+
+def test_upload_with_bad_batch_size(client):
+    with pytest.raises(ValueError):
+        upload(client, 'pyorthanc', batch_size=0)
+
+
 def test_upload_with_bad_path(client):
     with pytest.raises(FileNotFoundError):
         upload(client, 'bad_path')
@@ -13,6 +13,14 @@ def test_async_to_sync(async_client):
     assert isinstance(result, Orthanc)
 
 
+def test_async_to_sync_reuses_derived_client(async_client):
+    result = util.async_to_sync(async_client)
+
+    assert util.async_to_sync(async_client) is result
+    assert result.auth is async_client.auth
+    assert result.url == async_client.url
+
+
 def test_sync_to_async(client_with_data):
     result = util.sync_to_async(client_with_data)
 